@@ -0,0 +1,88 @@
+"""Decoding 60 MB FITS and INDIGO RAW frames into NumPy arrays with BlobItem.to_array vs copying approaches.
+
+Frames are synthetic 16-bit 6000x5000 images: FITS with BZERO=32768 (as written by INDIGO CCD drivers) and
+INDIGO RAW MONO16. Copying baseline is what parsing bytes into native array usually looks like without views,
+astropy is measured too if it is installed. Requires NumPy.
+
+Usage:
+    python benchmarks/blob_decode_benchmark.py
+"""
+
+import struct
+import timeit
+
+import numpy
+
+from pyindigo.core.properties.items import BlobItem
+from pyindigo.core.properties.decoders import parse_fits_header
+
+
+WIDTH, HEIGHT = 6000, 5000
+
+
+def fits_card(keyword: str, value) -> str:
+    return f"{keyword:<8}= {value:>20}".ljust(80)
+
+
+def fits_frame(pixels: numpy.ndarray) -> bytes:
+    cards = [
+        fits_card("SIMPLE", "T"),
+        fits_card("BITPIX", 16),
+        fits_card("NAXIS", 2),
+        fits_card("NAXIS1", pixels.shape[1]),
+        fits_card("NAXIS2", pixels.shape[0]),
+        fits_card("BZERO", 32768),
+        fits_card("BSCALE", 1),
+        "END".ljust(80),
+    ]
+    header = "".join(cards)
+    header = header.ljust(-(-len(header) // 2880) * 2880)
+    stored = (pixels.astype(numpy.int32) - 32768).astype(">i2")
+    return header.encode("ascii") + stored.tobytes()
+
+
+def raw_frame(pixels: numpy.ndarray) -> bytes:
+    header = struct.pack("<Iii", 0x32574152, pixels.shape[1], pixels.shape[0])
+    return header + pixels.astype("<u2").tobytes()
+
+
+def copying_fits_decode(data: bytes) -> numpy.ndarray:
+    header, offset = parse_fits_header(data)
+    stored = numpy.frombuffer(bytes(data[offset:]), ">i2").reshape(HEIGHT, WIDTH)
+    return (stored.astype(numpy.int32) + header["BZERO"]).astype(numpy.uint16)
+
+
+def ms_per_decode(decode, number: int = 5) -> float:
+    return min(timeit.repeat(decode, number=number, repeat=3)) / number * 1e3
+
+
+def main():
+    pixels = numpy.random.default_rng(0).integers(0, 65535, (HEIGHT, WIDTH), dtype=numpy.uint16)
+    fits_item = BlobItem("IMAGE", fits_frame(pixels), ".fits")
+    raw_item = BlobItem("IMAGE", raw_frame(pixels), ".raw")
+    assert (fits_item.to_array() == pixels).all()
+    assert (raw_item.to_array() == pixels).all()
+    print(f"frame: {WIDTH}x{HEIGHT} 16-bit, {len(fits_item.value) / 1e6:.1f} MB")
+
+    cases = [
+        ("FITS, copying baseline", lambda: copying_fits_decode(fits_item.value)),
+        ("FITS, unscaled view", lambda: fits_item.to_array(scaled=False)),
+        ("FITS, unscaled native", lambda: fits_item.to_array(scaled=False, native=True)),
+        ("FITS, unsigned (default)", lambda: fits_item.to_array()),
+        ("RAW, view", lambda: raw_item.to_array()),
+    ]
+    try:
+        from astropy.io import fits
+
+        cases.append(("FITS, astropy", lambda: fits.HDUList.fromstring(fits_item.value)[0].data))
+    except ImportError:
+        pass
+
+    print(f"{'decoding':>26} {'ms':>10} {'GB/s':>8}")
+    for title, decode in cases:
+        ms = ms_per_decode(decode)
+        print(f"{title:>26} {ms:>10.3f} {len(fits_item.value) / ms / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
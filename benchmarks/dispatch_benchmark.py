@@ -0,0 +1,111 @@
+"""Dispatch cost versus number of registered callbacks.
+
+Callbacks are registered the way IndigoDevice.callback registers them: each one is restricted to a particular
+device and property name. Indexed dispatching callback is compared to the linear scan over all entries.
+
+Then cost of rejecting an event by filters (see pyindigo.core.filters) is compared to the same filtering coded
+inside callbacks: each callback accepts a set of devices, CCD_ name prefix and temperature range.
+
+Usage:
+    python benchmarks/dispatch_benchmark.py
+"""
+
+import timeit
+from functools import partial
+
+from pyindigo.core.dispatching_callback import (
+    dispatching_callback,
+    indigo_callback,
+    discard_indigo_callback,
+    registered_callback_entries,
+)
+from pyindigo.core.filters import Prefix, Range
+from pyindigo.core.enums import IndigoDriverAction, IndigoPropertyState, IndigoPropertyPerm
+from pyindigo.core.properties import NumberVectorProperty
+
+
+DEVICES_COUNT = 20
+PROPERTY_NAMES = ["CONNECTION", "CCD_EXPOSURE", "CCD_IMAGE", "CCD_TEMPERATURE", "CCD_STREAMING"]
+
+
+def make_event() -> NumberVectorProperty:
+    prop = NumberVectorProperty(
+        device="Device 0", name="CCD_TEMPERATURE", state=1, perm=IndigoPropertyPerm.RW.value
+    )
+    prop.add_item("TEMPERATURE", -10.0, "%g", -50.0, 50.0, 0.1, -10.0)
+    return prop
+
+
+def noop(action, prop):
+    pass
+
+
+def register_callbacks(count: int):
+    for i in range(count):
+        indigo_callback(
+            noop,
+            accepts={
+                "action": IndigoDriverAction.UPDATE,
+                "device": f"Device {i % DEVICES_COUNT}",
+                "name": PROPERTY_NAMES[(i // DEVICES_COUNT) % len(PROPERTY_NAMES)],
+                "state": IndigoPropertyState.OK,
+            },
+        )
+
+
+def linear_dispatch(action: IndigoDriverAction, prop: NumberVectorProperty):
+    for entry in list(registered_callback_entries):
+        entry.run_if_accepted(action, prop)
+
+
+def register_filtered_callbacks(count: int, compiled: bool):
+    for i in range(count):
+        devices = {f"Device {j}" for j in range(i % DEVICES_COUNT + 1, i % DEVICES_COUNT + 4)}
+        if compiled:
+            accepts = {
+                "device": devices,
+                "name": Prefix("CCD_"),
+                "items": {"TEMPERATURE": Range(max=-20)},
+            }
+            indigo_callback(noop, accepts=accepts)
+        else:
+
+            def filtering(action, prop, devices=devices):
+                if prop.device in devices and prop.name.startswith("CCD_"):
+                    if prop.items_dict.get("TEMPERATURE", 0) <= -20:
+                        noop(action, prop)
+
+            indigo_callback(filtering)
+
+
+def main():
+    prop = make_event()
+    update = IndigoDriverAction.UPDATE  # C extension passes enum members
+    repeat = 20000
+    print(f"{'callbacks':>10} {'indexed, us/event':>18} {'linear, us/event':>18}")
+    for count in (1, 10, 100, 1000, 5000):
+        register_callbacks(count)
+        indexed = min(
+            timeit.repeat(lambda: dispatching_callback(update, prop), number=repeat, repeat=3)
+        )
+        linear = min(
+            timeit.repeat(lambda: linear_dispatch(update, prop), number=repeat // 10, repeat=3)
+        )
+        print(f"{count:>10} {1e6 * indexed / repeat:>18.2f} {1e7 * linear / repeat:>18.2f}")
+        discard_indigo_callback(noop)
+
+    print(f"\n{'callbacks':>10} {'filters, us/event':>18} {'in callback, us/event':>22}")
+    for count in (1, 10, 100, 1000):
+        timings = []
+        for compiled in (True, False):
+            register_filtered_callbacks(count, compiled)
+            dispatch = partial(dispatching_callback, update, prop)
+            timings.append(min(timeit.repeat(dispatch, number=1000, repeat=3)))
+            for entry in list(registered_callback_entries):
+                if entry.callback is noop or entry.callback.__name__ == "filtering":
+                    registered_callback_entries.discard(entry)
+        print(f"{count:>10} {1e3 * timings[0]:>18.2f} {1e3 * timings[1]:>22.2f}")
+
+
+if __name__ == "__main__":
+    main()
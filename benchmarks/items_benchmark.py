@@ -0,0 +1,81 @@
+"""Python-side cost of building dispatched property with its items, in events per second.
+
+Per-item path is what C extension used to do: create property and call add_item for every item. Batch path is
+what it does now: create property attributes only and build all items with a single _load_columns call
+(columns are tuples and packed doubles, just like those built by C extension; number properties are loaded as
+NumberColumns, and items are built from them).
+
+Usage:
+    python benchmarks/items_benchmark.py
+"""
+
+import timeit
+from array import array
+
+from pyindigo.core.properties import NumberVectorProperty, TextVectorProperty
+
+
+def number_columns(items_count: int):
+    def doubles(values) -> bytes:
+        return array("d", values).tobytes()
+
+    return (
+        tuple(f"ITEM_{i}" for i in range(items_count)),
+        doubles(float(i) for i in range(items_count)),
+        ("%g",) * items_count,
+        doubles([-100.0] * items_count),
+        doubles([100.0] * items_count),
+        doubles([0.1] * items_count),
+        doubles(float(i) for i in range(items_count)),
+    )
+
+
+def text_columns(items_count: int):
+    return (
+        tuple(f"HEADER_{i}" for i in range(items_count)),
+        tuple(f"KEYWORD{i} = 'value {i}'" for i in range(items_count)),
+    )
+
+
+def per_item(property_class, columns):
+    rows = list(zip(*(array("d", c) if isinstance(c, bytes) else c for c in columns)))
+
+    def build():
+        prop = property_class("Device", "PROPERTY", 1, 2)
+        for row in rows:
+            prop.add_item(*row)
+        return prop.items
+
+    return build
+
+
+def batch(property_class, columns):
+    def build():
+        prop = property_class._with_items_loader(
+            "Device", "PROPERTY", 1, 2, None, lambda: property_class._load_columns(*columns)
+        )
+        return prop.items
+
+    return build
+
+
+def events_per_second(build, number: int) -> float:
+    return number / min(timeit.repeat(build, number=number, repeat=3))
+
+
+def main():
+    print(f"{'property':>22} {'items':>6} {'per-item, ev/s':>15} {'batch, ev/s':>12}")
+    for property_class, make_columns in (
+        (NumberVectorProperty, number_columns),
+        (TextVectorProperty, text_columns),
+    ):
+        for items_count in (5, 20, 100):
+            columns = make_columns(items_count)
+            number = 200000 // items_count
+            old = events_per_second(per_item(property_class, columns), number)
+            new = events_per_second(batch(property_class, columns), number)
+            print(f"{property_class.__name__:>22} {items_count:>6} {old:>15.0f} {new:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Dispatching throughput, latency and memory for typical event streams, replayed without Indigo bus.
+
+Scenarios are synthetic recordings (see pyindigo.core.recording) of:
+    - CCD streaming session: image BLOBs interleaved with exposure, streaming and temperature updates
+    - enumeration of many devices: each one defines its INFO, CONNECTION and a bunch of other properties
+Events are dispatched by the same path as events from C extension, with models' client registering devices
+and maintaining property cache, and with some device callbacks registered. Recording file made with
+EventRecorder may be passed to benchmark it as well.
+
+Usage:
+    python benchmarks/replay_benchmark.py [recording.pickle.gz]
+"""
+
+import sys
+import time
+import tracemalloc
+from typing import List
+
+import pyindigo.models.client as client  # noqa: F401, registers devices and maintains property cache
+from pyindigo.core.dispatching_callback import indigo_callback, dispatching_callback
+from pyindigo.core.enums import IndigoDriverAction, IndigoPropertyState, IndigoPropertyPerm
+from pyindigo.core.properties import (
+    IndigoProperty,
+    TextVectorProperty,
+    NumberVectorProperty,
+    SwitchVectorProperty,
+    BlobVectorProperty,
+)
+from pyindigo.core.recording import EventRecord, serialize_event, read_records, replay_events
+
+
+OK = IndigoPropertyState.OK.value
+BUSY = IndigoPropertyState.BUSY.value
+RW = IndigoPropertyPerm.RW.value
+RO = IndigoPropertyPerm.RO.value
+
+
+def number_property(device: str, name: str, state: int, **values: float) -> NumberVectorProperty:
+    prop = NumberVectorProperty(device, name, state, RW)
+    for item_name, value in values.items():
+        prop.add_item(item_name, value, "%g", -1000.0, 1000.0, 0.1, value)
+    return prop
+
+
+def info_property(device: str) -> TextVectorProperty:
+    prop = TextVectorProperty(device, "INFO", OK, RO)
+    prop.add_item("DEVICE_NAME", device)
+    prop.add_item("DEVICE_VERSION", "2.0.0.1")
+    prop.add_item("DEVICE_INTERFACE", "2")
+    return prop
+
+
+def connection_property(device: str) -> SwitchVectorProperty:
+    prop = SwitchVectorProperty(device, "CONNECTION", OK, RW)
+    prop.add_rule(1)
+    prop.add_item("CONNECTED", 0)
+    prop.add_item("DISCONNECTED", 1)
+    return prop
+
+
+def ccd_streaming_session(frames: int = 300, frame_size: int = 256 * 1024) -> List[EventRecord]:
+    device = "CCD Imager Simulator"
+    update = IndigoDriverAction.UPDATE
+    frame = bytes(frame_size)
+    records = []
+    t = 0.0
+    for i in range(frames):
+        t += 0.05
+        records.append(
+            serialize_event(
+                update,
+                number_property(device, "CCD_STREAMING", BUSY, EXPOSURE=0.05, COUNT=frames - i),
+                t,
+            )
+        )
+        records.append(
+            serialize_event(
+                update, number_property(device, "CCD_EXPOSURE", BUSY, EXPOSURE=0.05 - t % 0.05), t
+            )
+        )
+        if i % 10 == 0:
+            records.append(
+                serialize_event(
+                    update,
+                    number_property(device, "CCD_TEMPERATURE", OK, TEMPERATURE=-10 + i % 3),
+                    t,
+                )
+            )
+        image = BlobVectorProperty(device, "CCD_IMAGE", OK, RO)
+        image.add_item("IMAGE", frame, ".fits")
+        records.append(serialize_event(update, image, t))
+    return records
+
+
+def device_enumeration(devices: int = 200, properties_per_device: int = 30) -> List[EventRecord]:
+    define = IndigoDriverAction.DEFINE
+    records = []
+    for i in range(devices):
+        device = f"Device {i}"
+        records.append(serialize_event(define, info_property(device), 0.0))
+        records.append(serialize_event(define, connection_property(device), 0.0))
+        for j in range(properties_per_device):
+            prop = number_property(device, f"PROPERTY_{j}", OK, VALUE=float(j), TARGET=float(j))
+            records.append(serialize_event(define, prop, 0.0))
+    return records
+
+
+def register_device_callbacks():
+    """What a typical application registers: a few callbacks restricted to device and property"""
+
+    def noop(action: IndigoDriverAction, prop: IndigoProperty):
+        pass
+
+    def read_items(action: IndigoDriverAction, prop: IndigoProperty):
+        prop.items_dict
+
+    device = "CCD Imager Simulator"
+    indigo_callback(read_items, accepts={"device": device, "name": "CCD_IMAGE"})
+    indigo_callback(read_items, accepts={"device": device, "name": "CCD_TEMPERATURE"})
+    indigo_callback(noop, accepts={"action": IndigoDriverAction.UPDATE, "device": device})
+    for i in range(0, 200, 10):
+        indigo_callback(noop, accepts={"device": f"Device {i}", "name": "CONNECTION"})
+
+
+def percentile(sorted_values: List[int], fraction: float) -> int:
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def run(title: str, records: List[EventRecord]):
+    latencies: List[int] = []
+    perf_counter_ns = time.perf_counter_ns
+
+    def timed_dispatch(action: IndigoDriverAction, prop: IndigoProperty):
+        start = perf_counter_ns()
+        dispatching_callback(action, prop)
+        latencies.append(perf_counter_ns() - start)
+
+    start = time.perf_counter()
+    count = replay_events(records, speed=None, dispatch=timed_dispatch)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    # second pass to measure memory, as traced allocations are much slower
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    replay_events(records, speed=None, dispatch=dispatching_callback)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{title:>20} {count:>8} {count / elapsed:>12.0f} "
+        + f"{percentile(latencies, 0.5) / 1e3:>9.1f} {percentile(latencies, 0.99) / 1e3:>9.1f} "
+        + f"{(current - baseline) / count:>14.0f} {(peak - baseline) / count:>12.0f}"
+    )
+
+
+def main():
+    register_device_callbacks()
+    print(
+        f"{'scenario':>20} {'events':>8} {'events/sec':>12} {'p50, us':>9} {'p99, us':>9} "
+        + f"{'retained, B/ev':>14} {'peak, B/ev':>12}"
+    )
+    run("CCD streaming", ccd_streaming_session())
+    run("device enumeration", device_enumeration())
+    if len(sys.argv) > 1:
+        run(sys.argv[1], list(read_records(sys.argv[1])))
+
+
+if __name__ == "__main__":
+    main()
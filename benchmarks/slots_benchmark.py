@@ -0,0 +1,115 @@
+"""Memory and construction time of slotted property and item classes vs the same dataclasses with __dict__.
+
+Unslotted variants are defined here with the same fields and __post_init__ conversions as in
+pyindigo.core.properties. Both variants are built the same way, through __init__, and kept alive as in
+property cache.
+
+Usage:
+    python benchmarks/slots_benchmark.py
+"""
+
+import timeit
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from pyindigo.core.properties import NumberVectorProperty, TextVectorProperty
+from pyindigo.core.properties.attribute_enums import IndigoPropertyState, IndigoPropertyPerm
+from pyindigo.core.properties.items import NumberItem, TextItem
+
+
+@dataclass
+class DictNumberItem:
+    name: str
+    value: float
+    format: str = r"%g"
+    min: Optional[float] = None
+    max: Optional[float] = None
+    step: Optional[float] = None
+    target: Optional[float] = None
+
+    def __post_init__(self):
+        self.value = float(self.value)
+
+
+@dataclass
+class DictTextItem:
+    name: str
+    value: str
+
+
+@dataclass
+class DictProperty:
+    device: str
+    name: str
+    state: Optional[int] = None
+    perm: Optional[int] = None
+    rule: Optional[int] = None
+    items: List = field(default_factory=list)
+
+    def __post_init__(self):
+        self.state = IndigoPropertyState(self.state) if self.state is not None else None
+        self.perm = IndigoPropertyPerm(self.perm) if self.perm is not None else None
+
+
+def builder(property_class, item_class, columns):
+    def build():
+        prop = property_class("Device", "PROPERTY", 1, 2)
+        prop.items = list(map(item_class, *columns))
+        return prop
+
+    return build
+
+
+def number_columns(items_count: int):
+    return (
+        tuple(f"ITEM_{i}" for i in range(items_count)),
+        tuple(float(i) for i in range(items_count)),
+        ("%g",) * items_count,
+        (-100.0,) * items_count,
+        (100.0,) * items_count,
+        (0.1,) * items_count,
+        tuple(float(i) for i in range(items_count)),
+    )
+
+
+def text_columns(items_count: int):
+    return (
+        tuple(f"HEADER_{i}" for i in range(items_count)),
+        tuple(f"KEYWORD{i} = 'value {i}'" for i in range(items_count)),
+    )
+
+
+def bytes_per_property(build, count: int = 10000) -> float:
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    kept = [build() for _ in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return (current - baseline) / count
+
+
+def us_per_property(build, number: int = 20000) -> float:
+    return min(timeit.repeat(build, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    print(f"{'items':>16} {'dict, B':>9} {'slots, B':>9} {'dict, us':>9} {'slots, us':>10}")
+    for title, property_class, item_class, dict_item_class, make_columns in (
+        ("NumberItem", NumberVectorProperty, NumberItem, DictNumberItem, number_columns),
+        ("TextItem", TextVectorProperty, TextItem, DictTextItem, text_columns),
+    ):
+        for items_count in (1, 10, 50):
+            columns = make_columns(items_count)
+            dict_build = builder(DictProperty, dict_item_class, columns)
+            slotted_build = builder(property_class, item_class, columns)
+            print(
+                f"{f'{items_count} x {title}':>16} "
+                + f"{bytes_per_property(dict_build):>9.0f} {bytes_per_property(slotted_build):>9.0f} "
+                + f"{us_per_property(dict_build):>9.2f} {us_per_property(slotted_build):>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,7 @@ def some_other_processing(action, prop):
 
 indigo.setup_client()  # this starts indigo operation
 indigo.set_indigo_log_level(IndigoLogLevel.INFO)
-indigo.attach_driver('indigo_ccd_simulator')  # currently only one driver at a time is supported
+ccd_driver = indigo.attach_driver('indigo_ccd_simulator')  # returns handle to detach driver later
 
 # sleep 1 sec after every operation to prevent deadlocks, giving Indigo time to respond
 # this should normally be done with some kind of async callback processing
@@ -54,7 +54,7 @@ prop.set()
 
 time.sleep(5)  # wait for exposure
 
-indigo.detach_driver()
+indigo.detach_driver(ccd_driver)
 
 time.sleep(3)  # give driver time to gracefully exit
 
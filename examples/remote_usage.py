@@ -0,0 +1,25 @@
+import time
+
+# start stand-in Indigo server with simulator driver on loopback before running this example:
+#   indigo_server indigo_ccd_simulator
+# then try stopping and restarting it to see the pool reconnecting
+
+from pyindigo.models.server import IndigoServerPool
+import pyindigo.models.client as client
+
+import pyindigo.logging as logging
+logging.basicConfig(level=logging.INFO)
+logging.pyindigoConfig(log_device_connection=True)
+
+
+pool = IndigoServerPool(initial_delay=1, max_delay=30)
+pool.add('local', '127.0.0.1', 7624)  # will be disconnected automatically on exit
+
+time.sleep(2)  # time for connection to be established and remote devices to be defined
+
+# remote devices are found as any other devices (Indigo may add host suffix to their names)
+print([str(device) for device in client.devices])
+
+for _ in range(30):
+    print(pool.stats())
+    time.sleep(2)
@@ -38,7 +38,7 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: Linux",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.10',
 
     package_dir={'': 'src'},
     packages=find_packages(where='src', exclude=['old']),
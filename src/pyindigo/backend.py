@@ -0,0 +1,51 @@
+"""Selection of the module implementing pyindigo.core.core_ext interface.
+
+By default it's the C extension module working with INDIGO. Pure Python pyindigo.core.fake_ext with
+simulated devices may be used instead, e.g. for testing without INDIGO installed. Backend is selected
+with PYINDIGO_BACKEND environment variable or use_backend function, before pyindigo.core is imported.
+
+Example use:
+>>> import pyindigo.backend
+>>> pyindigo.backend.use_backend('fake')
+>>> import pyindigo.core as indigo  # works with simulated devices now
+"""
+
+import os
+import sys
+from importlib import import_module
+from typing import Optional
+
+
+BACKEND_ENV_VARIABLE = "PYINDIGO_BACKEND"
+
+# backend name -> module implementing core_ext interface
+BACKENDS = {
+    "indigo": "pyindigo.core.core_ext",
+    "fake": "pyindigo.core.fake_ext",
+}
+
+_selected: Optional[str] = None
+
+
+def use_backend(name: str):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}', available are: {', '.join(BACKENDS)}")
+    if "pyindigo.core" in sys.modules and selected_backend() != name:
+        raise RuntimeError("Backend must be selected before pyindigo.core is imported")
+    global _selected
+    _selected = name
+
+
+def selected_backend() -> str:
+    return _selected or os.environ.get(BACKEND_ENV_VARIABLE, "indigo")
+
+
+def install_backend():
+    """Called by pyindigo.core on import, makes selected module importable as pyindigo.core.core_ext"""
+    name = selected_backend()
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown backend '{name}' in {BACKEND_ENV_VARIABLE}, available are: {', '.join(BACKENDS)}"
+        )
+    if name != "indigo":
+        sys.modules["pyindigo.core.core_ext"] = import_module(BACKENDS[name])
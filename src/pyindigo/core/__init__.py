@@ -10,8 +10,17 @@ Pyindigo users should import all functions from this module and not from core_ex
 
 # flake8: noqa
 
+from typing import Optional
+
+from ..backend import install_backend
+
+install_backend()  # core_ext may be replaced by another backend, see pyindigo.backend
+
 # other core_ext functions are not meant to be exposed to the user
 from .core_ext import setup_client, cleanup_client, attach_driver, detach_driver, disconnect_device
+from .core_ext import attached_driver_handles
+from .core_ext import connect_server, disconnect_server, server_connection_status, connected_server_handles
+from .core_ext import set_zero_copy_blobs
 
 
 # setting up links to pyindigo.core objects and functions in core_ext...
@@ -33,6 +42,11 @@ _set_property_classes(
     BlobVectorProperty,
 )
 
+from .core_ext import set_enum_classes as _set_enum_classes
+from .enums import IndigoPropertyState, IndigoPropertyPerm, IndigoSwitchRule, IndigoDriverAction
+
+_set_enum_classes(IndigoPropertyState, IndigoPropertyPerm, IndigoSwitchRule, IndigoDriverAction)
+
 from .core_ext import set_dispatching_callback as _set_dispatching_callback
 from .dispatching_callback import dispatching_callback
 
@@ -46,7 +60,30 @@ def set_indigo_log_level(log_level: IndigoLogLevel = IndigoLogLevel.ERROR):
     _set_log_level(log_level.value)
 
 
+from .core_ext import set_blob_mode as _set_blob_mode
+from .enums import IndigoBlobMode
+
+_BLOB_MODE_DEFAULT = -1
+
+
+def set_blob_mode(
+    mode: Optional[IndigoBlobMode],
+    device: Optional[str] = None,
+    property_name: Optional[str] = None,
+):
+    """Request BLOBs of given device's property to be sent in given mode, None for device or property_name
+    matches any, the most specific setting applies. Mode None removes setting for device and property_name.
+
+    By default URL mode is requested from all devices supporting it, see BlobItem.fetch.
+    """
+    _set_blob_mode(
+        device or "", property_name or "", mode.value if mode is not None else _BLOB_MODE_DEFAULT
+    )
+
+
 from .dispatching_callback import indigo_callback
+from .properties import set_properties
+from .filters import Prefix, Range
 
 
 # not necessary but used for linting purposes
@@ -56,6 +93,16 @@ __all__ = [
     "cleanup_client",
     "attach_driver",
     "detach_driver",
+    "attached_driver_handles",
+    "connect_server",
+    "disconnect_server",
+    "server_connection_status",
+    "connected_server_handles",
     "disconnect_device",
+    "set_zero_copy_blobs",
+    "set_blob_mode",
     "indigo_callback",
+    "set_properties",
+    "Prefix",
+    "Range",
 ]
@@ -0,0 +1,96 @@
+"""asyncio interface for awaiting Indigo property changes and streaming them.
+
+Callbacks registered here do not run any Python code in the event loop directly: they resolve futures and
+fill queues with loop.call_soon_threadsafe, so awaiting coroutines are woken up as soon as the property is
+dispatched, without any polling.
+
+Example use:
+>>> prop = CCDSpecificProperties.CCD_EXPOSURE.implement('CCD Imager Simulator', EXPOSURE=3)
+>>> prop = await set_property_and_wait(prop, timeout=10)
+>>> async for action, prop in watch_properties({'device': 'CCD Imager Simulator', 'name': 'CCD_IMAGE'}):
+>>>     ...
+"""
+
+import asyncio
+from typing import Optional, Callable, Dict, Any, Tuple, AsyncIterator
+
+from .properties import IndigoProperty
+from .enums import IndigoDriverAction
+from .dispatching_callback import indigo_callback, IndigoCallbackHandle
+from .waiters import PropertyPredicate, confirmed_update_predicate, settled_update_accepts
+
+
+PropertyEvent = Tuple[IndigoDriverAction, IndigoProperty]
+
+
+def _resolve_future(future: asyncio.Future, event: PropertyEvent):
+    if not future.done():
+        future.set_result(event)
+
+
+def _register_waiter(
+    accepts: Dict[str, Any], predicate: Optional[PropertyPredicate]
+) -> Tuple[asyncio.Future, IndigoCallbackHandle]:
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(action: IndigoDriverAction, prop: IndigoProperty):
+        if predicate is None or predicate(prop):
+            loop.call_soon_threadsafe(_resolve_future, future, (action, prop))
+
+    return future, indigo_callback(resolve, accepts=accepts)
+
+
+async def _wait(
+    future: asyncio.Future, handle: IndigoCallbackHandle, timeout: Optional[float]
+) -> PropertyEvent:
+    try:
+        return await asyncio.wait_for(future, timeout)
+    finally:
+        handle.discard()
+
+
+async def wait_for_property(
+    accepts: Dict[str, Any],
+    predicate: Optional[PropertyPredicate] = None,
+    timeout: Optional[float] = None,
+) -> PropertyEvent:
+    """Wait for the first (action, property) pair accepted by callback with given accepts dict (see
+    indigo_callback) and satisfying optional predicate. Raises asyncio.TimeoutError on timeout."""
+    future, handle = _register_waiter(accepts, predicate)
+    return await _wait(future, handle, timeout)
+
+
+async def set_property_and_wait(
+    prop: IndigoProperty,
+    timeout: Optional[float] = None,
+    confirmation: Optional[Callable[[], bool]] = None,
+) -> IndigoProperty:
+    """Set property and wait for its update in ALERT state or in OK state with optional confirmation condition
+    satisfied (see pyindigo.utils.set_property_with_confirmation), return updated property"""
+    future, handle = _register_waiter(
+        settled_update_accepts(prop), confirmed_update_predicate(confirmation)
+    )
+    try:
+        prop.set()
+    except Exception:
+        handle.discard()
+        raise
+    _, updated_prop = await _wait(future, handle, timeout)
+    return updated_prop
+
+
+async def watch_properties(accepts: Dict[str, Any]) -> AsyncIterator[PropertyEvent]:
+    """Asynchronously iterate over (action, property) pairs accepted by callback with given accepts dict"""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def put(action: IndigoDriverAction, prop: IndigoProperty):
+        loop.call_soon_threadsafe(queue.put_nowait, (action, prop))
+
+    handle = indigo_callback(put, accepts=accepts)
+    try:
+        while True:
+            yield await queue.get()
+    finally:
+        handle.discard()
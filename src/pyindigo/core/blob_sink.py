@@ -0,0 +1,105 @@
+"""BLOB sinks: writing BLOBs (e.g. CCD images) to files right from C extension, without passing them to Python.
+
+When BLOB property update matches a sink, its data is written to a file in sink's directory without holding GIL,
+either on INDIGO bus thread or, if BLOB writer is started, on a dedicated thread with a bounded queue (INDIGO bus
+waits when it's full, frames are never dropped). Property is dispatched after its BLOBs are written, its items
+have value None and path of the written file (or None if writing failed). With BLOB writer started, the property
+is dispatched from writer thread once its files are written, so it may be dispatched after later events of the same
+device (e.g. CCD_EXPOSURE update in OK state that follows the image); without writer, order of events is kept.
+
+Sinks need BLOB data sent along with property, while by default remote devices only send BLOB URLs (see
+pyindigo.core.set_blob_mode). So adding a sink requests ALSO mode for its device and property, replacing mode
+set for them before, and removing a sink removes this setting.
+
+File names are made from template with fields:
+    {device}, {property}, {item} - names, with "/" and leading dots replaced by "_"
+    {seq} - zero-padded number of the property update, counted per sink
+    {timestamp} - UTC time of the update, e.g. 20240115T213000.125
+    {format} - BLOB format as reported by the driver, e.g. ".fits"
+
+Example use:
+>>> from pyindigo.core.blob_sink import add_blob_sink, start_blob_writer
+>>> add_blob_sink('/data/frames', device='CCD Imager Simulator', template='{device}_{timestamp}{format}')
+>>> start_blob_writer(capacity=8)
+"""
+
+import os
+from dataclasses import dataclass
+from string import Formatter
+from typing import Optional
+
+from .core_ext import add_blob_sink as _add_blob_sink
+from .core_ext import remove_blob_sink as _remove_blob_sink
+from .core_ext import start_blob_writer as _start_blob_writer
+from .core_ext import stop_blob_writer
+from .core_ext import blob_sink_stats as _blob_sink_stats
+from . import set_blob_mode
+from .enums import IndigoBlobMode
+
+
+TEMPLATE_FIELDS = {"device", "property", "item", "seq", "timestamp", "format"}
+DEFAULT_TEMPLATE = "{device}_{seq}{format}"
+
+
+def add_blob_sink(
+    directory: str,
+    device: Optional[str] = None,
+    property_name: Optional[str] = "CCD_IMAGE",
+    template: str = DEFAULT_TEMPLATE,
+):
+    """Write BLOBs of given device's property to files in directory (created if needed).
+
+    None for device or property_name matches any; a sink for specific device takes precedence over the one
+    for any device. Adding a sink for the same device and property replaces it.
+    """
+    for literal_text, field_name, format_spec, conversion in Formatter().parse(template):
+        if "{" in literal_text or "}" in literal_text:
+            raise ValueError("Template must not contain escaped braces")
+        if field_name is None:
+            continue
+        if field_name not in TEMPLATE_FIELDS or format_spec or conversion:
+            raise ValueError(
+                f'Unsupported template field "{{{field_name}}}", available are: '
+                + ", ".join(f"{{{name}}}" for name in sorted(TEMPLATE_FIELDS))
+            )
+    if "/" in template or template in {".", ".."}:
+        raise ValueError("Template must be a file name, not a path")
+    directory = os.path.abspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    _add_blob_sink(device or "", property_name or "", directory, template)
+    set_blob_mode(IndigoBlobMode.ALSO, device, property_name)
+
+
+def remove_blob_sink(
+    device: Optional[str] = None, property_name: Optional[str] = "CCD_IMAGE"
+) -> bool:
+    """Stop writing BLOBs to files for sink added with the same device and property_name,
+    returns if there was one"""
+    removed = _remove_blob_sink(device or "", property_name or "")
+    if removed:
+        set_blob_mode(None, device, property_name)
+    return removed
+
+
+def start_blob_writer(capacity: int = 8):
+    """Write BLOB files from dedicated thread, with up to capacity BLOB properties waiting in memory.
+
+    Call stop_blob_writer to write files on INDIGO bus thread again; queued BLOBs are still written.
+    """
+    _start_blob_writer(capacity)
+
+
+@dataclass
+class BlobSinkStats:
+    sinks: int
+    written: int  # files
+    bytes: int
+    failed: int
+    writer_running: bool
+    writer_capacity: int
+    writer_depth: int  # BLOB properties waiting to be written
+    writer_max_depth: int
+
+
+def blob_sink_stats() -> BlobSinkStats:
+    return BlobSinkStats(**_blob_sink_stats())
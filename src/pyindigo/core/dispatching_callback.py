@@ -1,22 +1,44 @@
 """Dispatching callback is a single Python callable invoked from C code to process all properties"""
 
-from dataclasses import dataclass, fields
-from typing import Optional, Callable, List, Dict, Any, Type
+from dataclasses import dataclass, field
+from typing import Optional, Callable, List, Dict, Any, Type, Tuple, Iterator, Union
 from asyncio import AbstractEventLoop, run_coroutine_threadsafe
 from inspect import iscoroutinefunction
+from functools import update_wrapper
+from itertools import count
+from threading import Lock
 
 import pyindigo.logging as logging
 
-from .properties import IndigoProperty
+from .properties import IndigoProperty, BlobVectorProperty
 from .enums import IndigoDriverAction, IndigoPropertyState, IndigoPropertyPerm, IndigoSwitchRule
+from .filters import (
+    Prefix,
+    Condition,
+    PropertyCheck,
+    normalize,
+    compile_condition,
+    index_values,
+    attribute_check,
+    items_check,
+)
 
 
 IndigoCallback = Callable[[IndigoDriverAction, IndigoProperty], None]
 
+# (action, device, name, property_class), None means any value
+DispatchKey = Tuple[
+    Optional[IndigoDriverAction], Optional[str], Optional[str], Optional[Type[IndigoProperty]]
+]
+
 
 @dataclass
 class IndigoCallbackEntry:
-    """Callback + info on when and how to run it"""
+    """Callback + info on when and how to run it.
+
+    Besides exact values, fields accept collections of values and Prefix for device and name, items accepts
+    conditions on item values by item name, see pyindigo.core.filters.
+    """
 
     callback: IndigoCallback
 
@@ -28,10 +50,13 @@ class IndigoCallbackEntry:
     state: Optional[IndigoPropertyState] = None
     perm: Optional[IndigoPropertyPerm] = None
     rule: Optional[IndigoSwitchRule] = None
+    items: Optional[Dict[str, Any]] = None
 
     run_times: Optional[int] = None  # None = no limit on how many times callback is run
     loop: Optional[AbstractEventLoop] = None
 
+    token: int = field(default=-1, init=False, compare=False)  # assigned on registration
+
     def __post_init__(self):
         if not callable(self.callback):
             raise RuntimeError(f"Unable to register {self.callback} - not a callable!")
@@ -41,57 +66,316 @@ class IndigoCallbackEntry:
             logging.warning(
                 "loop parameter is specified, but registered callable is not a coroutine!"
             )
+        self._is_coroutine = iscoroutinefunction(self.callback)
+        self._compile_filter()
+
+    def _compile_filter(self):
+        # C extension passes interned names, so comparing them with interned ones is identity check
+        self.action = normalize(self.action)
+        self.property_class = normalize(self.property_class)
+        self.device = normalize(self.device)
+        self.name = normalize(self.name)
+        for field_name in ("action", "property_class", "state", "perm", "rule"):
+            if isinstance(getattr(self, field_name), Prefix):
+                raise ValueError(f"Prefix can't be used for {field_name}, only device and name")
+        key_fields = (self.action, self.device, self.name, self.property_class)
+        self._key_conditions: Tuple[Optional[Condition], ...] = tuple(
+            compile_condition(value) if value is not None else None for value in key_fields
+        )
+        self._dispatch_keys: Tuple[DispatchKey, ...] = tuple(
+            {
+                (action, device, name, property_class)
+                for action in index_values(self.action)
+                for device in index_values(self.device)
+                for name in index_values(self.name)
+                for property_class in index_values(self.property_class)
+            }
+        )
+        # conditions not covered by dispatch key, cheap ones first
+        checks: List[PropertyCheck] = []
+        for field_name in ("device", "name"):
+            condition = getattr(self, field_name)
+            if isinstance(condition, Prefix):
+                checks.append(attribute_check(field_name, condition))
+        for field_name in ("state", "perm", "rule"):
+            condition = normalize(getattr(self, field_name))
+            setattr(self, field_name, condition)
+            if condition is not None:
+                checks.append(attribute_check(field_name, condition))
+        if self.items:
+            checks.append(items_check(self.items))
+        self._checks: Tuple[PropertyCheck, ...] = tuple(checks)
+
+    @property
+    def dispatch_keys(self) -> Tuple[DispatchKey, ...]:
+        """Keys of dispatch index buckets entry is put into, one for each combination of accepted values"""
+        return self._dispatch_keys
+
+    @property
+    def expired(self) -> bool:
+        return self.run_times is not None and self.run_times <= 0
 
     def accepts(self, action: IndigoDriverAction, prop: IndigoProperty) -> bool:
-        if self.action is not None and action is not self.action:
+        action_matches, device_matches, name_matches, class_matches = self._key_conditions
+        if action_matches is not None and not action_matches(action):
             return False
-        if self.property_class is not None and prop.__class__ is not self.property_class:
+        if class_matches is not None and not class_matches(prop.__class__):
+            return False
+        if device_matches is not None and not device_matches(prop.device):
+            return False
+        if name_matches is not None and not name_matches(prop.name):
+            return False
+        return self.accepts_attributes(prop)
+
+    def accepts_attributes(self, prop: IndigoProperty) -> bool:
+        """Check conditions that are not covered by dispatch key, entry with failing condition
+        (e.g. user predicate on item value) does not accept the property"""
+        try:
+            for check in self._checks:
+                if not check(prop):
+                    return False
+            return True
+        except Exception as e:
+            if logging.pyindigoConfig.log_callback_exceptions:
+                logging.warning(
+                    f"Error in accepts conditions of {self.callback.__name__} "
+                    + f"(defined in {self.callback.__module__}):\n{type(e).__name__}: {e}"
+                )
             return False
-        for field in fields(prop):
-            desired_value = getattr(self, field.name, None)
-            property_value = getattr(prop, field.name, None)
-            if desired_value is not None and property_value != desired_value:
-                return False
-        return True
 
     def run_if_accepted(self, action: IndigoDriverAction, prop: IndigoProperty):
         if self.accepts(action, prop):
-            if logging.pyindigoConfig.log_callback_dispatching:
-                logging.info(
-                    f"{prop.name} property ({action}d) is passed to {self.callback.__name__} "
-                    + f"(defined in {self.callback.__module__})"
+            self.run(action, prop)
+
+    def run(self, action: IndigoDriverAction, prop: IndigoProperty):
+        if logging.pyindigoConfig.log_callback_dispatching:
+            logging.info(
+                f"{prop.name} property ({action}d) is passed to {self.callback.__name__} "
+                + f"(defined in {self.callback.__module__})"
+            )
+        try:
+            if self._is_coroutine:
+                run_coroutine_threadsafe(self.callback(action, prop), self.loop)
+            else:
+                self.callback(action, prop)
+        except Exception as e:
+            if logging.pyindigoConfig.log_callback_exceptions:
+                logging.warning(
+                    f"Error in callback {self.callback.__name__} (defined in {self.callback.__module__}):\n"
+                    + f"{type(e).__name__}: {e}"
+                )
+        finally:
+            if self.run_times is not None:
+                self.run_times -= 1
+
+
+class _Bucket:
+    """Entries with the same dispatch key, keyed by token, plus a cached tuple of them to iterate over"""
+
+    __slots__ = ("entries", "_snapshot")
+
+    def __init__(self):
+        self.entries: Dict[int, IndigoCallbackEntry] = {}
+        self._snapshot: Optional[Tuple[IndigoCallbackEntry, ...]] = None
+
+    def add(self, entry: IndigoCallbackEntry):
+        self.entries[entry.token] = entry
+        self._snapshot = None
+
+    def discard(self, entry: IndigoCallbackEntry):
+        self.entries.pop(entry.token, None)
+        self._snapshot = None
+
+    @property
+    def snapshot(self) -> Tuple[IndigoCallbackEntry, ...]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = tuple(self.entries.values())
+        return snapshot
+
+
+class CallbackDispatchIndex:
+    """Registered callback entries grouped into buckets by their dispatch key.
+
+    Each combination of specified key fields (a "mask") has its own bucket table, the one with no fields
+    specified being the wildcard bucket. For an event only one bucket per mask in use is looked up, so the
+    cost of dispatch depends on the number of entries that can match the event, not on the total number
+    of registered entries. Entry accepting several values of key fields is put into a bucket for each
+    combination of them, adding and discarding an entry are O(number of its buckets). Events are dispatched
+    over bucket snapshots, so (un)registering callbacks from the callbacks themselves does not affect the
+    event being dispatched.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, IndigoCallbackEntry] = {}
+        # replaced rather than mutated when masks are added or removed, as it is iterated over on dispatch
+        self._tables: Dict[int, Dict[DispatchKey, _Bucket]] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def _mask(key: DispatchKey) -> int:
+        mask = 0
+        for bit, value in enumerate(key):
+            if value is not None:
+                mask |= 1 << bit
+        return mask
+
+    def add(self, entry: IndigoCallbackEntry):
+        with self._lock:
+            entry.token = next(_tokens)
+            self._entries[entry.token] = entry
+            # all keys of an entry have the same mask, so an event never hits more than one of them
+            for key in entry.dispatch_keys:
+                mask = self._mask(key)
+                table = self._tables.get(mask)
+                if table is None:
+                    table = {}
+                    # less specific buckets are dispatched first, e.g. property cache (catch-all) and device
+                    # state callbacks run before waiters for device's property, see pyindigo.core.waiters
+                    self._tables = dict(sorted({**self._tables, mask: table}.items()))
+                bucket = table.get(key)
+                if bucket is None:
+                    bucket = table[key] = _Bucket()
+                bucket.add(entry)
+
+    def discard(self, entry: IndigoCallbackEntry):
+        with self._lock:
+            if self._entries.pop(entry.token, None) is None:
+                return
+            for key in entry.dispatch_keys:
+                mask = self._mask(key)
+                table = self._tables[mask]
+                bucket = table[key]
+                bucket.discard(entry)
+                if not bucket.entries:
+                    del table[key]
+                    if not table:
+                        self._tables = {m: t for m, t in self._tables.items() if m != mask}
+
+    def buckets_for(
+        self, action: IndigoDriverAction, prop: IndigoProperty
+    ) -> Iterator[Tuple[IndigoCallbackEntry, ...]]:
+        """Buckets of entries, that may accept (action, prop) pair judging by dispatch key"""
+        device = prop.device
+        name = prop.name
+        property_class = prop.__class__
+        for mask, table in self._tables.items():
+            bucket = table.get(
+                (
+                    action if mask & 1 else None,
+                    device if mask & 2 else None,
+                    name if mask & 4 else None,
+                    property_class if mask & 8 else None,
                 )
-            try:
-                if iscoroutinefunction(self.callback):
-                    run_coroutine_threadsafe(self.callback(action, prop), self.loop)
-                else:
-                    self.callback(action, prop)
-            except Exception as e:
-                if logging.pyindigoConfig.log_callback_exceptions:
-                    logging.warning(
-                        f"Error in callback {self.callback.__name__} (defined in {self.callback.__module__}):\n"
-                        + f"{type(e).__name__}: {e}"
-                    )
-            finally:
-                if self.run_times is not None:
-                    self.run_times -= 1
-
-
-registered_callback_entries: List[IndigoCallbackEntry] = []
-
-
-def dispatching_callback(action_string: str, prop: IndigoProperty):
+            )
+            if bucket is not None:
+                yield bucket.snapshot
+
+    def __contains__(self, entry: IndigoCallbackEntry) -> bool:
+        return self._entries.get(entry.token) is entry
+
+    def __iter__(self) -> Iterator[IndigoCallbackEntry]:
+        return iter(tuple(self._entries.values()))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_tokens = count()
+
+registered_callback_entries = CallbackDispatchIndex()
+
+
+def dispatching_callback(action: Union[IndigoDriverAction, str], prop: IndigoProperty):
+    """C extension passes IndigoDriverAction members, action strings are converted"""
     if logging.pyindigoConfig.log_driver_actions:
-        logging.info(f"Driver action:\n{action_string}: {prop}")
-    global registered_callback_entries
-    action = IndigoDriverAction(action_string)
-    for i, callback_entry in enumerate(registered_callback_entries):
-        callback_entry.run_if_accepted(action, prop)
-    registered_callback_entries = [
-        entry
-        for entry in registered_callback_entries
-        if entry.run_times is None or entry.run_times > 0
-    ]
+        logging.info(f"Driver action:\n{action}: {prop}")
+    if action.__class__ is not IndigoDriverAction:
+        action = IndigoDriverAction(action)
+    for bucket in registered_callback_entries.buckets_for(action, prop):
+        for callback_entry in bucket:
+            if callback_entry.expired or not callback_entry.accepts_attributes(prop):
+                continue
+            callback_entry.run(action, prop)
+            if callback_entry.expired:
+                registered_callback_entries.discard(callback_entry)
+
+
+# dispatching queued events (see pyindigo.core.event_queue)
+
+QueuedEvent = Tuple[IndigoDriverAction, IndigoProperty]
+
+_coalesce_updates = False
+coalesced_updates_count = 0
+
+
+def set_update_coalescing(enabled: bool):
+    """When enabled, UPDATE events for a device property, superseded by a later queued UPDATE of the same
+    property, are not dispatched. DEFINE and DELETE events, as well as BLOB properties, are always dispatched
+    in order. Affects only queued dispatching. Resets the count of coalesced updates."""
+    global _coalesce_updates, coalesced_updates_count
+    _coalesce_updates = enabled
+    coalesced_updates_count = 0
+
+
+def get_coalesced_updates_count() -> int:
+    return coalesced_updates_count
+
+
+def coalesce_updates(events: List[QueuedEvent]) -> List[QueuedEvent]:
+    """Drop UPDATE events followed by UPDATE of the same (device, property) pair in the events list.
+
+    DEFINE and DELETE events of the property separate its updates, so they're never coalesced across them.
+    """
+    global coalesced_updates_count
+    later_updates = set()
+    coalesced = []
+    for action, prop in reversed(events):
+        key = (prop.device, prop.name)
+        if action is not IndigoDriverAction.UPDATE or isinstance(prop, BlobVectorProperty):
+            later_updates.discard(key)
+        elif key in later_updates:
+            coalesced_updates_count += 1
+            continue
+        else:
+            later_updates.add(key)
+        coalesced.append((action, prop))
+    coalesced.reverse()
+    return coalesced
+
+
+def dispatch_events(events: List[QueuedEvent]):
+    if _coalesce_updates and len(events) > 1:
+        events = coalesce_updates(events)
+    for action, prop in events:
+        try:
+            dispatching_callback(action, prop)
+        except Exception:
+            logging.exception("Error in dispatching callback")
+
+
+class IndigoCallbackHandle:
+    """Registration token returned by indigo_callback.
+
+    Calling the handle calls registered callback, so decorated functions can still be used as usual.
+    """
+
+    def __init__(self, entry: IndigoCallbackEntry):
+        self.entry = entry
+        update_wrapper(self, entry.callback)
+
+    def __call__(self, *args, **kwargs):
+        return self.entry.callback(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<IndigoCallbackHandle #{self.entry.token} for {self.entry.callback!r}>"
+
+    @property
+    def registered(self) -> bool:
+        return self.entry in registered_callback_entries
+
+    def discard(self):
+        registered_callback_entries.discard(self.entry)
 
 
 def indigo_callback(
@@ -127,17 +411,24 @@ def indigo_callback(
 
     Basic action/property filtering is done by the dispatching callback, and my_selective_callback runs only when driver
     action and property attributes match those passed to indigo_callback decorator factory. Non-specified field mean
-    any value is acceptable.
+    any value is acceptable. Filtering on action, device, name and property_class is the cheapest, as these
+    are used to index registered callbacks. Richer conditions (sets of values, name prefixes, item values) are
+    described in pyindigo.core.filters.
     Additional optional arguments:
         run_times specifies how many times callback will be run before being discarded;
         loop, if coroutine is decorated, specifies asyncio loop to run it in.
+
+    Registered callback is replaced with IndigoCallbackHandle. It can be called just like the original callback
+    and is used to discard it:
+    >>> handle = indigo_callback(my_callback, run_times=10)
+    >>> ...
+    >>> handle.discard()  # or discard_indigo_callback(handle)
     """
 
-    def decorator(decorated_callback):
-        registered_callback_entries.append(
-            IndigoCallbackEntry(decorated_callback, **accepts, run_times=run_times, loop=loop)
-        )
-        return decorated_callback
+    def decorator(decorated_callback) -> IndigoCallbackHandle:
+        entry = IndigoCallbackEntry(decorated_callback, **accepts, run_times=run_times, loop=loop)
+        registered_callback_entries.add(entry)
+        return IndigoCallbackHandle(entry)
 
     if callback is None:  # when using as decorator factory
         return decorator
@@ -145,12 +436,14 @@ def indigo_callback(
         return decorator(callback)
 
 
-def discard_indigo_callback(callback: Callable):
-    """Discard previously registered indigo callback"""
-    global registered_callback_entries
-    registered_callback_entries = [
-        entry for entry in registered_callback_entries if entry.callback != callback
-    ]
+def discard_indigo_callback(callback: Union[IndigoCallbackHandle, Callable]):
+    """Discard previously registered indigo callback by its handle (fast) or by the callback itself"""
+    if isinstance(callback, IndigoCallbackHandle):
+        callback.discard()
+        return
+    for entry in registered_callback_entries:
+        if entry.callback == callback:
+            registered_callback_entries.discard(entry)
 
 
 @indigo_callback(accepts={"state": IndigoPropertyState.ALERT})
@@ -14,6 +14,14 @@ class IndigoDriverAction(Enum):
         return self.value
 
 
+class IndigoBlobMode(Enum):
+    """How BLOBs are sent by INDIGO, see indigo_enable_blob_mode"""
+
+    NEVER = 0  # BLOB properties are sent without BLOB data
+    ALSO = 1  # BLOB data is sent along with property
+    URL = 2  # only URL is sent, data is downloaded on demand (INDIGO 2.0+, remote devices)
+
+
 class IndigoLogLevel(Enum):
     ERROR = 0
     INFO = 1
@@ -26,5 +34,6 @@ __all__ = [
     "IndigoPropertyState",
     "IndigoSwitchRule",
     "IndigoDriverAction",
+    "IndigoBlobMode",
     "IndigoLogLevel",
 ]
@@ -0,0 +1,103 @@
+"""Queued dispatching, an alternative to running all callbacks right on INDIGO bus thread.
+
+When event queue is started, INDIGO bus thread only copies property to a bounded queue in C extension and
+returns immediately, without acquiring GIL. Dedicated Python thread takes properties from the queue and
+passes them to the dispatching callback, so slow callbacks do not stall INDIGO bus.
+
+Example use:
+>>> from pyindigo.core.event_queue import start_event_queue, OverflowPolicy
+>>> start_event_queue(capacity=256, overflow_policy=OverflowPolicy.COALESCE)
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from threading import Thread, current_thread
+from typing import Optional
+
+from .core_ext import enable_event_queue, disable_event_queue, next_events
+from .core_ext import event_queue_stats as _event_queue_stats
+from .dispatching_callback import (
+    dispatch_events,
+    set_update_coalescing,
+    get_coalesced_updates_count,
+)
+
+
+class OverflowPolicy(Enum):
+    """What to do with a new event when the queue is full"""
+
+    # INDIGO bus waits for the consumer; events generated on consumer thread itself
+    # (e.g. by setting a property from a callback) drop the oldest event instead to avoid deadlock
+    BLOCK = 0
+    DROP_OLDEST = 1
+    # replace queued UPDATE event for the same device and property (except BLOBs), unless DEFINE or DELETE
+    # of the property is queued after it; drop the oldest if there's no such UPDATE
+    COALESCE = 2
+
+
+@dataclass
+class EventQueueStats:
+    enabled: bool
+    policy: OverflowPolicy
+    capacity: int
+    depth: int  # events waiting in the queue
+    max_depth: int
+    enqueued: int
+    dropped: int
+    coalesced: int  # on queue overflow
+    coalesced_on_dispatch: int  # see start_event_queue's coalesce_updates
+
+
+def event_queue_stats() -> EventQueueStats:
+    stats = _event_queue_stats()
+    stats["policy"] = OverflowPolicy(stats["policy"])
+    return EventQueueStats(**stats, coalesced_on_dispatch=get_coalesced_updates_count())
+
+
+_consumer: Optional[Thread] = None
+
+_BATCH_SIZE = 64
+_WAITING_TIMEOUT = 1.0  # sec, consumer is also woken up when queue is stopped
+
+
+def _consume(batch_size: int):
+    while True:
+        events = next_events(_WAITING_TIMEOUT, batch_size)
+        if events is None:  # queue is stopped and drained
+            return
+        dispatch_events(events)  # errors are handled for each event
+
+
+def start_event_queue(
+    capacity: int = 1024,
+    overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    coalesce_updates: bool = False,
+):
+    """Start dispatching properties from a dedicated Python thread through a queue of given capacity.
+
+    With coalesce_updates consumer takes all queued events at once and skips UPDATEs superseded by newer UPDATE
+    of the same property, so that it catches up quickly after falling behind.
+    """
+    global _consumer
+    if _consumer is not None:
+        raise RuntimeError("Event queue is already started")
+    enable_event_queue(capacity, overflow_policy.value)
+    set_update_coalescing(coalesce_updates)
+    _consumer = Thread(
+        target=_consume,
+        args=(capacity if coalesce_updates else _BATCH_SIZE,),
+        name="pyindigo-dispatcher",
+        daemon=True,
+    )
+    _consumer.start()
+
+
+def stop_event_queue(timeout: Optional[float] = None):
+    """Return to dispatching properties right on INDIGO bus thread, events already queued are still dispatched"""
+    global _consumer
+    if _consumer is None:
+        return
+    disable_event_queue()
+    if _consumer is not current_thread():  # may be stopped from callback
+        _consumer.join(timeout)
+    _consumer = None
@@ -0,0 +1,1029 @@
+"""Pure Python stand-in for core_ext extension module, working without INDIGO.
+
+Module implements the same functions as core_ext, but instead of INDIGO bus there are simulated drivers
+defining simulated devices. Devices respond to property changes roughly the way INDIGO simulators do and
+can generate property traffic at configurable rates, so callbacks and dispatching can be tested and
+load-tested on machines without INDIGO. See pyindigo.backend on how to select it instead of core_ext.
+
+Example use:
+>>> import pyindigo.backend
+>>> pyindigo.backend.use_backend('fake')  # or PYINDIGO_BACKEND=fake environment variable
+>>> import pyindigo.models.client as client
+>>> from pyindigo.core import fake_ext
+>>> fake_ext.register_driver('many_devices', lambda: [FakeDevice(f'Device {i}') for i in range(100)])
+>>> client.attach_drivers(['indigo_ccd_simulator', 'many_devices'])
+>>> fake_ext.start_traffic(updates_per_sec=5000, blobs_per_sec=10, blob_size=8 * 1024 ** 2)
+
+Module must not import pyindigo.core, as it's imported while pyindigo.core is initialized: property classes
+and dispatching callback are passed to it just as they're passed to core_ext.
+"""
+
+import os
+import sys
+import time
+import traceback
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import count
+from queue import Queue
+from threading import Condition, RLock, Thread, Timer, Event, get_ident
+from typing import Optional, List, Dict, Any, Callable, Tuple, Deque
+
+
+# property types, values are indices in set_property_classes arguments
+TEXT, NUMBER, SWITCH, LIGHT, BLOB = range(5)
+
+# numeric values of pyindigo.core.properties.attribute_enums
+IDLE, OK, BUSY, ALERT = range(4)
+RO, RW, WO = 1, 2, 3
+EXACTLY_ONE, AT_MOST_ONE, ANY = 1, 2, 3
+
+
+@dataclass
+class FakeProperty:
+    """Simulated INDIGO property, items map names to lists of item fields in the order of item class fields
+    (except name), e.g. [value, format, min, max, step, target] for number items"""
+
+    type: int
+    device: str
+    name: str
+    state: int = IDLE
+    perm: int = RO
+    rule: Optional[int] = None
+    items: Dict[str, List[Any]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # names are interned, just like those passed by C extension
+        self.device = sys.intern(self.device)
+        self.name = sys.intern(self.name)
+        self.items = {sys.intern(name): item for name, item in self.items.items()}
+
+    def columns(self) -> Tuple[Tuple, ...]:
+        names = tuple(self.items)
+        fields_count = len(next(iter(self.items.values()))) if self.items else 0
+        return (
+            names,
+            *(tuple(item[i] for item in self.items.values()) for i in range(fields_count)),
+        )
+
+
+def text_property(device: str, name: str, perm: int = RO, **values: str) -> FakeProperty:
+    return FakeProperty(TEXT, device, name, OK, perm, items={k: [v] for k, v in values.items()})
+
+
+def number_property(device: str, name: str, perm: int = RW, **values: float) -> FakeProperty:
+    return FakeProperty(
+        NUMBER,
+        device,
+        name,
+        OK,
+        perm,
+        items={k: [float(v), "%g", -1e6, 1e6, 0.0, float(v)] for k, v in values.items()},
+    )
+
+
+def switch_property(
+    device: str, name: str, rule: int = EXACTLY_ONE, perm: int = RW, **values: bool
+) -> FakeProperty:
+    return FakeProperty(
+        SWITCH, device, name, OK, perm, rule, items={k: [bool(v)] for k, v in values.items()}
+    )
+
+
+def blob_property(device: str, name: str, *item_names: str) -> FakeProperty:
+    return FakeProperty(BLOB, device, name, OK, RO, items={k: [b"", ""] for k in item_names})
+
+
+class FakeDevice:
+    """Simulated device with INFO and CONNECTION properties, subclasses define properties available when
+    connected and react to their changes"""
+
+    interface = "0"
+    connect_delay = 0.05  # sec between BUSY and OK state of CONNECTION property
+    traffic_property = "SIMULATED_VALUE"  # number property updated by traffic generator
+
+    def __init__(self, name: str):
+        self.name = name
+        self.properties: Dict[str, FakeProperty] = {}
+        self.connected = False
+        # guards properties, but not dispatching, so that callbacks are free to set properties
+        self.lock = RLock()
+
+    def base_properties(self) -> List[FakeProperty]:
+        return [
+            text_property(
+                self.name,
+                "INFO",
+                DEVICE_NAME=self.name,
+                DEVICE_VERSION="2.0.0.0",
+                DEVICE_INTERFACE=self.interface,
+            ),
+            switch_property(self.name, "CONNECTION", CONNECTED=False, DISCONNECTED=True),
+        ]
+
+    def connected_properties(self) -> List[FakeProperty]:
+        return [number_property(self.name, "SIMULATED_VALUE", perm=RO, VALUE=0.0)]
+
+    def define(self, *props: FakeProperty):
+        for prop in props:
+            with self.lock:
+                self.properties[prop.name] = prop
+                snapshot = _snapshot(prop)
+            _dispatch("define", snapshot)
+
+    def update(self, prop: FakeProperty, state: Optional[int] = None, **values: Any):
+        with self.lock:
+            if state is not None:
+                prop.state = state
+            for name, value in values.items():
+                prop.items[name][0] = value
+            snapshot = _snapshot(prop)
+        _dispatch("update", snapshot)
+
+    def delete(self, *props: FakeProperty):
+        for prop in props:
+            with self.lock:
+                if self.properties.pop(prop.name, None) is None:
+                    continue
+                snapshot = _snapshot(prop)
+            _dispatch("delete", snapshot)
+
+    def attach(self):
+        self.define(*self.base_properties())
+
+    def detach(self):
+        with self.lock:
+            props = list(self.properties.values())
+        self.delete(*props)
+
+    def change_property(self, name: str, values: Dict[str, Any]):
+        """Called on set_property, unknown and read-only properties are ignored like INDIGO does"""
+        prop = self.properties.get(name)
+        if prop is None or prop.perm == RO:
+            return
+        if name == "CONNECTION":
+            self._change_connection(prop, values)
+        else:
+            self.on_change(prop, values)
+
+    def on_change(self, prop: FakeProperty, values: Dict[str, Any]):
+        """Default reaction: apply new values and update property in OK state"""
+        if prop.type == SWITCH and prop.rule != ANY and any(values.values()):
+            values = {**{name: False for name in prop.items}, **values}
+        self.update(prop, OK, **{k: v for k, v in values.items() if k in prop.items})
+
+    def _change_connection(self, prop: FakeProperty, values: Dict[str, Any]):
+        connect = values.get("CONNECTED", not values.get("DISCONNECTED", True))
+        self.update(prop, BUSY)
+        _after(self.connect_delay, self.set_connected, connect)
+
+    def set_connected(self, connected: bool):
+        with self.lock:
+            was_connected, self.connected = self.connected, connected
+            connection = self.properties.get("CONNECTION")
+            base = {prop.name for prop in self.base_properties()}
+            connected_props = [p for p in self.properties.values() if p.name not in base]
+        if connection is None:  # detached meanwhile
+            return
+        if connected and not was_connected:
+            self.define(*self.connected_properties())
+        elif not connected and was_connected:
+            self.delete(*connected_props)
+        self.update(connection, OK, CONNECTED=connected, DISCONNECTED=not connected)
+
+    def generate_update(self, step: int) -> bool:
+        """Called by traffic generator, returns if property was updated"""
+        prop = self.properties.get(self.traffic_property)
+        if prop is None:
+            return False
+        self.update(prop, OK, **{name: float(step) for name in prop.items})
+        return True
+
+    def generate_blob(self, data: bytes) -> bool:
+        """Called by traffic generator, returns if BLOB was generated"""
+        return False
+
+
+class FakeCCD(FakeDevice):
+    """Camera taking images of requested size (blob_size bytes) with exposures timed by real clock"""
+
+    interface = "2"
+    traffic_property = "CCD_TEMPERATURE"
+    blob_size = 1024 ** 2
+    image_format = ".fits"
+
+    def connected_properties(self) -> List[FakeProperty]:
+        return [
+            number_property(self.name, "CCD_EXPOSURE", EXPOSURE=0.0),
+            number_property(self.name, "CCD_STREAMING", EXPOSURE=0.0, COUNT=0.0),
+            switch_property(self.name, "CCD_ABORT_EXPOSURE", ABORT_EXPOSURE=False),
+            number_property(self.name, "CCD_TEMPERATURE", TEMPERATURE=-10.0),
+            switch_property(self.name, "CCD_COOLER", ON=False, OFF=True),
+            number_property(self.name, "CCD_BIN", HORIZONTAL=1.0, VERTICAL=1.0),
+            number_property(self.name, "CCD_GAIN", GAIN=0.0),
+            number_property(self.name, "CCD_OFFSET", OFFSET=0.0),
+            switch_property(self.name, "CCD_FRAME_TYPE", LIGHT=True, BIAS=False, DARK=False, FLAT=False),
+            blob_property(self.name, "CCD_IMAGE", "IMAGE"),
+        ]
+
+    def on_change(self, prop: FakeProperty, values: Dict[str, Any]):
+        if prop.name == "CCD_EXPOSURE":
+            exposure = values.get("EXPOSURE", 0.0)
+            self.update(prop, BUSY, EXPOSURE=exposure)
+            _after(exposure, self._expose_frames, exposure, 1)
+        elif prop.name == "CCD_STREAMING":
+            exposure = values.get("EXPOSURE", prop.items["EXPOSURE"][0])
+            frames = int(values.get("COUNT", prop.items["COUNT"][0]))
+            self.update(prop, BUSY, EXPOSURE=exposure, COUNT=float(frames))
+            _after(exposure, self._expose_frames, exposure, frames, prop)
+        else:
+            super().on_change(prop, values)
+
+    def _expose_frames(
+        self, exposure: float, frames: int, streaming: Optional[FakeProperty] = None
+    ):
+        if not self.generate_blob(bytes(self.blob_size)):  # disconnected meanwhile
+            return
+        frames -= 1
+        if streaming is None:
+            self.update(self.properties["CCD_EXPOSURE"], OK, EXPOSURE=0.0)
+        elif frames != 0:  # negative count means endless streaming
+            self.update(streaming, BUSY, COUNT=float(frames))
+            _after(exposure, self._expose_frames, exposure, frames, streaming)
+        else:
+            self.update(streaming, OK, COUNT=0.0)
+
+    def generate_blob(self, data: bytes) -> bool:
+        with self.lock:
+            image = self.properties.get("CCD_IMAGE")
+            if image is None:
+                return False
+            image.items["IMAGE"] = [data, self.image_format]
+        self.update(image, OK)
+        return True
+
+
+class FakeMount(FakeDevice):
+    interface = "1"
+    traffic_property = "MOUNT_EQUATORIAL_COORDINATES"
+
+    def connected_properties(self) -> List[FakeProperty]:
+        return [
+            number_property(self.name, "MOUNT_EQUATORIAL_COORDINATES", RA=0.0, DEC=0.0),
+            switch_property(self.name, "MOUNT_PARK", PARKED=True, UNPARKED=False),
+        ]
+
+
+# simulated drivers: library name -> factory of devices defined on attachment
+
+drivers: Dict[str, Callable[[], List[FakeDevice]]] = {
+    "indigo_ccd_simulator": lambda: [
+        FakeCCD("CCD Imager Simulator"),
+        FakeCCD("CCD Guider Simulator"),
+        FakeDevice("CCD Imager Simulator (focuser)"),
+    ],
+    "indigo_mount_simulator": lambda: [FakeMount("Mount Simulator")],
+}
+
+
+def register_driver(driver_lib_name: str, device_factory: Callable[[], List[FakeDevice]]):
+    """Make simulated driver available to attach_driver"""
+    drivers[driver_lib_name] = device_factory
+
+
+# bus state, guarded by bus lock
+
+_bus_lock = RLock()
+_client_attached = False
+_attached_drivers: Dict[int, Tuple[str, List[FakeDevice]]] = {}
+_driver_handles = count(1)
+_servers: Dict[int, Tuple[str, str, int]] = {}
+_server_handles = count(1)
+reachable_servers = set()  # (host, port) pairs simulated remote servers are available at
+
+_property_classes: List[type] = []
+# state, perm, switch rule and driver action enums as {value: member}, see set_enum_classes
+_state_members: Dict[int, Any] = {}
+_perm_members: Dict[int, Any] = {}
+_rule_members: Dict[int, Any] = {}
+_action_members: Dict[str, Any] = {}
+_dispatching_callback: Optional[Callable] = None
+_zero_copy_blobs = False
+_log_level = 0
+
+
+def _devices() -> Dict[str, FakeDevice]:
+    with _bus_lock:
+        return {
+            device.name: device for _, devices in _attached_drivers.values() for device in devices
+        }
+
+
+def _after(delay: float, function: Callable, *args):
+    timer = Timer(delay, function, args)
+    timer.daemon = True
+    timer.start()
+
+
+# dispatching, mirrors call_dispatching_callback from core_ext
+
+
+def _snapshot(prop: FakeProperty) -> Tuple:
+    """Everything needed to build Python property object, copied from simulated property"""
+    columns = prop.columns()
+    if prop.type == BLOB:
+        names, values, formats = columns
+        sizes = tuple(map(len, values))
+        if _frame_pool.enabled:
+            values = tuple(_frame_pool.copy(value) for value in values)
+        elif _zero_copy_blobs:
+            values = tuple(memoryview(value) for value in values)
+        columns = (names, values, formats, sizes, (None,) * len(names), (None,) * len(names))
+    return (prop.type, prop.device, prop.name, prop.state, prop.perm, prop.rule, columns)
+
+
+def _build_property(snapshot: Tuple):
+    property_type, device, name, state, perm, rule, columns = snapshot
+    cls = _property_classes[property_type]
+    if property_type == LIGHT:
+        names, values = columns
+        columns = (names, tuple(_state_members.get(value, value) for value in values))
+    return cls._with_items_loader(
+        device,
+        name,
+        _state_members.get(state, state),
+        _perm_members.get(perm, perm),
+        _rule_members.get(rule, rule),
+        partial(cls._load_columns, *columns),
+    )
+
+
+def _dispatch(action: str, snapshot: Tuple):
+    if not _client_attached or _dispatching_callback is None:
+        return
+    if _sink_blobs(action, snapshot):
+        return
+    _dispatch_snapshot(action, snapshot)
+
+
+def _dispatch_snapshot(action: str, snapshot: Tuple):
+    if _event_queue.enqueue(action, snapshot):
+        return
+    try:
+        _dispatching_callback(_action_members.get(action, action), _build_property(snapshot))
+    except Exception:
+        traceback.print_exc()
+
+
+# client-level functions
+
+
+def setup_client():
+    global _client_attached
+    _client_attached = True
+
+
+def cleanup_client():
+    global _client_attached
+    stop_traffic()
+    stop_blob_writer()
+    with _blob_sinks_lock:
+        _blob_sinks.clear()
+    _event_queue.shutdown()
+    disable_frame_pool()
+    with _bus_lock:
+        for handle in list(_attached_drivers):
+            detach_driver(handle)
+        _servers.clear()
+    _client_attached = False
+
+
+def set_log_level(verbosity: int):
+    global _log_level
+    _log_level = verbosity
+
+
+def set_property_classes(text_cls, number_cls, switch_cls, light_cls, blob_cls):
+    _property_classes[:] = [text_cls, number_cls, switch_cls, light_cls, blob_cls]
+
+
+def set_enum_classes(state_enum, perm_enum, rule_enum, action_enum):
+    for members, enum in (
+        (_state_members, state_enum),
+        (_perm_members, perm_enum),
+        (_rule_members, rule_enum),
+        (_action_members, action_enum),
+    ):
+        members.clear()
+        members.update((member.value, member) for member in enum)
+
+
+def set_dispatching_callback(callback: Callable):
+    global _dispatching_callback
+    _dispatching_callback = callback
+
+
+def set_zero_copy_blobs(enabled: bool):
+    global _zero_copy_blobs
+    _zero_copy_blobs = bool(enabled)
+
+
+BLOB_MODE_DEFAULT = -1
+BLOB_MODE_NEVER, BLOB_MODE_ALSO, BLOB_MODE_URL = range(3)
+# (device, property) -> mode, only validated and stored, as simulated devices are always local
+# and BLOBs are sent along with properties
+_blob_modes: Dict[Tuple[str, str], int] = {}
+
+
+def set_blob_mode(device: str, property: str, mode: int):
+    if mode not in {BLOB_MODE_DEFAULT, BLOB_MODE_NEVER, BLOB_MODE_ALSO, BLOB_MODE_URL}:
+        raise ValueError(f"Unknown BLOB mode: {mode}")
+    if mode == BLOB_MODE_DEFAULT:
+        _blob_modes.pop((device, property), None)
+    else:
+        _blob_modes[(device, property)] = mode
+
+
+# driver-level functions
+
+
+def attach_driver(driver_lib_name: str) -> int:
+    with _bus_lock:
+        if any(name == driver_lib_name for name, _ in _attached_drivers.values()):
+            raise ValueError(f'Driver "{driver_lib_name}" is already attached')
+        if driver_lib_name not in drivers:
+            raise ValueError(f'Unable to load requested driver: "{driver_lib_name}"')
+        devices = drivers[driver_lib_name]()
+        handle = next(_driver_handles)
+        _attached_drivers[handle] = (driver_lib_name, devices)
+    for device in devices:
+        device.attach()
+    return handle
+
+
+def detach_driver(handle: int):
+    with _bus_lock:
+        if handle not in _attached_drivers:
+            raise ValueError(f"No driver attached with handle {handle}")
+        _, devices = _attached_drivers.pop(handle)
+    for device in devices:
+        device.detach()
+
+
+def attached_driver_handles() -> Dict[str, int]:
+    with _bus_lock:
+        return {name: handle for handle, (name, _) in _attached_drivers.items()}
+
+
+# server-level functions, servers are "connected" if their address is in reachable_servers
+
+
+def connect_server(name: str, host: str, port: int) -> int:
+    with _bus_lock:
+        if any((host, port) == (h, p) for _, h, p in _servers.values()):
+            raise ValueError(
+                f"Unable to connect to server {host}:{port} (is it already connected?)"
+            )
+        handle = next(_server_handles)
+        _servers[handle] = (name, host, port)
+        return handle
+
+
+def disconnect_server(handle: int):
+    with _bus_lock:
+        if _servers.pop(handle, None) is None:
+            raise ValueError(f"No server connected with handle {handle}")
+
+
+def server_connection_status(handle: int) -> Tuple[bool, str]:
+    with _bus_lock:
+        if handle not in _servers:
+            raise ValueError(f"No server connected with handle {handle}")
+        _, host, port = _servers[handle]
+        connected = (host, port) in reachable_servers
+        return connected, "" if connected else "Connection refused"
+
+
+def connected_server_handles() -> Dict[str, int]:
+    with _bus_lock:
+        return {name: handle for handle, (name, _, _) in _servers.items()}
+
+
+# device-level functions
+
+
+def _property_change(
+    device: str, name: str, property_class: type, item_names: list, item_values: list
+) -> Tuple[str, str, Dict[str, Any]]:
+    if len(item_names) != len(item_values):
+        raise ValueError("Item name and item value lists must be of the same size!")
+    if not all(isinstance(item_name, str) for item_name in item_names):
+        raise TypeError("All item names in item_names_list must be Unicode objects!")
+    expected_types = {TEXT: str, NUMBER: float, SWITCH: bool}
+    if property_class not in _property_classes[:3]:
+        raise TypeError("Unknow propety class!")
+    expected_type = expected_types[_property_classes.index(property_class)]
+    if not all(type(value) is expected_type for value in item_values):
+        raise TypeError(f"All item values must be {expected_type.__name__} objects!")
+    return device, name, dict(zip(item_names, item_values))
+
+
+def _change_property(device: str, name: str, values: Dict[str, Any]):
+    fake_device = _devices().get(device)
+    if fake_device is not None:
+        fake_device.change_property(name, values)
+
+
+def set_property(
+    device: str, name: str, property_class: type, item_names: list, item_values: list
+):
+    _change_property(*_property_change(device, name, property_class, item_names, item_values))
+
+
+def set_properties(changes: list):
+    # all changes are checked before any is applied, as in core_ext
+    for change in [_property_change(*change) for change in changes]:
+        _change_property(*change)
+
+
+def disconnect_device(device: str):
+    fake_device = _devices().get(device)
+    if fake_device is not None:
+        fake_device.change_property("CONNECTION", {"DISCONNECTED": True})
+
+
+# queued dispatching, mirrors event queue from core_ext
+
+
+OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE = range(3)
+
+
+class _EventQueue:
+    def __init__(self):
+        self.condition = Condition()
+        self.enabled = False
+        self.policy = OVERFLOW_BLOCK
+        self.capacity = 0
+        self.events: Deque[List] = deque()  # [action, snapshot] pairs
+        self.consumer: Optional[int] = None
+        self.max_depth = self.enqueued = self.dropped = self.coalesced = 0
+
+    @staticmethod
+    def _is_coalescable(action: str, snapshot: Tuple) -> bool:
+        return action == "update" and snapshot[0] != BLOB
+
+    def _coalesce(self, action: str, snapshot: Tuple) -> bool:
+        """Replace queued UPDATE of the same property, unless it's followed by DEFINE or DELETE of it"""
+        if not self._is_coalescable(action, snapshot):
+            return False
+        device, name = snapshot[1:3]
+        for event in reversed(self.events):
+            event_action, event_snapshot = event
+            event_device, event_name = event_snapshot[1:3]
+            if event_device != device:
+                continue
+            if event_action != "update":
+                if not event_name or event_name == name:  # empty name means all device properties
+                    return False
+                continue
+            if event_name == name:
+                event[1] = snapshot
+                return True
+        return False
+
+    def enqueue(self, action: str, snapshot: Tuple) -> bool:
+        if not self.enabled:
+            return False
+        with self.condition:
+            if not self.enabled:
+                return False
+            while len(self.events) == self.capacity:
+                if self.policy == OVERFLOW_COALESCE and self._coalesce(action, snapshot):
+                    self.coalesced += 1
+                    return True
+                if self.policy == OVERFLOW_BLOCK and self.consumer != get_ident():
+                    self.condition.wait()
+                    if not self.enabled:
+                        return False
+                    continue
+                self.events.popleft()
+                self.dropped += 1
+            self.events.append([action, snapshot])
+            self.enqueued += 1
+            self.max_depth = max(self.max_depth, len(self.events))
+            self.condition.notify_all()
+            return True
+
+    def shutdown(self):
+        with self.condition:
+            self.enabled = False
+            self.condition.notify_all()
+
+
+_event_queue = _EventQueue()
+
+
+def enable_event_queue(capacity: int, policy: int):
+    if capacity <= 0:
+        raise ValueError("Event queue capacity must be positive")
+    if policy not in {OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE}:
+        raise ValueError(f"Unknown overflow policy: {policy}")
+    queue = _event_queue
+    with queue.condition:
+        if queue.enabled or queue.events:
+            raise RuntimeError("Event queue is already enabled or not yet drained")
+        queue.capacity = capacity
+        queue.policy = policy
+        queue.max_depth = queue.enqueued = queue.dropped = queue.coalesced = 0
+        queue.enabled = True
+
+
+def disable_event_queue():
+    _event_queue.shutdown()
+
+
+def next_events(timeout: float, max_count: int) -> Optional[List[Tuple[str, Any]]]:
+    if max_count <= 0:
+        raise ValueError("max_count must be positive")
+    queue = _event_queue
+    with queue.condition:
+        queue.consumer = get_ident()
+        queue.condition.wait_for(lambda: not queue.enabled or queue.events, timeout)
+        batch = [queue.events.popleft() for _ in range(min(max_count, len(queue.events)))]
+        queue.condition.notify_all()
+        if not batch and not queue.enabled:
+            return None
+    return [
+        (_action_members.get(action, action), _build_property(snapshot))
+        for action, snapshot in batch
+    ]
+
+
+def event_queue_stats() -> Dict[str, Any]:
+    queue = _event_queue
+    with queue.condition:
+        return {
+            "enabled": queue.enabled,
+            "policy": queue.policy,
+            "capacity": queue.capacity,
+            "depth": len(queue.events),
+            "max_depth": queue.max_depth,
+            "enqueued": queue.enqueued,
+            "dropped": queue.dropped,
+            "coalesced": queue.coalesced,
+        }
+
+
+# BLOB sinks, mirror BLOB sinks from core_ext
+
+_blob_sinks_lock = RLock()
+# (device, property) -> [directory, template, sequence], "" matches any
+_blob_sinks: Dict[Tuple[str, str], List] = {}
+_blob_sink_counters = {"written": 0, "bytes": 0, "failed": 0}
+_blob_writer: Optional[Tuple[Thread, Queue]] = None
+_blob_writer_max_depth = 0
+
+
+def _find_blob_sink(device: str, name: str) -> Optional[List]:
+    for key in ((device, name), (device, ""), ("", name), ("", "")):
+        if key in _blob_sinks:
+            return _blob_sinks[key]
+    return None
+
+
+def _escape_leading_dots(name: str) -> str:
+    stripped = name.lstrip(".")
+    return "_" * (len(name) - len(stripped)) + stripped
+
+
+def _blob_file_name(
+    template: str, snapshot: Tuple, item: str, format: str, seq: int, now: float
+) -> Optional[str]:
+    """File name made from sink template, None if it would refer to "." or ".." directory"""
+    timestamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now)) + f".{int(now * 1000) % 1000:03d}"
+    file_name = template.format(
+        device=_escape_leading_dots(snapshot[1]).replace("/", "_"),
+        property=_escape_leading_dots(snapshot[2]).replace("/", "_"),
+        item=_escape_leading_dots(item).replace("/", "_"),
+        seq=f"{seq:05d}",
+        timestamp=timestamp,
+        format=format.replace("/", "_"),
+    )
+    return file_name if file_name not in {".", ".."} else None
+
+
+def _write_blob_files(action: str, snapshot: Tuple, data: Tuple, paths: Tuple):
+    written_paths = []
+    for value, path in zip(data, paths):
+        if path is not None and value is None:  # dropped by frame pool
+            path = None
+            with _blob_sinks_lock:
+                _blob_sink_counters["failed"] += 1
+        elif path is not None:
+            try:
+                with open(path, "wb") as file:
+                    file.write(value)
+            except OSError:
+                path = None
+            with _blob_sinks_lock:
+                if path is not None:
+                    _blob_sink_counters["written"] += 1
+                    _blob_sink_counters["bytes"] += len(value)
+                else:
+                    _blob_sink_counters["failed"] += 1
+        written_paths.append(path)
+    names, _, formats, sizes, _, urls = snapshot[6]
+    columns = (names, (None,) * len(names), formats, sizes, tuple(written_paths), urls)
+    _dispatch_snapshot(action, (*snapshot[:6], columns))
+
+
+def _sink_blobs(action: str, snapshot: Tuple) -> bool:
+    if not _blob_sinks or action != "update" or snapshot[0] != BLOB:
+        return False
+    names, values, formats, *_ = snapshot[6]
+    if not any(values):
+        return False
+    with _blob_sinks_lock:
+        sink = _find_blob_sink(snapshot[1], snapshot[2])
+        if sink is None:
+            return False
+        directory, template, _ = sink
+        sink[2] += 1
+        now = time.time()
+        file_names = tuple(
+            _blob_file_name(template, snapshot, *item, sink[2], now) if value else None
+            for *item, value in zip(names, formats, values)
+        )
+        paths = tuple(
+            os.path.join(directory, file_name) if file_name is not None else None
+            for file_name in file_names
+        )
+    # may outlive simulated property
+    data = tuple(bytes(value) if value is not None else None for value in values)
+    writer = _blob_writer
+    if writer is None:
+        _write_blob_files(action, snapshot, data, paths)
+    else:
+        global _blob_writer_max_depth
+        writer[1].put((action, snapshot, data, paths))  # waits when writer falls behind
+        _blob_writer_max_depth = max(_blob_writer_max_depth, writer[1].qsize())
+    return True
+
+
+def add_blob_sink(device: str, property: str, directory: str, template: str):
+    with _blob_sinks_lock:
+        key = (device, property)
+        if key in _blob_sinks:
+            _blob_sinks[key][:2] = [directory, template]
+        else:
+            _blob_sinks[key] = [directory, template, 0]
+
+
+def remove_blob_sink(device: str, property: str) -> bool:
+    with _blob_sinks_lock:
+        return _blob_sinks.pop((device, property), None) is not None
+
+
+def _write_blobs_from_queue(jobs: Queue):
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        _write_blob_files(*job)
+
+
+def start_blob_writer(capacity: int):
+    global _blob_writer, _blob_writer_max_depth
+    if capacity <= 0:
+        raise ValueError("BLOB writer queue capacity must be positive")
+    if _blob_writer is not None:
+        raise RuntimeError("BLOB writer is already running")
+    jobs: Queue = Queue(capacity)
+    thread = Thread(target=_write_blobs_from_queue, args=(jobs,), name="blob-writer", daemon=True)
+    _blob_writer_max_depth = 0
+    _blob_writer = (thread, jobs)
+    thread.start()
+
+
+def stop_blob_writer():
+    global _blob_writer
+    if _blob_writer is None:
+        return
+    thread, jobs = _blob_writer
+    _blob_writer = None
+    jobs.put(None)
+    thread.join()
+
+
+def blob_sink_stats() -> Dict[str, Any]:
+    writer = _blob_writer
+    with _blob_sinks_lock:
+        return {
+            "sinks": len(_blob_sinks),
+            **_blob_sink_counters,
+            "writer_running": writer is not None,
+            "writer_capacity": writer[1].maxsize if writer is not None else 0,
+            "writer_depth": writer[1].qsize() if writer is not None else 0,
+            "writer_max_depth": _blob_writer_max_depth,
+        }
+
+
+# frame pool, mirrors frame pool from core_ext: the number of frames in use is limited, but each frame is
+# a separate bytearray rather than reused memory, as Python can't move memory between buffer objects
+
+
+FRAME_POOL_BLOCK, FRAME_POOL_DROP_OLDEST = range(2)
+
+
+class _Frame(bytearray):
+    """BLOB data in a frame, becomes empty when reclaimed"""
+
+    def tobytes(self) -> bytes:
+        return bytes(self)
+
+
+class _FramePool:
+    def __init__(self):
+        self.condition = Condition()
+        self.enabled = False
+        self.policy = FRAME_POOL_BLOCK
+        self.timeout = 0.0
+        self.frame_size = 0
+        self.free = 0  # frames not in use
+        # acquisition number -> finalizer of the frame object
+        self.holders: Dict[int, weakref.finalize] = {}
+        self.frames_count = self.max_occupancy = 0
+        self.acquired = self.dropped = self.reclaimed = self.oversized = 0
+
+    def _reclaim_oldest(self) -> bool:
+        for acquisition in sorted(self.holders):
+            alive = self.holders[acquisition].peek()
+            if alive is None:  # frame is being released
+                continue
+            try:
+                alive[0].clear()  # fails if frame is exported, e.g. to memoryview or array
+            except BufferError:
+                continue
+            self.holders.pop(acquisition).detach()
+            self.reclaimed += 1
+            return True
+        return False
+
+    def _release(self, acquisition: int):
+        with self.condition:
+            if self.holders.pop(acquisition, None) is not None and self.enabled:
+                self.free += 1
+                self.condition.notify()
+
+    def copy(self, value: bytes) -> Any:
+        """Value copied to a frame, None if it was dropped, or the value itself if frame pool is not used"""
+        with self.condition:
+            if not self.enabled:
+                return value
+            if len(value) > self.frame_size:
+                self.oversized += 1
+                return value
+            if not self.free and self.policy == FRAME_POOL_BLOCK:
+                self.condition.wait_for(lambda: self.free or not self.enabled, self.timeout)
+                if not self.enabled:
+                    return value
+            if self.free:
+                self.free -= 1
+            elif not (self.policy == FRAME_POOL_DROP_OLDEST and self._reclaim_oldest()):
+                self.dropped += 1
+                return None
+            frame = _Frame(value)
+            self.acquired += 1
+            self.holders[self.acquired] = weakref.finalize(frame, self._release, self.acquired)
+            self.max_occupancy = max(self.max_occupancy, len(self.holders))
+            return frame
+
+
+_frame_pool = _FramePool()
+
+
+def enable_frame_pool(frames_count: int, frame_size: int, policy: int, timeout: float):
+    if frames_count <= 0 or frame_size <= 0:
+        raise ValueError("Frame pool must have positive number and size of frames")
+    if policy not in {FRAME_POOL_BLOCK, FRAME_POOL_DROP_OLDEST}:
+        raise ValueError(f"Unknown frame pool policy: {policy}")
+    if timeout < 0:
+        raise ValueError("Frame pool timeout must be non-negative")
+    pool = _frame_pool
+    with pool.condition:
+        if pool.enabled or pool.holders:
+            raise RuntimeError("Frame pool is already enabled or its frames are still in use")
+        pool.free = frames_count
+        pool.frames_count = frames_count
+        pool.frame_size = frame_size
+        pool.policy = policy
+        pool.timeout = timeout
+        pool.max_occupancy = pool.acquired = pool.dropped = pool.reclaimed = pool.oversized = 0
+        pool.enabled = True
+
+
+def disable_frame_pool():
+    pool = _frame_pool
+    with pool.condition:
+        pool.enabled = False
+        pool.free = 0
+        pool.condition.notify_all()
+
+
+def frame_pool_stats() -> Dict[str, Any]:
+    pool = _frame_pool
+    with pool.condition:
+        return {
+            "enabled": pool.enabled,
+            "policy": pool.policy,
+            "frames": pool.frames_count,
+            "frame_size": pool.frame_size,
+            "occupancy": len(pool.holders),
+            "max_occupancy": pool.max_occupancy,
+            "acquired": pool.acquired,
+            "dropped": pool.dropped,
+            "reclaimed": pool.reclaimed,
+            "oversized": pool.oversized,
+        }
+
+
+# traffic generation for load testing
+
+
+@dataclass
+class _TrafficCounters:
+    updates: int = 0
+    blobs: int = 0
+    lag: float = 0.0  # sec, how much generator is behind schedule, i.e. dispatching is too slow
+
+
+_traffic_threads: List[Thread] = []
+_traffic_stopped = Event()
+_traffic = _TrafficCounters()
+
+
+def _generate(
+    rate: float, generate: Callable[[FakeDevice, int], bool], counter: str, devices: List[str]
+):
+    """Call generate(device, step) rate times per second in total, round-robin over devices. Calls are made
+    in bursts on each clock tick, so thousands of calls per second are possible despite sleep granularity"""
+    start = time.monotonic()
+    step = 0
+    while not _traffic_stopped.is_set():
+        due = int((time.monotonic() - start) * rate)
+        if step >= due:
+            _traffic_stopped.wait(min((step + 1 - due) / rate, 0.01))
+            continue
+        fake_devices = _devices()
+        for _ in range(due - step):
+            device = fake_devices.get(devices[step % len(devices)])
+            if device is not None and generate(device, step):
+                setattr(_traffic, counter, getattr(_traffic, counter) + 1)
+            step += 1
+        _traffic.lag = time.monotonic() - start - step / rate
+
+
+def start_traffic(
+    updates_per_sec: float = 1000.0,
+    blobs_per_sec: float = 0.0,
+    blob_size: int = 1024 ** 2,
+    devices: Optional[List[str]] = None,
+):
+    """Start generating updates of traffic properties of connected devices (all attached devices by default)
+    and BLOBs from connected cameras, at given total rates"""
+    global _traffic
+    stop_traffic()
+    device_names = devices if devices is not None else list(_devices())
+    if not device_names:
+        raise ValueError("No devices to generate traffic, attach some drivers first")
+    _traffic = _TrafficCounters()
+    blob = bytes(blob_size)
+    streams = [
+        (updates_per_sec, lambda device, step: device.generate_update(step), "updates"),
+        (blobs_per_sec, lambda device, step: device.generate_blob(blob), "blobs"),
+    ]
+    for rate, generate, counter in streams:
+        if rate > 0:
+            thread = Thread(
+                target=_generate,
+                args=(rate, generate, counter, device_names),
+                name=f"pyindigo-fake-{counter}",
+                daemon=True,
+            )
+            _traffic_threads.append(thread)
+            thread.start()
+
+
+def stop_traffic():
+    _traffic_stopped.set()
+    for thread in _traffic_threads:
+        thread.join()
+    _traffic_threads.clear()
+    _traffic_stopped.clear()
+
+
+def traffic_stats() -> Dict[str, Any]:
+    """Number of generated updates and BLOBs and generator lag behind schedule in sec"""
+    return {"updates": _traffic.updates, "blobs": _traffic.blobs, "lag": _traffic.lag}
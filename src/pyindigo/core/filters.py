@@ -0,0 +1,128 @@
+"""Conditions for indigo_callback accepts, richer than exact match: sets of values, prefixes and item values.
+
+Conditions are compiled once on callback registration (see IndigoCallbackEntry). Sets of values for fields used
+as dispatch key (action, device, name, property_class) put callback entry into several dispatch index buckets,
+so that events not matching any of them are not even looked at. Everything else becomes a tuple of checks,
+run only for events that passed the index.
+
+Example use:
+>>> @indigo_callback(
+>>>     accepts={
+>>>         'device': {'CCD Imager Simulator', 'CCD Guider Simulator'},
+>>>         'name': Prefix('CCD_'),
+>>>         'state': {IndigoPropertyState.OK, IndigoPropertyState.ALERT},
+>>>         'items': {'TEMPERATURE': Range(max=-5.0)},
+>>>     }
+>>> )
+>>> def cold_ccd_callback(action: IndigoDriverAction, prop: IndigoProperty):
+>>>     ...
+"""
+
+import sys
+from dataclasses import dataclass
+from functools import partial
+from operator import attrgetter, eq
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .properties import IndigoProperty, NumberVectorProperty
+
+
+@dataclass(frozen=True)
+class Prefix:
+    """String field (device or name) starting with given prefix"""
+
+    prefix: str
+
+    def __call__(self, value: str) -> bool:
+        return value.startswith(self.prefix)
+
+
+@dataclass(frozen=True)
+class Range:
+    """Item value within [min, max], None meaning no bound"""
+
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+    def __call__(self, value: float) -> bool:
+        return (self.min is None or value >= self.min) and (self.max is None or value <= self.max)
+
+
+Condition = Callable[[Any], bool]
+PropertyCheck = Callable[[IndigoProperty], bool]
+
+# collections of accepted values, normalized to frozenset
+ANY_OF_TYPES = (set, frozenset, list, tuple)
+
+_MISSING = object()
+
+
+def normalize(condition: Any) -> Any:
+    """Collections of values become frozensets, strings are interned (as those coming from C extension)"""
+    if isinstance(condition, str):
+        return sys.intern(condition)
+    if isinstance(condition, ANY_OF_TYPES):
+        return frozenset(normalize(value) for value in condition)
+    return condition
+
+
+def compile_condition(condition: Any) -> Condition:
+    """Predicate for normalized exact value, frozenset of values or Prefix/Range"""
+    if isinstance(condition, (Prefix, Range)):
+        return condition
+    if isinstance(condition, frozenset):
+        return condition.__contains__
+    return partial(eq, condition)
+
+
+def index_values(condition: Any) -> Tuple:
+    """Dispatch key values for normalized condition on indexed field, None meaning any value"""
+    if condition is None or isinstance(condition, (Prefix, Range)):
+        return (None,)
+    if isinstance(condition, frozenset):
+        return tuple(condition)
+    return (condition,)
+
+
+def attribute_check(attribute: str, condition: Any) -> PropertyCheck:
+    get = attrgetter(attribute)
+    if not isinstance(condition, (frozenset, Prefix, Range)):
+        # exact values of non-indexed attributes are enum members
+        return lambda prop: get(prop) is condition
+    matches = compile_condition(condition)
+    return lambda prop: matches(get(prop))
+
+
+def item_value(prop: IndigoProperty, item_name: str) -> Any:
+    if isinstance(prop, NumberVectorProperty):
+        # number properties are checked without building item objects
+        columns = prop.columns
+        try:
+            return columns.values[columns.names.index(item_name)]
+        except ValueError:
+            return _MISSING
+    for item in prop.items:
+        if item.name == item_name:
+            return item.value
+    return _MISSING
+
+
+def items_check(items: Dict[str, Any]) -> PropertyCheck:
+    """Each item must be present and match its condition: exact value, collection of values or any predicate
+    on item value (e.g. Range or lambda)"""
+    conditions = tuple(
+        (
+            sys.intern(item_name),
+            condition if callable(condition) else compile_condition(normalize(condition)),
+        )
+        for item_name, condition in items.items()
+    )
+
+    def check(prop: IndigoProperty) -> bool:
+        for item_name, condition in conditions:
+            value = item_value(prop, item_name)
+            if value is _MISSING or not condition(value):
+                return False
+        return True
+
+    return check
@@ -0,0 +1,67 @@
+"""Frame pool: preallocated memory for BLOB data, reused between frames of long CCD streaming sessions.
+
+Without it each BLOB is copied to a newly allocated bytes object (or to a new buffer when property is queued or
+kept after dispatching), and a stream of full-size allocations freed moments later fragments memory. With frame
+pool enabled, BLOB data is copied to one of preallocated frames and BlobItem.value is a read-only buffer object
+(as in zero-copy mode, see pyindigo.core.set_zero_copy_blobs). Frame is released when the buffer is garbage
+collected, so consumers should not keep BLOB values longer than needed.
+
+When all frames are in use, pool policy decides what happens with a new frame:
+    BLOCK - wait up to timeout for a frame to be released, drop the new frame if none is
+    DROP_OLDEST - take the oldest frame from its buffer (unless it's exported, e.g. to memoryview or array),
+        which becomes empty, drop the new frame if there's no such frame
+Dropped frames are passed to callbacks with BlobItem.value None. BLOBs larger than frame size are allocated as usual.
+
+Example use:
+>>> from pyindigo.core.frame_pool import enable_frame_pool, frame_pool_stats, FramePoolPolicy
+>>> enable_frame_pool(frames=8, frame_size=64 * 1024 ** 2, policy=FramePoolPolicy.DROP_OLDEST)
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+
+from .core_ext import enable_frame_pool as _enable_frame_pool
+from .core_ext import disable_frame_pool
+from .core_ext import frame_pool_stats as _frame_pool_stats
+
+
+class FramePoolPolicy(Enum):
+    """What to do with a new frame when all frames are in use"""
+
+    BLOCK = 0
+    DROP_OLDEST = 1
+
+
+def enable_frame_pool(
+    frames: int,
+    frame_size: int,
+    policy: FramePoolPolicy = FramePoolPolicy.BLOCK,
+    timeout: float = 1.0,
+):
+    """Preallocate given number of frames of frame_size bytes for BLOB data.
+
+    With BLOCK policy, thread copying BLOB (INDIGO bus thread or the one keeping property after dispatching)
+    waits up to timeout sec for a free frame. Call disable_frame_pool to return to allocating memory for each
+    BLOB; frames still in use remain valid.
+    """
+    _enable_frame_pool(frames, frame_size, policy.value, timeout)
+
+
+@dataclass
+class FramePoolStats:
+    enabled: bool
+    policy: FramePoolPolicy
+    frames: int
+    frame_size: int
+    occupancy: int  # frames in use
+    max_occupancy: int
+    acquired: int
+    dropped: int  # new frames not stored for lack of free frames
+    reclaimed: int  # old frames taken from their buffers with DROP_OLDEST policy
+    oversized: int  # BLOBs larger than frame size, allocated as usual
+
+
+def frame_pool_stats() -> FramePoolStats:
+    stats = _frame_pool_stats()
+    stats["policy"] = FramePoolPolicy(stats["policy"])
+    return FramePoolStats(**stats)
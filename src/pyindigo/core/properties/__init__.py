@@ -5,6 +5,7 @@ from .properties import (
     SwitchVectorProperty,
     LightVectorProperty,
     BlobVectorProperty,
+    set_properties,
 )
 
 from .schemas import CommonProperties, CCDSpecificProperties
@@ -0,0 +1,168 @@
+"""Decoders of BLOB data into NumPy arrays, registered by BLOB format (see BlobItem.to_array).
+
+Arrays are views over BLOB data whenever possible: FITS pixels are returned in their big-endian byte order
+unless native byte order is requested, and only scaling with BZERO/BSCALE requires a pass over the data.
+NumPy is not a pyindigo dependency and is imported on first decoding.
+
+Example use:
+>>> @register_decoder('.npy')
+>>> def decode_npy(data):
+>>>     return numpy.load(io.BytesIO(data))
+"""
+
+import struct
+from typing import Any, Callable, Dict, Tuple
+
+
+Decoder = Callable[..., Any]
+
+DECODERS: Dict[str, Decoder] = {}
+
+
+def register_decoder(*formats: str) -> Callable[[Decoder], Decoder]:
+    """Decorator registering decoder function for given BLOB formats (e.g. '.fits'), case-insensitive.
+
+    Decoder is called with BLOB data (bytes-like object) and keyword options passed to BlobItem.to_array.
+    """
+
+    def decorator(decoder: Decoder) -> Decoder:
+        for format in formats:
+            DECODERS[format.lower()] = decoder
+        return decoder
+
+    return decorator
+
+
+def decoder_for(format: str) -> Decoder:
+    try:
+        return DECODERS[format.lower()]
+    except KeyError:
+        raise ValueError(
+            f'No decoder for BLOB format "{format}", available are: {", ".join(sorted(DECODERS))}'
+        ) from None
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("NumPy is required to decode BLOBs into arrays") from None
+    return numpy
+
+
+def _native(array: Any, native: bool) -> Any:
+    """Array in native byte order if requested, byte-swapped copy only if it's not already native"""
+    if native and not array.dtype.isnative:
+        return array.astype(array.dtype.newbyteorder("="))
+    return array
+
+
+# FITS, see https://fits.gsfc.nasa.gov/fits_standard.html
+
+FITS_BLOCK_SIZE = 2880
+FITS_CARD_SIZE = 80
+
+FITS_BITPIX_DTYPES = {8: "u1", 16: ">i2", 32: ">i4", 64: ">i8", -32: ">f4", -64: ">f8"}
+# unsigned integers are stored as signed ones with BZERO offset, which is applied by flipping the sign bit
+FITS_UNSIGNED_OFFSETS = {16: (">u2", 1 << 15), 32: (">u4", 1 << 31), 64: (">u8", 1 << 63)}
+
+
+def parse_fits_header(data: Any) -> Tuple[Dict[str, Any], int]:
+    """Primary header keywords with int, float, bool or str values, and offset of data following it"""
+    view = memoryview(data)
+    header: Dict[str, Any] = {}
+    offset = 0
+    while offset + FITS_BLOCK_SIZE <= len(view):
+        block = bytes(view[offset : offset + FITS_BLOCK_SIZE]).decode("ascii")
+        offset += FITS_BLOCK_SIZE
+        for start in range(0, FITS_BLOCK_SIZE, FITS_CARD_SIZE):
+            card = block[start : start + FITS_CARD_SIZE]
+            keyword = card[:8].rstrip()
+            if keyword == "END":
+                return header, offset
+            if card[8:10] != "= ":
+                continue
+            header[keyword] = _fits_value(card[10:])
+    raise ValueError("FITS header has no END card")
+
+
+def _fits_value(text: str) -> Any:
+    text = text.strip()
+    if text.startswith("'"):
+        end = text.find("'", 1)
+        while end != -1 and text[end + 1 : end + 2] == "'":  # escaped quote
+            end = text.find("'", end + 2)
+        return text[1:end].replace("''", "'").rstrip()
+    value = text.split("/", 1)[0].strip()
+    if value in {"T", "F"}:
+        return value == "T"
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value.replace("D", "E"))
+    except ValueError:
+        return value
+
+
+@register_decoder(".fits", ".fit", ".fts")
+def decode_fits(data: Any, scaled: bool = True, native: bool = False) -> Any:
+    """Primary HDU image as array of shape (NAXISn, ..., NAXIS2, NAXIS1).
+
+    Without scaling, or when BZERO/BSCALE are trivial, array is a view over data in FITS (big-endian)
+    byte order; native=True makes a byte-swapped copy instead. With scaling, unsigned integers
+    (e.g. 16-bit images with BZERO=32768) are decoded into native unsigned array in a single pass,
+    other BZERO/BSCALE values produce float64 array.
+    """
+    numpy = _numpy()
+    header, offset = parse_fits_header(data)
+    bitpix = header.get("BITPIX")
+    if bitpix not in FITS_BITPIX_DTYPES:
+        raise ValueError(f"Unsupported FITS BITPIX: {bitpix}")
+    naxis = header.get("NAXIS", 0)
+    if naxis == 0:
+        raise ValueError("FITS primary HDU has no image")
+    shape = tuple(header[f"NAXIS{axis}"] for axis in range(naxis, 0, -1))
+    count = 1
+    for length in shape:
+        count *= length
+    array = numpy.frombuffer(data, FITS_BITPIX_DTYPES[bitpix], count, offset).reshape(shape)
+    bzero, bscale = header.get("BZERO", 0), header.get("BSCALE", 1)
+    if not scaled or (bzero == 0 and bscale == 1):
+        return _native(array, native)
+    if bscale == 1 and bitpix in FITS_UNSIGNED_OFFSETS:
+        unsigned_dtype, offset_value = FITS_UNSIGNED_OFFSETS[bitpix]
+        if bzero == offset_value:
+            unsigned = array.view(unsigned_dtype)
+            return numpy.bitwise_xor(
+                unsigned, unsigned.dtype.type(offset_value), dtype=unsigned.dtype.newbyteorder("=")
+            )
+    return array * numpy.float64(bscale) + numpy.float64(bzero)
+
+
+# INDIGO RAW, see indigo_raw_header in indigo_bus.h: signature, width and height as native (little-endian)
+# 32-bit integers, followed by pixel data and, in recent versions, optional FITS-like keywords
+
+INDIGO_RAW_HEADER = struct.Struct("<Iii")
+
+# signature -> (dtype, channels)
+INDIGO_RAW_TYPES = {
+    0x31574152: ("u1", 1),  # INDIGO_RAW_MONO8, "RAW1"
+    0x32574152: ("<u2", 1),  # INDIGO_RAW_MONO16, "RAW2"
+    0x33574152: ("u1", 3),  # INDIGO_RAW_RGB24, "RAW3"
+    0x36574152: ("<u2", 3),  # INDIGO_RAW_RGB48, "RAW6"
+}
+
+
+@register_decoder(".raw")
+def decode_raw(data: Any, native: bool = False) -> Any:
+    """INDIGO RAW image as array view of shape (height, width) or (height, width, 3) for RGB images"""
+    numpy = _numpy()
+    signature, width, height = INDIGO_RAW_HEADER.unpack_from(data)
+    if signature not in INDIGO_RAW_TYPES:
+        raise ValueError(f"Unknown INDIGO RAW signature: {signature:#x}")
+    dtype, channels = INDIGO_RAW_TYPES[signature]
+    shape = (height, width, channels) if channels > 1 else (height, width)
+    array = numpy.frombuffer(data, dtype, height * width * channels, INDIGO_RAW_HEADER.size)
+    return _native(array.reshape(shape), native)
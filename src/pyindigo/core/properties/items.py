@@ -1,13 +1,16 @@
 """Indigo items represent elementary data in Indigo"""
 
 from abc import ABC
+from array import array
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, BinaryIO, Iterator, Optional, List, Sequence, Tuple, Union
+from urllib.request import urlopen
 
 from .attribute_enums import IndigoPropertyState
+from .decoders import decoder_for
 
 
-@dataclass
+@dataclass(slots=True)
 class IndigoItem(ABC):
     """Base class for all Indigo items, concrete classes specify data type and representation
 
@@ -16,16 +19,36 @@ class IndigoItem(ABC):
 
     name: str
 
+    @classmethod
+    def _from_columns(cls, names: Sequence[str], *columns: Sequence) -> List["IndigoItem"]:
+        """Used to construct all property items at once from Indigo client callback C code.
 
-@dataclass
+        Columns are sequences of item fields' values in the order of declaration. Subclasses override this
+        to bypass __init__, as values coming from C are already of the right types.
+        """
+        return list(map(cls, names, *columns))
+
+
+@dataclass(slots=True)
 class TextItem(IndigoItem):
     value: str
 
+    @classmethod
+    def _from_columns(cls, names: Sequence[str], values: Sequence[str]) -> List["TextItem"]:
+        new = object.__new__
+        items = []
+        for name, value in zip(names, values):
+            item = new(cls)
+            item.name = name
+            item.value = value
+            items.append(item)
+        return items
+
     def __str__(self):
         return f'{self.name} = "{self.value}"'
 
 
-@dataclass
+@dataclass(slots=True)
 class NumberItem(IndigoItem):
     value: float
     format: str = r"%g"  # format specifier, see https://en.wikipedia.org/wiki/Printf_format_string#Type_field
@@ -37,6 +60,33 @@ class NumberItem(IndigoItem):
     def __post_init__(self):
         self.value = float(self.value)
 
+    @classmethod
+    def _from_columns(
+        cls,
+        names: Sequence[str],
+        values: Sequence[float],
+        formats: Sequence[str],
+        mins: Sequence[float],
+        maxs: Sequence[float],
+        steps: Sequence[float],
+        targets: Sequence[float],
+    ) -> List["NumberItem"]:
+        new = object.__new__
+        items = []
+        for name, value, format, min, max, step, target in zip(
+            names, values, formats, mins, maxs, steps, targets
+        ):
+            item = new(cls)
+            item.name = name
+            item.value = value
+            item.format = format
+            item.min = min
+            item.max = max
+            item.step = step
+            item.target = target
+            items.append(item)
+        return items
+
     def __str__(self):
         def dtoa(d: float) -> str:
             try:
@@ -52,7 +102,71 @@ class NumberItem(IndigoItem):
         )
 
 
-@dataclass
+@dataclass(slots=True)
+class NumberColumns:
+    """Number property items in columnar form, convenient for telemetry analysis.
+
+    Numeric columns are array('d') supporting buffer protocol, so numpy.asarray(columns.values) does
+    not copy them.
+    Missing min, max, step and target (as in items created with add_item) are NaNs.
+    """
+
+    names: Tuple[str, ...]
+    values: array
+    formats: Tuple[str, ...]
+    mins: array
+    maxs: array
+    steps: array
+    targets: array
+
+    @classmethod
+    def _from_columns(
+        cls,
+        names: Sequence[str],
+        values: Union[Sequence[float], bytes],
+        formats: Sequence[str],
+        mins: Union[Sequence[float], bytes],
+        maxs: Union[Sequence[float], bytes],
+        steps: Union[Sequence[float], bytes],
+        targets: Union[Sequence[float], bytes],
+    ) -> "NumberColumns":
+        """Numeric columns are sequences of floats or bytes with packed doubles (as passed from C)"""
+        return cls(
+            tuple(names),
+            array("d", values),
+            tuple(formats),
+            array("d", mins),
+            array("d", maxs),
+            array("d", steps),
+            array("d", targets),
+        )
+
+    @classmethod
+    def from_items(cls, items: Sequence[NumberItem]) -> "NumberColumns":
+        def column(field_name: str) -> array:
+            values = (getattr(item, field_name) for item in items)
+            return array("d", (value if value is not None else float("nan") for value in values))
+
+        return cls(
+            tuple(item.name for item in items),
+            column("value"),
+            tuple(item.format for item in items),
+            column("min"),
+            column("max"),
+            column("step"),
+            column("target"),
+        )
+
+    def to_items(self) -> List[NumberItem]:
+        return NumberItem._from_columns(
+            self.names, self.values, self.formats, self.mins, self.maxs, self.steps, self.targets
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+@dataclass(slots=True)
 class SwitchItem(IndigoItem):
     value: bool
 
@@ -60,27 +174,124 @@ class SwitchItem(IndigoItem):
         # self.value is passed from C as int, conversion to bool
         self.value = bool(self.value)
 
+    @classmethod
+    def _from_columns(cls, names: Sequence[str], values: Sequence[bool]) -> List["SwitchItem"]:
+        new = object.__new__
+        items = []
+        for name, value in zip(names, values):
+            item = new(cls)
+            item.name = name
+            item.value = value
+            items.append(item)
+        return items
+
     def __str__(self):
         return f"{self.name} = {self.value}"
 
 
-@dataclass
+@dataclass(slots=True)
 class LightItem(IndigoItem):
     value: IndigoPropertyState
 
     def __post_init__(self):
-        # self.value is passed from C as int, conversion to IndigoPropertyState
-        self.value = IndigoPropertyState(self.value)
+        # C extension passes IndigoPropertyState members, integers are converted
+        if self.value.__class__ is not IndigoPropertyState:
+            self.value = IndigoPropertyState(self.value)
 
     def __str__(self):
         return f"{self.name} is in {self.value.name} state"
 
 
-@dataclass
+BLOB_DOWNLOAD_TIMEOUT = 60.0  # sec
+
+
+@dataclass(slots=True)
 class BlobItem(IndigoItem):
-    value: bytes
+    value: Optional[bytes]  # or read-only buffer object, see pyindigo.core.set_zero_copy_blobs
     format: str
+    size: Optional[int] = None
+    # with value None, BLOB was written to file (see pyindigo.core.blob_sink) or is to be fetched from URL
+    # (see pyindigo.core.set_blob_mode)
+    path: Optional[str] = None
+    url: Optional[str] = None
+
+    def __post_init__(self):
+        if self.size is None and self.value is not None:
+            self.size = len(self.value)
+
+    @classmethod
+    def _from_columns(
+        cls,
+        names: Sequence[str],
+        values: Sequence[Optional[bytes]],
+        formats: Sequence[str],
+        sizes: Optional[Sequence[int]] = None,
+        paths: Optional[Sequence[Optional[str]]] = None,
+        urls: Optional[Sequence[Optional[str]]] = None,
+    ) -> List["BlobItem"]:
+        new = object.__new__
+        items = []
+        sizes = sizes or [None if value is None else len(value) for value in values]
+        paths = paths or [None] * len(names)
+        urls = urls or [None] * len(names)
+        for name, value, format, size, path, url in zip(
+            names, values, formats, sizes, paths, urls
+        ):
+            item = new(cls)
+            item.name = name
+            item.value = value
+            item.format = format
+            item.size = size
+            item.path = path
+            item.url = url
+            items.append(item)
+        return items
+
+    def _open(self, timeout: float) -> BinaryIO:
+        if self.path is not None:
+            return open(self.path, "rb")
+        if self.url is not None:
+            return urlopen(self.url, timeout=timeout)
+        raise ValueError(f"BLOB item {self.name} has neither value, nor path or URL")
+
+    def fetch(self, timeout: float = BLOB_DOWNLOAD_TIMEOUT) -> bytes:
+        """BLOB data, read from path or downloaded from URL on the first call if it was not sent with property"""
+        if self.value is None:
+            with self._open(timeout) as source:
+                self.value = source.read()
+            self.size = len(self.value)
+        return self.value
+
+    def stream(
+        self, chunk_size: int = 1024 ** 2, timeout: float = BLOB_DOWNLOAD_TIMEOUT
+    ) -> Iterator[bytes]:
+        """BLOB data in chunks (bytes-like objects), read from value, path or URL without keeping
+        the whole BLOB in memory"""
+        if self.value is not None:
+            data = memoryview(self.value)
+            for start in range(0, len(data), chunk_size):
+                yield data[start : start + chunk_size]
+            return
+        with self._open(timeout) as source:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def to_array(self, **options) -> Any:
+        """BLOB data decoded into NumPy array, by decoder registered for its format (see decoders module),
+        e.g. view over FITS or INDIGO RAW image pixels; data is fetched first if needed"""
+        return decoder_for(self.format)(self.fetch(), **options)
 
     def __str__(self):
-        blob_size = len(self.value) if self.value else 0
-        return f'{self.name}: {blob_size} bytes ({blob_size / (1024 ** 2):.2f} MB) BLOB in "{self.format}" format'
+        blob_size = self.size or 0
+        location = ""
+        if self.path:
+            location = f' written to "{self.path}"'
+        elif self.url:
+            location = f" at {self.url}"
+        return (
+            f"{self.name}: {blob_size} bytes ({blob_size / (1024 ** 2):.2f} MB) BLOB "
+            + f'in "{self.format}" format{location}'
+        )
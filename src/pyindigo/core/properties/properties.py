@@ -4,17 +4,24 @@ from dataclasses import dataclass, field
 
 from abc import ABC
 
-from typing import ClassVar, Type, Optional, List
+from threading import RLock
+
+from typing import ClassVar, Type, Optional, List, Callable, Any, Iterable, Sequence, Tuple, Union
 
 import pyindigo.logging as logging
 
 from .attribute_enums import IndigoPropertyState, IndigoPropertyPerm, IndigoSwitchRule
-from .items import IndigoItem, TextItem, NumberItem, SwitchItem, LightItem, BlobItem
+from .items import IndigoItem, TextItem, NumberItem, NumberColumns, SwitchItem, LightItem, BlobItem
 
 from ..core_ext import set_property
+from ..core_ext import set_properties as _set_properties
+
+
+# guards building items by loaders, so that property is loaded once even if it's accessed from several threads
+_loading_lock = RLock()
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, slots=True)
 class IndigoProperty(ABC):
     """Base class for all Indigo properties, concrete classes must specify item_type"""
 
@@ -24,12 +31,71 @@ class IndigoProperty(ABC):
     perm: Optional[IndigoPropertyPerm] = None
     rule: Optional[IndigoSwitchRule] = None
     items: List[IndigoItem] = field(default_factory=list)
+    # builds items on the first access, see _with_items_loader
+    _items_loader: Optional[Callable[[], Any]] = field(
+        default=None, init=False, compare=False
+    )
     item_type: ClassVar[Type[IndigoItem]]
 
     def __post_init__(self):
-        # enums are passed from C extension as integers and converted to Python Enums
-        self.state = IndigoPropertyState(self.state) if self.state is not None else None
-        self.perm = IndigoPropertyPerm(self.perm) if self.perm is not None else None
+        # C extension passes enum members, integers (e.g. from user code) are converted to Enums
+        if self.state is not None and self.state.__class__ is not IndigoPropertyState:
+            self.state = IndigoPropertyState(self.state)
+        if self.perm is not None and self.perm.__class__ is not IndigoPropertyPerm:
+            self.perm = IndigoPropertyPerm(self.perm)
+
+    @classmethod
+    def _with_items_loader(
+        cls,
+        device: str,
+        name: str,
+        state: Union[IndigoPropertyState, int],
+        perm: Union[IndigoPropertyPerm, int],
+        rule: Union[IndigoSwitchRule, int, None],
+        items_loader: Callable[[], Any],
+    ) -> "IndigoProperty":
+        """Used to construct property from Indigo client callback C code without building its items.
+
+        Items are built by items_loader (that calls _load_columns) on the first access to items attribute, so
+        properties that are not accepted by any callback are cheap. Loader is valid while the property is
+        dispatched, if property object is still referenced after that, C extension copies underlying data to
+        keep items available.
+        """
+        if rule is not None and rule.__class__ is not IndigoSwitchRule:
+            rule = IndigoSwitchRule(rule)
+        prop = cls(device, name, state, perm, rule)
+        del prop.items
+        prop._items_loader = items_loader
+        return prop
+
+    @classmethod
+    def _load_columns(cls, *columns: Sequence) -> Any:
+        """Called by items loader with item fields' columns, returns what _build_items accepts"""
+        return cls.item_type._from_columns(*columns)
+
+    def _build_items(self, loaded: Any) -> List[IndigoItem]:
+        return loaded
+
+    def _load_items(self) -> Optional[List[IndigoItem]]:
+        """Items built by loader, None if there's none; called with _loading_lock held"""
+        items_loader = self._items_loader
+        return None if items_loader is None else self._build_items(items_loader())
+
+    def __getattr__(self, attr):
+        # invoked only when attribute is not found, i.e. on the first access to lazily built items
+        if attr == "items":
+            with _loading_lock:
+                try:  # built by another thread while waiting for the lock
+                    return object.__getattribute__(self, "items")
+                except AttributeError:
+                    pass
+                items = self._load_items()
+                if items is not None:
+                    # loader is cleared only after items are assigned, so that they are never missing
+                    self.items = items
+                    self._items_loader = None
+                    return items
+        raise AttributeError(f"{self.__class__.__name__!r} object has no attribute {attr!r}")
 
     def add_item(self, *item_contents):
         """Used to construct property item-by-item from Indigo client callback C code"""
@@ -51,13 +117,12 @@ class IndigoProperty(ABC):
     def items_dict(self):
         return {item.name: item.value for item in self.items}
 
-    def set(self):
-        """Request for change corresponding Indigo property to match self"""
+    def _set_args(self) -> Tuple[str, str, type, List[str], List[Any]]:
         if not self.items:
             raise ValueError("Cannot set empty property, call add_item at least once!")
         if logging.pyindigoConfig.log_property_set:
             logging.info(f"Setting property: {self}")
-        set_property(
+        return (
             self.device,
             self.name,
             self.__class__,
@@ -65,18 +130,59 @@ class IndigoProperty(ABC):
             [item.value for item in self.items],
         )
 
+    def set(self):
+        """Request for change corresponding Indigo property to match self"""
+        set_property(*self._set_args())
+
 
-@dataclass(repr=False)
+@dataclass(repr=False, slots=True)
 class TextVectorProperty(IndigoProperty):
     item_type = TextItem
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, slots=True)
 class NumberVectorProperty(IndigoProperty):
+    """Items of received number properties are loaded as columns, item objects are built on demand"""
+
     item_type = NumberItem
+    _columns: Optional[NumberColumns] = field(default=None, init=False, compare=False)
+
+    @classmethod
+    def _load_columns(cls, *columns: Sequence) -> NumberColumns:
+        return NumberColumns._from_columns(*columns)
 
+    def _build_items(self, loaded: NumberColumns) -> List[IndigoItem]:
+        self._columns = loaded
+        return loaded.to_items()
 
-@dataclass(repr=False)
+    @property
+    def columns(self) -> NumberColumns:
+        """Items as columns, without building item objects; for received property these are received
+        values, not affected by later changes to its items"""
+        columns = self._columns
+        if columns is None:
+            with _loading_lock:
+                if self._columns is None:
+                    items_loader = self._items_loader
+                    if items_loader is None:
+                        return NumberColumns.from_items(self.items)
+                    self._columns = items_loader()
+                    self._items_loader = None
+                columns = self._columns
+        return columns
+
+    def _load_items(self) -> Optional[List[IndigoItem]]:
+        # items are built from columns if they were loaded first
+        if self._columns is not None:
+            return self._columns.to_items()
+        return IndigoProperty._load_items(self)
+
+    def add_item(self, *item_contents):
+        IndigoProperty.add_item(self, *item_contents)
+        self._columns = None
+
+
+@dataclass(repr=False, slots=True)
 class SwitchVectorProperty(IndigoProperty):
     item_type = SwitchItem
 
@@ -94,11 +200,17 @@ class SwitchVectorProperty(IndigoProperty):
         )
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, slots=True)
 class LightVectorProperty(IndigoProperty):
     item_type = LightItem
 
 
-@dataclass(repr=False)
+@dataclass(repr=False, slots=True)
 class BlobVectorProperty(IndigoProperty):
     item_type = BlobItem
+
+
+def set_properties(properties: Iterable[IndigoProperty]):
+    """Request for change of several Indigo properties at once: all of them are converted first, so that none
+    is set if any is invalid, and then passed to Indigo with a single GIL release"""
+    _set_properties([prop._set_args() for prop in properties])
@@ -34,6 +34,10 @@ class PropertySchema:
     allowed_item_names: List[str]  # empty list means any item name is accepted
     rule: Optional[IndigoSwitchRule] = None
 
+    def __hash__(self):
+        # schemas are used as keys, e.g. in IndigoDevice.configure
+        return hash(self.property_name)
+
     def implement(self, device: str, *args, **items_kwargs) -> IndigoProperty:
         """Use schema to create property ready for setting
 
@@ -206,11 +210,11 @@ class CCDSpecificProperties(IndigoPropertiesNamespace):
         rule=IndigoSwitchRule.EXACTLY_ONE,
     )
 
-    CCD_GAIN = PropertySchema("CCD_GAIN", NumberVectorProperty, "GAIN")
+    CCD_GAIN = PropertySchema("CCD_GAIN", NumberVectorProperty, ["GAIN"])
 
-    CCD_OFFSET = PropertySchema("CCD_OFFSET", NumberVectorProperty, "OFFSET")
+    CCD_OFFSET = PropertySchema("CCD_OFFSET", NumberVectorProperty, ["OFFSET"])
 
-    CCD_GAMMA = PropertySchema("CCD_GAMMA", NumberVectorProperty, "GAMMA")
+    CCD_GAMMA = PropertySchema("CCD_GAMMA", NumberVectorProperty, ["GAMMA"])
 
     CCD_FRAME_TYPE = PropertySchema(
         "CCD_FRAME_TYPE",
@@ -0,0 +1,174 @@
+"""Recording of (action, property) events seen by the client and their replay through the dispatching callback.
+
+Events are stored as plain tuples in a pickle stream (gzip-compressed if file name ends with .gz), so replay
+does not need Indigo bus or drivers, which makes it usable for testing and benchmarking callbacks.
+
+Example use:
+>>> with EventRecorder('session.pickle.gz'):
+>>>     ...  # work with devices as usual
+>>> replay_events('session.pickle.gz', speed=None)  # as fast as possible
+"""
+
+import gzip
+import pickle
+import time
+from dataclasses import fields
+from threading import Lock
+from typing import Optional, Tuple, Any, Iterator, Iterable, Union, Callable, Dict, Type, BinaryIO
+
+from .properties import (
+    IndigoProperty,
+    TextVectorProperty,
+    NumberVectorProperty,
+    SwitchVectorProperty,
+    LightVectorProperty,
+    BlobVectorProperty,
+)
+from .properties.attribute_enums import IndigoPropertyState, IndigoPropertyPerm, IndigoSwitchRule
+from .enums import IndigoDriverAction
+from .dispatching_callback import dispatching_callback, indigo_callback, IndigoCallbackHandle
+
+
+FORMAT_HEADER = ("pyindigo-events", 1)
+
+# (time since recording start in sec, action string, property class name, device, name, state, perm, rule,
+#  item columns: tuple of names, tuple of values, etc in item fields order)
+EventRecord = Tuple[float, str, str, str, str, Optional[int], Optional[int], Optional[int], Tuple]
+
+PROPERTY_CLASSES: Dict[str, Type[IndigoProperty]] = {
+    cls.__name__: cls
+    for cls in (
+        TextVectorProperty,
+        NumberVectorProperty,
+        SwitchVectorProperty,
+        LightVectorProperty,
+        BlobVectorProperty,
+    )
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, IndigoPropertyState):
+        return value.value
+    if isinstance(value, (bytes, str, int, float, bool)) or value is None:
+        return value
+    return bytes(value)  # zero-copy BLOB buffers
+
+
+def serialize_event(
+    action: IndigoDriverAction, prop: IndigoProperty, timestamp: float
+) -> EventRecord:
+    item_fields = [f.name for f in fields(prop.item_type)]
+    columns = tuple(
+        tuple(_plain(getattr(item, field_name)) for item in prop.items) for field_name in item_fields
+    )
+    return (
+        timestamp,
+        action.value,
+        prop.__class__.__name__,
+        prop.device,
+        prop.name,
+        prop.state.value if prop.state is not None else None,
+        prop.perm.value if prop.perm is not None else None,
+        prop.rule.value if prop.rule is not None else None,
+        columns,
+    )
+
+
+def deserialize_event(record: EventRecord) -> Tuple[float, IndigoDriverAction, IndigoProperty]:
+    """Returns (timestamp, action, property), property is built the same way C extension builds it,
+    with enum members and items constructed lazily"""
+    timestamp, action_string, class_name, device, name, state, perm, rule, columns = record
+    cls = PROPERTY_CLASSES[class_name]
+    prop = cls._with_items_loader(
+        device,
+        name,
+        IndigoPropertyState(state) if state is not None else None,
+        IndigoPropertyPerm(perm) if perm is not None else None,
+        IndigoSwitchRule(rule) if rule is not None else None,
+        lambda: cls._load_columns(*columns),
+    )
+    return timestamp, IndigoDriverAction(action_string), prop
+
+
+def _open(path: str, mode: str) -> BinaryIO:
+    return gzip.open(path, mode) if path.endswith(".gz") else open(path, mode)
+
+
+class EventRecorder:
+    """Records all events seen by the dispatching callback to file, from start() to stop() or within
+    context manager"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.recorded = 0
+        self._file: Optional[BinaryIO] = None
+        self._handle: Optional[IndigoCallbackHandle] = None
+        self._start = 0.0
+        self._lock = Lock()
+
+    def start(self):
+        if self._file is not None:
+            raise RuntimeError("Recording is already started")
+        self._file = _open(self.path, "wb")
+        pickle.dump(FORMAT_HEADER, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._start = time.monotonic()
+        self._handle = indigo_callback(self._record)
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.discard()
+            self._handle = None
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _record(self, action: IndigoDriverAction, prop: IndigoProperty):
+        record = serialize_event(action, prop, time.monotonic() - self._start)
+        with self._lock:
+            if self._file is not None:
+                pickle.dump(record, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+                self.recorded += 1
+
+    def __enter__(self) -> "EventRecorder":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def read_records(path: str) -> Iterator[EventRecord]:
+    with _open(path, "rb") as file:
+        if pickle.load(file) != FORMAT_HEADER:
+            raise ValueError(f"{path} is not a pyindigo events recording")
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+def replay_events(
+    source: Union[str, Iterable[EventRecord]],
+    speed: Optional[float] = 1.0,
+    dispatch: Callable[[IndigoDriverAction, IndigoProperty], None] = dispatching_callback,
+) -> int:
+    """Feed recorded events from file or iterable of records to the dispatching callback.
+
+    Events are replayed in real time (speed=1.0), proportionally faster or slower, or as fast as possible
+    (speed=None). Returns the number of replayed events.
+    """
+    records = read_records(source) if isinstance(source, str) else source
+    replayed = 0
+    start = time.monotonic()
+    for record in records:
+        timestamp, action, prop = deserialize_event(record)
+        if speed is not None:
+            delay = start + timestamp / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        dispatch(action, prop)
+        replayed += 1
+    return replayed
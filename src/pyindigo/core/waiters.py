@@ -0,0 +1,93 @@
+"""Blocking waiting for properties without polling.
+
+Waiter registers a callback in the dispatching callback and waits on threading.Event, that is set as soon as
+matching property is dispatched. See pyindigo.core.aio for asyncio counterpart.
+
+Example use:
+>>> waiter = PropertyWaiter.for_settled_update(prop)  # must be created before setting the property
+>>> prop.set()
+>>> updated_prop = waiter.wait(timeout=5)  # None on timeout
+"""
+
+import time
+from threading import Event
+from typing import Optional, Callable, Dict, Any
+
+from .properties import IndigoProperty
+from .enums import IndigoDriverAction, IndigoPropertyState
+from .dispatching_callback import indigo_callback
+
+
+PropertyPredicate = Callable[[IndigoProperty], bool]
+
+# states in which property settles after it is set
+SETTLED_STATES = {IndigoPropertyState.OK, IndigoPropertyState.ALERT}
+
+
+def is_settled(prop: IndigoProperty) -> bool:
+    return prop.state in SETTLED_STATES
+
+
+def confirmed_update_predicate(confirmation: Optional[Callable[[], bool]]) -> PropertyPredicate:
+    """Predicate for property update in ALERT state or in OK state with confirmation condition satisfied,
+    if it's given. Condition is checked after less specific callbacks (e.g. ones accepting any device)
+    have processed the update."""
+    if confirmation is None:
+        return is_settled
+
+    def is_confirmed(prop: IndigoProperty) -> bool:
+        if prop.state is IndigoPropertyState.ALERT:
+            return True
+        return prop.state is IndigoPropertyState.OK and confirmation()
+
+    return is_confirmed
+
+
+def settled_update_accepts(prop: IndigoProperty) -> Dict[str, Any]:
+    """accepts dict (see indigo_callback) for updates of the property, predicate is_settled should be
+    applied in addition to it"""
+    return {"action": IndigoDriverAction.UPDATE, "device": prop.device, "name": prop.name}
+
+
+class PropertyWaiter:
+    """One-shot waiter for the first property accepted by callback with given accepts dict (see indigo_callback)
+    and satisfying optional predicate"""
+
+    def __init__(self, accepts: Dict[str, Any], predicate: Optional[PropertyPredicate] = None):
+        self.predicate = predicate
+        self.action: Optional[IndigoDriverAction] = None
+        self.prop: Optional[IndigoProperty] = None
+        self.received_at: Optional[float] = None  # time.monotonic() timestamp
+        self._event = Event()
+        self._handle = indigo_callback(self._on_property, accepts=accepts)
+
+    @classmethod
+    def for_settled_update(
+        cls, prop: IndigoProperty, confirmation: Optional[Callable[[], bool]] = None
+    ) -> "PropertyWaiter":
+        """Waiter for property update, see confirmed_update_predicate"""
+        return cls(settled_update_accepts(prop), confirmed_update_predicate(confirmation))
+
+    def _on_property(self, action: IndigoDriverAction, prop: IndigoProperty):
+        if self._event.is_set():
+            return
+        if self.predicate is None or self.predicate(prop):
+            self.received_at = time.monotonic()
+            self.action = action
+            self.prop = prop
+            self._event.set()
+
+    @property
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[IndigoProperty]:
+        """Block until property is received or timeout (sec) expires, return property or None on timeout.
+        Waiter is discarded afterwards."""
+        try:
+            return self.prop if self._event.wait(timeout) else None
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        self._handle.discard()
@@ -0,0 +1,78 @@
+"""asyncio counterpart of IndigoDevice, see pyindigo.core.aio"""
+
+from typing import Optional, AsyncIterator
+
+import pyindigo.logging as logging
+
+from ..core.properties import IndigoProperty
+from ..core.properties.schemas import PropertySchema
+from ..core.aio import set_property_and_wait, watch_properties
+
+from .device import IndigoDevice, IndigoDeviceStatus, IndigoDeviceException
+
+
+class AsyncIndigoDevice:
+    """Wrapper around IndigoDevice with awaitable methods
+
+    Example use:
+    >>> camera = AsyncIndigoDevice(client.find_device('CCD Imager Simulator'))
+    >>> await camera.connect()
+    >>> await camera.set_property(CCDSpecificProperties.CCD_EXPOSURE, EXPOSURE=3)
+    >>> async for prop in camera.watch(CCDSpecificProperties.CCD_IMAGE.property_name):
+    >>>     ...
+    """
+
+    def __init__(self, device: IndigoDevice):
+        self.device = device
+
+    def __str__(self) -> str:
+        return str(self.device)
+
+    @property
+    def name(self) -> str:
+        return self.device.name
+
+    @property
+    def status(self) -> IndigoDeviceStatus:
+        return self.device.status
+
+    async def _set_connection(
+        self, connected: bool, timeout: Optional[float]
+    ) -> IndigoDeviceStatus:
+        settled_status = (
+            IndigoDeviceStatus.CONNECTED if connected else IndigoDeviceStatus.DISCONNECTED
+        )
+        if self.device.status is settled_status:
+            return settled_status
+        if logging.pyindigoConfig.log_device_connection:
+            logging.info(f"{'Connecting' if connected else 'Disconnecting'} {self.name} device...")
+        # the same confirmation as in blocking IndigoDevice.connect/disconnect: status is updated
+        # by device's own callback by the time future is resolved
+        prop, confirmation = self.device.connection_setting(connected)
+        await set_property_and_wait(prop, timeout, confirmation)
+        return self.device.status
+
+    async def connect(self, timeout: Optional[float] = None) -> IndigoDeviceStatus:
+        return await self._set_connection(True, timeout)
+
+    async def disconnect(self, timeout: Optional[float] = None) -> IndigoDeviceStatus:
+        return await self._set_connection(False, timeout)
+
+    async def set_property(
+        self, schema: PropertySchema, *args, timeout: Optional[float] = None, **kwargs
+    ) -> IndigoProperty:
+        """Set property and wait for it to be updated by the device in OK or ALERT state"""
+        if self.device.status is not IndigoDeviceStatus.CONNECTED:
+            raise IndigoDeviceException(
+                f"Cannot set a property for {self.name} with {self.device.status.name} status"
+            )
+        return await set_property_and_wait(schema.implement(self.name, *args, **kwargs), timeout)
+
+    async def watch(self, name: Optional[str] = None, **accepts) -> AsyncIterator[IndigoProperty]:
+        """Asynchronously iterate over device properties (with given name, if specified), other keyword
+        arguments are passed to accepts dict (see indigo_callback)"""
+        accepts["device"] = self.name
+        if name is not None:
+            accepts["name"] = name
+        async for _, prop in watch_properties(accepts):
+            yield prop
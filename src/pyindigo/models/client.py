@@ -2,24 +2,40 @@
 
 import atexit
 
-from typing import List
+from typing import List, Dict, Iterable, Optional
 
 from ..core import setup_client, cleanup_client, indigo_callback
 from ..core.enums import IndigoDriverAction, IndigoPropertyState
 from ..core.properties import IndigoProperty, CommonProperties
+from ..utils import set_properties_with_confirmation, PropertySetResult
 
 from .device import IndigoDevice
 from .driver import IndigoDriver
+from .server import IndigoServer
+from .property_cache import property_cache
 
 
 setup_client()
 
 
+# registered before device callbacks, so that cache is already updated when they are run
+indigo_callback(property_cache.apply)
+
+
 drivers: List[IndigoDriver] = []
 
 
 def register_driver(driver: IndigoDriver):
-    drivers.append(driver)
+    if driver not in drivers:
+        drivers.append(driver)
+
+
+servers: List[IndigoServer] = []
+
+
+def register_server(server: IndigoServer):
+    if server not in servers:
+        servers.append(server)
 
 
 @indigo_callback(
@@ -40,13 +56,61 @@ def register_device(device: IndigoDriver):
     devices.append(device)
 
 
+def set_devices_connection(
+    connected: bool,
+    devices_to_set: Optional[Iterable[IndigoDevice]] = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, PropertySetResult]:
+    """Connect or disconnect devices (by default all known devices) concurrently, waiting for all of them
+    until a single deadline. Returns results with per-device timing by device name."""
+    devices_to_set = list(devices if devices_to_set is None else devices_to_set)
+    results = set_properties_with_confirmation(
+        [device.connection_setting(connected) for device in devices_to_set], timeout
+    )
+    return {device.name: result for device, result in zip(devices_to_set, results)}
+
+
+def connect_devices(
+    devices_to_connect: Optional[Iterable[IndigoDevice]] = None, timeout: Optional[float] = None
+) -> Dict[str, PropertySetResult]:
+    return set_devices_connection(True, devices_to_connect, timeout)
+
+
+def disconnect_devices(
+    devices_to_disconnect: Optional[Iterable[IndigoDevice]] = None, timeout: Optional[float] = None
+) -> Dict[str, PropertySetResult]:
+    return set_devices_connection(False, devices_to_disconnect, timeout)
+
+
+def attach_drivers(
+    driver_lib_names: Iterable[str], connect: bool = True, timeout: Optional[float] = None
+) -> Dict[str, PropertySetResult]:
+    """Attach drivers and connect all devices defined by them concurrently (see connect_devices).
+
+    Drivers themselves are attached one by one, as INDIGO driver table is not thread-safe, but attachment
+    is fast compared to connection: devices are defined on the bus by the time attach returns (with queued
+    dispatching devices may not be registered yet, so they are not connected).
+    """
+    known_devices = set(devices)
+    for driver_lib_name in driver_lib_names:
+        IndigoDriver(driver_lib_name).attach()
+    if not connect:
+        return {}
+    return connect_devices([device for device in devices if device not in known_devices], timeout)
+
+
+SHUTDOWN_TIMEOUT = 5.0  # sec, for all devices to disconnect on exit
+
+
 @atexit.register
 def cleanup():
-    for device in devices:
-        device.disconnect(blocking=True)
+    disconnect_devices(timeout=SHUTDOWN_TIMEOUT)
     for driver in drivers:
         driver.detach()
+    for server in servers:
+        server.disconnect()
     cleanup_client()
+    property_cache.clear()
 
 
 def find_device(name: str) -> IndigoDevice:  # noqa
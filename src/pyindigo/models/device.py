@@ -1,15 +1,24 @@
 from enum import Enum, auto
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import pyindigo.logging as logging
 
 from ..core.properties import IndigoProperty, TextVectorProperty
 from ..core.properties.attribute_enums import IndigoPropertyState
 from ..core.properties.schemas import CommonProperties, PropertySchema
-from ..core.enums import IndigoDriverAction
+from ..core.enums import IndigoDriverAction, IndigoBlobMode
+from ..core import set_blob_mode, set_properties
 from ..core.dispatching_callback import indigo_callback
-from ..utils import set_property_with_confirmation
+from ..utils import (
+    set_property_with_confirmation,
+    set_properties_with_confirmation,
+    PropertySetResult,
+    PropertySetOutcome,
+    PropertySetting,
+)
+
+from .property_cache import property_cache
 
 
 class IndigoDeviceException(Exception):
@@ -62,28 +71,32 @@ class IndigoDevice:
             interface=items["DEVICE_INTERFACE"],
         )
 
-    def connect(self, blocking: bool = False, timeout: Optional[float] = None):
+    def connection_setting(self, connected: bool) -> PropertySetting:
+        """CONNECTION property with its confirmation condition, see utils.set_properties_with_confirmation"""
+        if connected:
+            prop = CommonProperties.CONNECTION.implement(self.name, CONNECTED=True)
+            settled = {IndigoDeviceStatus.CONNECTED, IndigoDeviceStatus.FAILED}
+        else:
+            prop = CommonProperties.CONNECTION.implement(self.name, DISCONNECTED=True)
+            settled = {IndigoDeviceStatus.DISCONNECTED, IndigoDeviceStatus.FAILED}
+        return prop, lambda: self.status in settled
+
+    def connect(
+        self, blocking: bool = False, timeout: Optional[float] = None
+    ) -> PropertySetResult:
         if logging.pyindigoConfig.log_device_connection:
             logging.info(f"Connecting {self.name} device...")
-        set_property_with_confirmation(
-            prop=CommonProperties.CONNECTION.implement(self.name, CONNECTED=True),
-            confirmation=lambda: (
-                self.status in {IndigoDeviceStatus.CONNECTED, IndigoDeviceStatus.FAILED}
-            ),
-            blocking=blocking,
-            timeout=timeout,
+        return set_property_with_confirmation(
+            *self.connection_setting(True), blocking=blocking, timeout=timeout
         )
 
-    def disconnect(self, blocking: bool = False, timeout: Optional[float] = None):
+    def disconnect(
+        self, blocking: bool = False, timeout: Optional[float] = None
+    ) -> PropertySetResult:
         if logging.pyindigoConfig.log_device_connection:
             logging.info(f"Disconnecting {self.name} device...")
-        set_property_with_confirmation(
-            prop=CommonProperties.CONNECTION.implement(self.name, DISCONNECTED=True),
-            confirmation=lambda: (
-                self.status in {IndigoDeviceStatus.DISCONNECTED, IndigoDeviceStatus.FAILED}
-            ),
-            blocking=blocking,
-            timeout=timeout,
+        return set_property_with_confirmation(
+            *self.connection_setting(False), blocking=blocking, timeout=timeout
         )
 
     def set_property(self, schema: PropertySchema, *args, **kwargs):
@@ -96,8 +109,78 @@ class IndigoDevice:
                 f"Cannot set a property for {self.name} with {self.status.value} status"
             )
 
+    def property_setting(self, schema: PropertySchema, value: Any) -> PropertySetting:
+        """Property implementing schema with its confirmation condition: the latest property in OK state
+        already has all items set to given values. Value is a dict of item values by name or single item value.
+        """
+        prop = (
+            schema.implement(self.name, **value)
+            if isinstance(value, dict)
+            else schema.implement(self.name, value)
+        )
+
+        def already_set() -> bool:
+            current = self.get_property(prop.name)
+            if current is None or current.state is not IndigoPropertyState.OK:
+                return False
+            current_values = current.items_dict
+            return all(current_values.get(item.name) == item.value for item in prop.items)
+
+        return prop, already_set
+
+    def configure(
+        self,
+        settings: Dict[PropertySchema, Any],
+        blocking: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, PropertySetResult]:
+        """Set several properties at once, e.g. before exposure sequence:
+
+        >>> camera.configure({
+        >>>     CCDSpecificProperties.CCD_BIN: {'HORIZONTAL': 2, 'VERTICAL': 2},
+        >>>     CCDSpecificProperties.CCD_GAIN: 100,
+        >>> }, blocking=True, timeout=5)
+
+        Properties already having requested values are not set. All others are set with a single call
+        to C extension, in blocking mode their confirmations are awaited concurrently until a single deadline.
+        Returns results by property name.
+        """
+        if self.status is not IndigoDeviceStatus.CONNECTED:
+            raise IndigoDeviceException(
+                f"Cannot configure {self.name} with {self.status.value} status"
+            )
+        property_settings = [
+            self.property_setting(schema, value) for schema, value in settings.items()
+        ]
+        if blocking:
+            results = set_properties_with_confirmation(property_settings, timeout)
+        else:
+            props_to_set: List[IndigoProperty] = []
+            results = []
+            for prop, confirmation in property_settings:
+                if confirmation():
+                    results.append(PropertySetResult(PropertySetOutcome.NOT_NEEDED))
+                else:
+                    props_to_set.append(prop)
+                    results.append(PropertySetResult(PropertySetOutcome.NOT_AWAITED))
+            set_properties(props_to_set)
+        return {prop.name: result for (prop, _), result in zip(property_settings, results)}
+
+    def get_property(self, name: str) -> Optional[IndigoProperty]:
+        """Latest defined or updated device property with given name, None if it is not defined"""
+        return property_cache.get(self.name, name)
+
+    @property
+    def properties(self) -> Dict[str, IndigoProperty]:
+        """Snapshot of all device properties keyed by name"""
+        return property_cache.snapshot(self.name)
+
+    def set_blob_mode(self, mode: Optional[IndigoBlobMode], property_name: Optional[str] = None):
+        """How BLOBs of device's property (or all of them) are sent, see pyindigo.core.set_blob_mode"""
+        set_blob_mode(mode, self.name, property_name)
+
     def callback(self, *args, **kwargs):
         """indigo_callback decorator for a specific device"""
         accepts: Dict[str, Any] = kwargs.get("accepts", {})
-        accepts.update({"device": self.name})
+        kwargs["accepts"] = {**accepts, "device": self.name}
         return indigo_callback(*args, **kwargs)
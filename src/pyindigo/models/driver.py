@@ -1,4 +1,6 @@
-"""Class representing Indigo driver and helper functions. Currently is just a placeholder"""
+"""Class representing Indigo driver and helper functions"""
+
+from typing import Optional
 
 from ..core import attach_driver, detach_driver
 
@@ -11,19 +13,23 @@ class IndigoDriver:
         self._register_driver = register_driver
 
         self.driver_lib_name = driver_lib_name
-        self.attached = False
+        self._handle: Optional[int] = None  # driver handle from core_ext, set while attached
 
     def __str__(self) -> str:
-        return f"{self.driver_lib_name} ({'not' if not self.attached else ''}attached)"
+        return f"{self.driver_lib_name} ({'not ' if not self.attached else ''}attached)"
+
+    @property
+    def attached(self) -> bool:
+        return self._handle is not None
 
     def attach(self):
-        attach_driver(self.driver_lib_name)
+        if self.attached:
+            return
+        self._handle = attach_driver(self.driver_lib_name)
         # this line sends attached driver to client for later automatical detachment
         self._register_driver(self)
-        self.attached = True
 
     def detach(self):
         if self.attached:
-            # after several drivers support this will be something like detach_driver(self.driver_lib_name)
-            detach_driver()
-            self.attached = False
+            handle, self._handle = self._handle, None
+            detach_driver(handle)
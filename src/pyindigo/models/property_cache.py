@@ -0,0 +1,73 @@
+"""Latest state of all properties defined on Indigo bus, maintained by client (see pyindigo.models.client)"""
+
+from threading import Lock
+from typing import Dict, Optional, List
+
+from ..core.properties import IndigoProperty, NumberVectorProperty, BlobVectorProperty
+from ..core.enums import IndigoDriverAction
+
+
+def detached(prop: IndigoProperty) -> IndigoProperty:
+    """Copy of dispatched property with loaded items (array-backed columns for number properties).
+
+    Copy does not reference the items loader, so that C extension does not copy INDIGO property to keep it
+    available after dispatching, as it does for property objects still referenced when callbacks return.
+    """
+    if isinstance(prop, NumberVectorProperty):
+        copy = NumberVectorProperty(prop.device, prop.name, prop.state, prop.perm, prop.rule)
+        del copy.items  # built from columns on access
+        copy._columns = prop.columns
+        return copy
+    return prop.__class__(prop.device, prop.name, prop.state, prop.perm, prop.rule, prop.items)
+
+
+class PropertyCache:
+    """Thread-safe per-device dicts of properties keyed by property name.
+
+    Dispatched properties are stored detached from C extension (see detached), so caching costs loading
+    items of every property once, but never copying INDIGO property. Stored properties are never mutated:
+    new definition or update replaces the stored object. Hence snapshots are shallow and BLOB payloads
+    are shared with properties passed to callbacks.
+    """
+
+    def __init__(self, cache_blobs: bool = False):
+        # cached BLOB values are loaded from INDIGO buffer, which means copying every frame (unless values are
+        # zero-copy buffers, but then they are copied when callbacks return, see pyindigo.core.set_zero_copy_blobs)
+        # and holding a frame with frame pool (see pyindigo.core.frame_pool), so BLOBs are not cached by default
+        self.cache_blobs = cache_blobs
+        self._devices: Dict[str, Dict[str, IndigoProperty]] = {}
+        self._lock = Lock()
+
+    def apply(self, action: IndigoDriverAction, prop: IndigoProperty):
+        if action is IndigoDriverAction.DELETE:
+            with self._lock:
+                if not prop.name:  # property with empty name means all device properties
+                    self._devices.pop(prop.device, None)
+                else:
+                    self._devices.get(prop.device, {}).pop(prop.name, None)
+            return
+        if not self.cache_blobs and isinstance(prop, BlobVectorProperty):
+            return
+        prop = detached(prop)
+        with self._lock:
+            self._devices.setdefault(prop.device, {})[prop.name] = prop
+
+    def get(self, device: str, name: str) -> Optional[IndigoProperty]:
+        with self._lock:
+            return self._devices.get(device, {}).get(name)
+
+    def snapshot(self, device: str) -> Dict[str, IndigoProperty]:
+        """Consistent copy of device's property dict, property objects themselves are shared"""
+        with self._lock:
+            return dict(self._devices.get(device, {}))
+
+    def devices(self) -> List[str]:
+        with self._lock:
+            return list(self._devices)
+
+    def clear(self):
+        with self._lock:
+            self._devices.clear()
+
+
+property_cache = PropertyCache()
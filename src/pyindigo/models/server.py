@@ -0,0 +1,213 @@
+"""Classes representing remote Indigo servers and a pool of connections to them with automatic reconnect"""
+
+import time
+from dataclasses import dataclass
+from threading import Thread, Event, Lock
+from typing import Callable, Optional, Dict, Tuple
+
+import pyindigo.logging as logging
+
+from ..core import connect_server, disconnect_server, server_connection_status
+
+
+DEFAULT_PORT = 7624
+
+
+class IndigoServer:
+    """Connection to remote Indigo server, devices on it are defined on local bus as any other devices"""
+
+    def __init__(self, name: str, host: str, port: int = DEFAULT_PORT):
+        # importing here to avoid circular import
+        from .client import register_server
+
+        self._register_server = register_server
+
+        self.name = name
+        self.host = host
+        self.port = port
+        self._handle: Optional[int] = None  # server handle from core_ext, set while connected
+        self._disconnected_by_user = False
+        self._lock = Lock()
+
+    def __str__(self) -> str:
+        return f"{self.name} at {self.host}:{self.port}"
+
+    @property
+    def attached(self) -> bool:
+        """Server entry exists on the bus, i.e. INDIGO tries to keep connection to the server"""
+        return self._handle is not None
+
+    def status(self) -> Tuple[bool, str]:
+        """(connected, last error message)"""
+        handle = self._handle
+        if handle is None:
+            return False, ""
+        try:
+            return server_connection_status(handle)
+        except ValueError:  # disconnected concurrently
+            return False, ""
+
+    @property
+    def connected(self) -> bool:
+        return self.status()[0]
+
+    def connect(self):
+        with self._lock:
+            self._disconnected_by_user = False
+            if self.attached:
+                return
+            self._handle = connect_server(self.name, self.host, self.port)
+        # this line sends server to client for later automatical disconnection
+        self._register_server(self)
+
+    def disconnect(self):
+        with self._lock:
+            self._disconnected_by_user = True
+            if self.attached:
+                handle, self._handle = self._handle, None
+                disconnect_server(handle)
+
+    def reconnect(self) -> bool:
+        """Recreate connection from scratch, unless server was disconnected by user; returns if reconnected"""
+        with self._lock:
+            if self._disconnected_by_user:
+                return False
+            if self.attached:
+                handle, self._handle = self._handle, None
+                disconnect_server(handle)
+            self._handle = connect_server(self.name, self.host, self.port)
+            return True
+
+
+@dataclass
+class ServerConnectionStats:
+    connected: bool
+    last_error: str
+    reconnects: int
+    down_for: float  # sec, 0 if connected
+
+
+@dataclass
+class _MonitoredServer:
+    server: IndigoServer
+    reconnect_delay: float
+    next_reconnect: float  # pool clock timestamp
+    down_since: Optional[float] = None
+    reconnects: int = 0
+
+
+class IndigoServerPool:
+    """Connections to several Indigo servers, monitored from a background thread.
+
+    Server that stays disconnected is reconnected from scratch with exponential backoff, starting from
+    initial_delay and up to max_delay (sec). Delay is reset once the server is connected again. Delays are
+    measured with clock, time.monotonic by default.
+
+    Example use:
+    >>> pool = IndigoServerPool()
+    >>> pool.add('observatory', '192.168.1.10')
+    >>> pool.stats()
+    {'observatory': ServerConnectionStats(connected=True, last_error='', reconnects=0, down_for=0.0)}
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = 1.0,
+        max_delay: float = 60.0,
+        backoff_factor: float = 2.0,
+        poll_interval: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff_factor = backoff_factor
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self._servers: Dict[str, _MonitoredServer] = {}
+        self._lock = Lock()
+        self._stopped = Event()
+        self._monitor: Optional[Thread] = None
+
+    def add(self, name: str, host: str, port: int = DEFAULT_PORT) -> IndigoServer:
+        server = IndigoServer(name, host, port)
+        with self._lock:
+            if name in self._servers:
+                raise ValueError(f"Server '{name}' is already in the pool")
+            server.connect()
+            self._servers[name] = _MonitoredServer(
+                server, self.initial_delay, self.clock() + self.initial_delay
+            )
+            if self._monitor is None:
+                self._stopped.clear()
+                self._monitor = Thread(target=self._run, name="pyindigo-server-pool", daemon=True)
+                self._monitor.start()
+        return server
+
+    def remove(self, name: str):
+        with self._lock:
+            monitored = self._servers.pop(name)
+        monitored.server.disconnect()
+
+    def __getitem__(self, name: str) -> IndigoServer:
+        return self._servers[name].server
+
+    def stats(self) -> Dict[str, ServerConnectionStats]:
+        now = self.clock()
+        with self._lock:
+            monitored_servers = list(self._servers.items())
+        stats = {}
+        for name, monitored in monitored_servers:
+            connected, last_error = monitored.server.status()
+            down_since = monitored.down_since
+            stats[name] = ServerConnectionStats(
+                connected=connected,
+                last_error=last_error,
+                reconnects=monitored.reconnects,
+                down_for=0.0 if connected or down_since is None else now - down_since,
+            )
+        return stats
+
+    def close(self):
+        """Stop monitoring and disconnect all servers"""
+        self._stopped.set()
+        with self._lock:
+            monitor, self._monitor = self._monitor, None
+            monitored_servers = list(self._servers.values())
+            self._servers.clear()
+        if monitor is not None:
+            monitor.join()
+        for monitored in monitored_servers:
+            monitored.server.disconnect()
+
+    def _run(self):
+        while not self._stopped.wait(self.poll_interval):
+            with self._lock:
+                monitored_servers = list(self._servers.values())
+            for monitored in monitored_servers:
+                try:
+                    self._check(monitored)
+                except Exception:
+                    logging.exception(f"Error while reconnecting to {monitored.server}")
+
+    def _check(self, monitored: _MonitoredServer):
+        now = self.clock()
+        if monitored.server.connected:
+            monitored.down_since = None
+            monitored.reconnect_delay = self.initial_delay
+            return
+        if monitored.down_since is None:
+            monitored.down_since = now
+            monitored.next_reconnect = max(
+                monitored.next_reconnect, now + monitored.reconnect_delay
+            )
+        if now < monitored.next_reconnect:
+            return
+        # next attempt is scheduled beforehand, so that failed reconnection is also retried with backoff
+        monitored.next_reconnect = now + monitored.reconnect_delay
+        monitored.reconnect_delay = min(
+            monitored.reconnect_delay * self.backoff_factor, self.max_delay
+        )
+        if logging.pyindigoConfig.log_device_connection:
+            logging.info(f"Reconnecting to {monitored.server}...")
+        if monitored.server.reconnect():
+            monitored.reconnects += 1
@@ -1,37 +1,110 @@
 import time
-from typing import Callable, Optional
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Callable, Optional, Iterable, List, Tuple
 
-from .core.properties import IndigoProperty
+from .core.properties import IndigoProperty, set_properties
+from .core.enums import IndigoPropertyState
+from .core.waiters import PropertyWaiter
 import pyindigo.logging as logging
 
 
+class PropertySetOutcome(Enum):
+    OK = auto()  # property was updated in OK state and confirmation condition is satisfied
+    ALERT = auto()  # property was updated in ALERT state
+    TIMEOUT = auto()
+    NOT_NEEDED = auto()  # confirmation condition was satisfied before setting, property is not set
+    NOT_AWAITED = auto()  # property is set in non-blocking mode
+
+
+@dataclass
+class PropertySetResult:
+    outcome: PropertySetOutcome
+    prop: Optional[IndigoProperty] = None  # updated property for OK and ALERT outcomes
+    elapsed: float = 0.0  # sec
+
+    def __bool__(self):
+        return self.outcome not in {PropertySetOutcome.ALERT, PropertySetOutcome.TIMEOUT}
+
+
+PropertySetting = Tuple[IndigoProperty, Callable[[], bool]]  # property and confirmation condition
+
+
 def set_property_with_confirmation(
     prop: IndigoProperty,
     confirmation: Callable[[], bool],
     blocking: bool = False,
     timeout: Optional[float] = None,
-):
+) -> PropertySetResult:
+    """Set property unless confirmation condition is already satisfied. In blocking mode, wait until the driver
+    updates the property in OK state with confirmation condition satisfied or in ALERT state, or timeout (sec)
+    expires."""
+    if blocking:
+        return set_properties_with_confirmation([(prop, confirmation)], timeout)[0]
     if confirmation():
-        if logging.pyindigoConfig.log_blocking_property_settings:
-            logging.info(
-                "set_property_with_confirmation: property is not set because confirmation condition "
-                + f"is already satisfied:\n\t{prop}"
-            )
-        return
+        _log_not_needed(prop)
+        return PropertySetResult(PropertySetOutcome.NOT_NEEDED)
     prop.set()
-    if blocking:
-        waiting_time = 0
-        waiting_step = 0.05  # sec
-        while not confirmation():
-            time.sleep(waiting_step)
-            waiting_time += waiting_step
-            if timeout is not None and waiting_time > timeout:
-                if logging.pyindigoConfig.log_blocking_property_settings:
-                    logging.info(
-                        f"set_property_with_confirmation: failed on timeout ({timeout} sec):\n\t{prop}"
-                    )
-                return
+    return PropertySetResult(PropertySetOutcome.NOT_AWAITED)
+
+
+def set_properties_with_confirmation(
+    settings: Iterable[PropertySetting], timeout: Optional[float] = None
+) -> List[PropertySetResult]:
+    """Blocking set_property_with_confirmation for several properties at once: all properties are set first
+    (with a single set_properties call) and then confirmations are awaited together, until a single deadline.
+    Results are in settings order, with elapsed time counted from the moment properties are set."""
+    waiters: List[Tuple[IndigoProperty, Optional[PropertyWaiter]]] = []
+    try:
+        props_to_set = []
+        for prop, confirmation in settings:
+            if confirmation():
+                _log_not_needed(prop)
+                waiters.append((prop, None))
+                continue
+            # waiter is registered beforehand not to miss update that comes before properties are set
+            waiters.append((prop, PropertyWaiter.for_settled_update(prop, confirmation)))
+            props_to_set.append(prop)
+        start = time.monotonic()
+        if props_to_set:
+            set_properties(props_to_set)
+    except Exception:
+        for _, waiter in waiters:
+            if waiter is not None:
+                waiter.cancel()
+        raise
+
+    deadline = None if timeout is None else start + timeout
+    results = []
+    for prop, waiter in waiters:
+        if waiter is None:
+            results.append(PropertySetResult(PropertySetOutcome.NOT_NEEDED))
+            continue
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+        updated_prop = waiter.wait(remaining)
+        if updated_prop is None:
+            result = PropertySetResult(
+                PropertySetOutcome.TIMEOUT, elapsed=time.monotonic() - start
+            )
+        else:
+            outcome = (
+                PropertySetOutcome.OK
+                if updated_prop.state is IndigoPropertyState.OK
+                else PropertySetOutcome.ALERT
+            )
+            result = PropertySetResult(outcome, updated_prop, waiter.received_at - start)
         if logging.pyindigoConfig.log_blocking_property_settings:
             logging.info(
-                f"set_property_with_confirmation: success, took ~{waiting_time} sec:\n\t{prop}"
+                f"set_property_with_confirmation: {result.outcome.name}, "
+                + f"took {result.elapsed:.4f} sec:\n\t{prop}"
             )
+        results.append(result)
+    return results
+
+
+def _log_not_needed(prop: IndigoProperty):
+    if logging.pyindigoConfig.log_blocking_property_settings:
+        logging.info(
+            "set_property_with_confirmation: property is not set because confirmation condition "
+            + f"is already satisfied:\n\t{prop}"
+        )
@@ -3,6 +3,8 @@
 // developed by Igor Vaiman, SINP MSU
 
 
+#include <pthread.h>
+#include <stdbool.h>
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
@@ -11,6 +13,7 @@
 #include <indigo/indigo_client.h>
 
 #include "../pyindigo_core_ext/pyindigo_core.h"
+#include "pyindigo_client.h"
 
 
 #define PYINDIGO_DEFINE_ACTION "define"
@@ -18,6 +21,151 @@
 #define PYINDIGO_DELETE_ACTION "delete"
 
 
+// BLOB mode of each BLOB vector is requested from INDIGO on its definition, according to rules set from Python;
+// rules have empty device or property name to match any, the most specific rule applies; without matching rule
+// URL mode is requested from devices supporting it (INDIGO 2.0+), BLOBs are sent along with property otherwise
+
+#define MAX_BLOB_MODE_RULES 64
+#define MAX_BLOB_PROPERTIES 256
+
+typedef struct {
+	bool used;
+	char device[INDIGO_NAME_SIZE];
+	char property[INDIGO_NAME_SIZE];
+	indigo_enable_blob_mode mode;
+} blob_mode_rule;
+
+// BLOB vectors currently defined, to request new mode when rules change
+typedef struct {
+	bool used;
+	char device[INDIGO_NAME_SIZE];
+	char property[INDIGO_NAME_SIZE];
+	int version;
+} blob_property_record;
+
+static pthread_mutex_t blob_modes_mutex = PTHREAD_MUTEX_INITIALIZER;
+static blob_mode_rule blob_mode_rules[MAX_BLOB_MODE_RULES];
+static blob_property_record blob_properties[MAX_BLOB_PROPERTIES];
+
+static bool rule_matches(blob_mode_rule *rule, const char *device, const char *property) {
+	return (!rule->device[0] || !strcmp(rule->device, device)) && (!rule->property[0] || !strcmp(rule->property, property));
+}
+
+// must be called with mutex locked
+static indigo_enable_blob_mode blob_mode(const char *device, const char *property, int version) {
+	blob_mode_rule *best_rule = NULL;
+	int best_score = -1;
+	for (int i = 0; i < MAX_BLOB_MODE_RULES; i++) {
+		blob_mode_rule *rule = &blob_mode_rules[i];
+		if (!rule->used || !rule_matches(rule, device, property))
+			continue;
+		int score = 2 * (rule->device[0] != '\0') + (rule->property[0] != '\0');
+		if (score > best_score) {
+			best_rule = rule;
+			best_score = score;
+		}
+	}
+	if (best_rule != NULL)
+		return best_rule->mode;
+	return version >= INDIGO_VERSION_2_0 ? INDIGO_ENABLE_BLOB_URL : INDIGO_ENABLE_BLOB_ALSO;
+}
+
+static void enable_blob(const char *device, const char *property, indigo_enable_blob_mode mode) {
+	// only device and property name are used by INDIGO
+	indigo_property blob_property;
+	memset(&blob_property, 0, sizeof(blob_property));
+	blob_property.type = INDIGO_BLOB_VECTOR;
+	strcpy(blob_property.device, device);
+	strcpy(blob_property.name, property);
+	indigo_enable_blob(&pyindigo_client, &blob_property, mode);
+}
+
+static void record_blob_property(indigo_device *device, indigo_property *property) {
+	pthread_mutex_lock(&blob_modes_mutex);
+	blob_property_record *record = NULL;
+	for (int i = 0; i < MAX_BLOB_PROPERTIES && record == NULL; i++) {
+		blob_property_record *candidate = &blob_properties[i];
+		if (candidate->used && !strcmp(candidate->device, property->device) && !strcmp(candidate->property, property->name))
+			record = candidate;
+	}
+	for (int i = 0; i < MAX_BLOB_PROPERTIES && record == NULL; i++) {
+		if (!blob_properties[i].used)
+			record = &blob_properties[i];
+	}
+	indigo_enable_blob_mode mode = blob_mode(property->device, property->name, device->version);
+	if (record != NULL) {  // otherwise mode is not updated when rules change
+		record->used = true;
+		strcpy(record->device, property->device);
+		strcpy(record->property, property->name);
+		record->version = device->version;
+	}
+	pthread_mutex_unlock(&blob_modes_mutex);
+	indigo_enable_blob(&pyindigo_client, property, mode);
+}
+
+static void forget_blob_properties(indigo_property *property) {
+	pthread_mutex_lock(&blob_modes_mutex);
+	for (int i = 0; i < MAX_BLOB_PROPERTIES; i++) {
+		blob_property_record *record = &blob_properties[i];
+		// property with empty name means all device properties
+		if (record->used && !strcmp(record->device, property->device) && (!property->name[0] || !strcmp(record->property, property->name)))
+			record->used = false;
+	}
+	pthread_mutex_unlock(&blob_modes_mutex);
+}
+
+int pyindigo_set_blob_mode(const char *device, const char *property, int mode) {
+	// allocated beforehand, so that rule is not changed without requesting new mode from defined properties
+	blob_property_record *affected = malloc(MAX_BLOB_PROPERTIES * sizeof(blob_property_record));
+	if (affected == NULL)
+		return PYINDIGO_BLOB_MODE_NO_MEMORY;
+	pthread_mutex_lock(&blob_modes_mutex);
+	blob_mode_rule *rule = NULL;
+	for (int i = 0; i < MAX_BLOB_MODE_RULES && rule == NULL; i++) {
+		blob_mode_rule *candidate = &blob_mode_rules[i];
+		if (candidate->used && !strcmp(candidate->device, device) && !strcmp(candidate->property, property))
+			rule = candidate;
+	}
+	if (mode == PYINDIGO_BLOB_MODE_DEFAULT) {
+		if (rule != NULL)
+			rule->used = false;
+	}
+	else {
+		for (int i = 0; i < MAX_BLOB_MODE_RULES && rule == NULL; i++) {
+			if (!blob_mode_rules[i].used)
+				rule = &blob_mode_rules[i];
+		}
+		if (rule == NULL) {
+			pthread_mutex_unlock(&blob_modes_mutex);
+			free(affected);
+			return PYINDIGO_BLOB_MODE_TOO_MANY_RULES;
+		}
+		rule->used = true;
+		strcpy(rule->device, device);
+		strcpy(rule->property, property);
+		rule->mode = mode;
+	}
+	// new modes are requested outside of lock, as INDIGO bus thread takes it on property definition
+	indigo_enable_blob_mode modes[MAX_BLOB_PROPERTIES];
+	int affected_count = 0;
+	blob_mode_rule pattern = {0};
+	strcpy(pattern.device, device);
+	strcpy(pattern.property, property);
+	for (int i = 0; i < MAX_BLOB_PROPERTIES; i++) {
+		blob_property_record *record = &blob_properties[i];
+		if (record->used && rule_matches(&pattern, record->device, record->property)) {
+			affected[affected_count] = *record;
+			modes[affected_count++] = blob_mode(record->device, record->property, record->version);
+		}
+	}
+	pthread_mutex_unlock(&blob_modes_mutex);
+	for (int i = 0; i < affected_count; i++)
+		enable_blob(affected[i].device, affected[i].property, modes[i]);
+	free(affected);
+	return PYINDIGO_BLOB_MODE_SET;
+}
+
+
 static indigo_result pyindigo_client_attach(indigo_client *client)
 {
 	indigo_log("attached to INDIGO bus...");
@@ -26,25 +174,21 @@ static indigo_result pyindigo_client_attach(indigo_client *client)
 }
 
 static indigo_result pyindigo_client_define_property(indigo_client *client, indigo_device *device, indigo_property *property, const char *message) {
+	if (property->type == INDIGO_BLOB_VECTOR)
+		record_blob_property(device, property);
 	call_dispatching_callback(PYINDIGO_DEFINE_ACTION, device, property, message);
 	return INDIGO_OK;
 }
 
 
 static indigo_result pyindigo_client_update_property(indigo_client *client, indigo_device *device, indigo_property *property, const char *message) {
-	// TODO: general solution neede for this
-	// 		 what does it do? will code break withou it? search indigo docs
-	if (!strcmp(property->name, CCD_IMAGE_PROPERTY_NAME)) {
-		if (device->version >= INDIGO_VERSION_2_0)
-			indigo_enable_blob(client, property, INDIGO_ENABLE_BLOB_URL);
-		else
-			indigo_enable_blob(client, property, INDIGO_ENABLE_BLOB_ALSO);
-	}
 	call_dispatching_callback(PYINDIGO_UPDATE_ACTION, device, property, message);
 	return INDIGO_OK;
 }
 
 static indigo_result pyindigo_client_delete_property(indigo_client *client, indigo_device *device, indigo_property *property, const char *message) {
+	if (property->type == INDIGO_BLOB_VECTOR || !property->name[0])
+		forget_blob_properties(property);
 	call_dispatching_callback(PYINDIGO_DELETE_ACTION, device, property, message);
 	return INDIGO_OK;
 }
@@ -55,6 +199,9 @@ static indigo_result pyindigo_client_send_message(indigo_client *client, indigo_
 
 static indigo_result pyindigo_client_detach(indigo_client *client) {
 	indigo_log("detached from INDIGO bus...");
+	pthread_mutex_lock(&blob_modes_mutex);
+	memset(blob_properties, 0, sizeof(blob_properties));
+	pthread_mutex_unlock(&blob_modes_mutex);
 	return INDIGO_OK;
 }
 
@@ -1,5 +1,18 @@
 // developed by Igor Vaiman, SINP MSU
 
+#include <stdbool.h>
+
 #include <indigo/indigo_client.h>
 
-extern indigo_client pyindigo_client;
\ No newline at end of file
+extern indigo_client pyindigo_client;
+
+// removes BLOB mode rule for device and property
+#define PYINDIGO_BLOB_MODE_DEFAULT -1
+
+// results of pyindigo_set_blob_mode, rules are not changed on error
+#define PYINDIGO_BLOB_MODE_SET 0
+#define PYINDIGO_BLOB_MODE_TOO_MANY_RULES 1
+#define PYINDIGO_BLOB_MODE_NO_MEMORY 2
+
+// sets BLOB mode (indigo_enable_blob_mode) for device and property, empty string matching any
+extern int pyindigo_set_blob_mode(const char *device, const char *property, int mode);
\ No newline at end of file
@@ -6,6 +6,9 @@
 #include "Python.h"
 
 #include <pthread.h>
+#include <errno.h>
+#include <stdio.h>
+#include <time.h>
 
 #include <indigo/indigo_bus.h>
 #include <indigo/indigo_client.h>
@@ -14,180 +17,1836 @@
 #include "../pyindigo_client/pyindigo_client.h"
 
 
-// temporaryly working with only one driver!
-// TODO: dynamic list of driver pointers with Python objects storing indices (IDs)
-//       letting Python user load and delete drivers as they please
-struct indigo_driver_entry *driver;
+// attached drivers registry, Python side refers to drivers by handles — unique positive integers,
+// that are never reused, so stale handle can't detach another driver
+// accessed only with GIL held
+
+typedef struct {
+    long handle;  // 0 for empty slot
+    indigo_driver_entry *entry;
+} attached_driver;
+
+static attached_driver attached_drivers[INDIGO_MAX_DRIVERS];
+static long last_driver_handle = 0;
+
+
+// remote INDIGO servers registry, same handles semantics as for drivers
+
+typedef struct {
+    long handle;  // 0 for empty slot
+    indigo_server_entry *entry;
+} connected_server;
+
+static connected_server connected_servers[INDIGO_MAX_SERVERS];
+static long last_server_handle = 0;
 
 
 // client-level functions
 
 
-indigo_log_levels CURRENT_INDIGO_LOG_LEVEL;
+indigo_log_levels CURRENT_INDIGO_LOG_LEVEL;
+
+void set_indigo_log_level_from_verbosity(int verbosity) {
+    switch (verbosity) {
+        case 1: CURRENT_INDIGO_LOG_LEVEL = INDIGO_LOG_INFO; break;
+        case 2: CURRENT_INDIGO_LOG_LEVEL = INDIGO_LOG_DEBUG; break;
+        case 3: CURRENT_INDIGO_LOG_LEVEL = INDIGO_LOG_TRACE; break;
+        default: CURRENT_INDIGO_LOG_LEVEL = INDIGO_LOG_ERROR; break;
+    }
+    indigo_set_log_level(CURRENT_INDIGO_LOG_LEVEL);
+}
+
+
+static PyObject*
+setup_client(PyObject* self)
+{
+    set_indigo_log_level_from_verbosity(0);
+    indigo_start();
+    indigo_attach_client(&pyindigo_client);
+    Py_RETURN_NONE;
+}
+
+
+static void shutdown_event_queue(void);
+static void shutdown_blob_writer(void);
+static void shutdown_frame_pool(void);
+static void clear_blob_sinks(void);
+
+static PyObject*
+cleanup_client(PyObject* self)
+{
+    Py_BEGIN_ALLOW_THREADS
+    shutdown_blob_writer();
+    Py_END_ALLOW_THREADS
+    clear_blob_sinks();
+    shutdown_event_queue();
+    shutdown_frame_pool();
+    // drivers left attached are removed with the bus
+    for (int i = 0; i < INDIGO_MAX_DRIVERS && attached_drivers[i].handle != 0; i++) {
+        indigo_remove_driver(attached_drivers[i].entry);
+        attached_drivers[i].handle = 0;
+        attached_drivers[i].entry = NULL;
+    }
+    for (int i = 0; i < INDIGO_MAX_SERVERS && connected_servers[i].handle != 0; i++) {
+        indigo_server_entry *entry = connected_servers[i].entry;
+        connected_servers[i].handle = 0;
+        connected_servers[i].entry = NULL;
+        Py_BEGIN_ALLOW_THREADS
+        indigo_disconnect_server(entry);
+        Py_END_ALLOW_THREADS
+    }
+	indigo_detach_client(&pyindigo_client);
+	indigo_stop();
+    Py_RETURN_NONE;
+}
+
+
+static PyObject*
+set_log_level(PyObject* self, PyObject* args)
+{
+    int verbosity = 0;
+    if (!PyArg_ParseTuple(args, "i", &verbosity))
+        return NULL;
+    set_indigo_log_level_from_verbosity(verbosity);
+    Py_RETURN_NONE;
+}
+
+
+// Indigo properties modelled with Python classes
+// see pyindigo.properties.properties.py for definitions
+
+static PyObject *TextVectorPropertyClass = NULL;
+static PyObject *NumberVectorPropertyClass = NULL;
+static PyObject *SwitchVectorPropertyClass = NULL;
+static PyObject *LightVectorPropertyClass = NULL;
+static PyObject *BlobVectorPropertyClass = NULL;
+
+static PyObject* get_property_class(indigo_property *property);
+
+static PyObject*
+set_property_classes(PyObject* self, PyObject* args)
+{
+    PyObject *classes[5];
+    if (!PyArg_ParseTuple(args, "OOOOO", &classes[0], &classes[1], &classes[2], &classes[3], &classes[4]))
+        return NULL;
+    PyObject **property_classes[] = {
+        &TextVectorPropertyClass, &NumberVectorPropertyClass, &SwitchVectorPropertyClass,
+        &LightVectorPropertyClass, &BlobVectorPropertyClass
+    };
+    for (int i = 0; i < 5; i++) {
+        Py_INCREF(classes[i]);
+        Py_XSETREF(*property_classes[i], classes[i]);
+    }
+    Py_RETURN_NONE;
+}
+
+
+// enum members (see pyindigo.core.enums) are cached on setup and passed to Python as is,
+// so that no enum value lookup is done per event
+
+#define MAX_ENUM_VALUE 3
+
+static PyObject *property_state_members[MAX_ENUM_VALUE + 1] = {NULL};
+static PyObject *property_perm_members[MAX_ENUM_VALUE + 1] = {NULL};
+static PyObject *switch_rule_members[MAX_ENUM_VALUE + 1] = {NULL};
+
+static const char *action_values[] = {"define", "update", "delete"};
+static PyObject *action_members[] = {NULL, NULL, NULL};
+
+static PyObject*
+set_enum_classes(PyObject* self, PyObject* args)
+{
+    PyObject *enum_classes[4];
+    if (!PyArg_ParseTuple(args, "OOOO", &enum_classes[0], &enum_classes[1], &enum_classes[2], &enum_classes[3]))
+        return NULL;
+    PyObject **members_tables[] = {property_state_members, property_perm_members, switch_rule_members};
+    for (int e = 0; e < 3; e++) {
+        for (long value = 0; value <= MAX_ENUM_VALUE; value++) {
+            // values missing from enum are left NULL and passed as integers
+            PyObject *member = PyObject_CallFunction(enum_classes[e], "l", value);
+            if (member == NULL) {
+                if (!PyErr_ExceptionMatches(PyExc_ValueError))
+                    return NULL;
+                PyErr_Clear();
+            }
+            Py_XSETREF(members_tables[e][value], member);
+        }
+    }
+    for (int a = 0; a < 3; a++) {
+        PyObject *member = PyObject_CallFunction(enum_classes[3], "s", action_values[a]);
+        if (member == NULL)
+            return NULL;
+        Py_XSETREF(action_members[a], member);
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject*
+enum_member(PyObject **members, int value)
+{
+    if (value >= 0 && value <= MAX_ENUM_VALUE && members[value] != NULL) {
+        Py_INCREF(members[value]);
+        return members[value];
+    }
+    return PyLong_FromLong(value);
+}
+
+static PyObject*
+action_member(const char *action_type)
+{
+    for (int a = 0; a < 3; a++) {
+        if (action_members[a] != NULL && !strcmp(action_type, action_values[a])) {
+            Py_INCREF(action_members[a]);
+            return action_members[a];
+        }
+    }
+    return PyUnicode_FromString(action_type);
+}
+
+
+// device, property and item names (and formats) are few and repeat in every event, so Python strings
+// for them are interned once and cached in open addressing hash table keyed by C string;
+// besides saving allocations, this makes comparisons with interned names on Python side identity checks
+// accessed only with GIL held
+
+#define NAME_CACHE_SIZE 4096  // power of 2, cache stops growing when it's half full
+
+typedef struct {
+    uint64_t hash;
+    char *name;  // NULL for empty slot
+    PyObject *object;
+} name_cache_entry;
+
+static name_cache_entry name_cache[NAME_CACHE_SIZE];
+static int name_cache_count = 0;
+
+static PyObject*
+cached_name(const char *name)
+{
+    uint64_t hash = 14695981039346656037ULL;  // FNV-1a
+    for (const char *c = name; *c; c++)
+        hash = (hash ^ (unsigned char)*c) * 1099511628211ULL;
+    size_t slot = hash & (NAME_CACHE_SIZE - 1);
+    while (name_cache[slot].name != NULL) {
+        if (name_cache[slot].hash == hash && !strcmp(name_cache[slot].name, name)) {
+            Py_INCREF(name_cache[slot].object);
+            return name_cache[slot].object;
+        }
+        slot = (slot + 1) & (NAME_CACHE_SIZE - 1);
+    }
+    PyObject *object = PyUnicode_InternFromString(name);
+    if (object == NULL || name_cache_count >= NAME_CACHE_SIZE / 2)
+        return object;
+    char *name_copy = strdup(name);
+    if (name_copy == NULL)
+        return object;
+    Py_INCREF(object);
+    name_cache[slot] = (name_cache_entry){hash, name_copy, object};
+    name_cache_count++;
+    return object;
+}
+
+
+// copy of property made when it must outlive INDIGO's original, BLOB values are copied too,
+// unless only metadata is copied (e.g. when BLOBs are written to files, see BLOB sinks below);
+// BLOB data is taken from frame pool when it's enabled, see below
+
+static bool acquire_frame(Py_ssize_t size, void **frame);
+static void free_blob_data(void *data);
+
+static void
+free_property_copy(indigo_property *copy)
+{
+    if (copy->type == INDIGO_BLOB_VECTOR) {
+        for (int i = 0; i < copy->count; i++)
+            free_blob_data(copy->items[i].blob.value);
+    }
+    free(copy);
+}
+
+static indigo_property*
+copy_property_metadata(indigo_property *property)
+{
+    size_t size = sizeof(indigo_property) + property->count * sizeof(indigo_item);
+    indigo_property *copy = malloc(size);
+    if (copy == NULL)
+        return NULL;
+    memcpy(copy, property, size);
+    copy->allocated_count = property->count;
+    if (property->type == INDIGO_BLOB_VECTOR) {
+        for (int i = 0; i < property->count; i++)
+            copy->items[i].blob.value = NULL;
+    }
+    return copy;
+}
+
+static indigo_property*
+copy_property(indigo_property *property)
+{
+    indigo_property *copy = copy_property_metadata(property);
+    if (copy == NULL)
+        return NULL;
+    if (property->type == INDIGO_BLOB_VECTOR) {
+        for (int i = 0; i < property->count; i++) {
+            indigo_item *item = &property->items[i];
+            if (item->blob.value == NULL)
+                continue;
+            void *data = NULL;
+            if (!acquire_frame(item->blob.size, &data) && (data = malloc(item->blob.size)) == NULL) {
+                copy->count = i;
+                free_property_copy(copy);
+                return NULL;
+            }
+            if (data != NULL)  // otherwise frame is dropped by frame pool
+                memcpy(data, item->blob.value, item->blob.size);
+            copy->items[i].blob.value = data;
+        }
+    }
+    return copy;
+}
+
+
+// BLOB buffer is a read-only object exposing BLOB data via buffer protocol without copying it to bytes;
+// used as BlobItem.value in zero-copy mode
+
+static bool zero_copy_blobs = false;
+
+typedef struct {
+    PyObject_HEAD
+    char *data;  // NULL when data is no longer available
+    Py_ssize_t size;
+    PyObject *owner;  // object keeping data memory alive, if any
+    bool owns_data;  // data is buffer's own copy
+    Py_ssize_t exports;
+} BlobBuffer;
+
+static void
+BlobBuffer_dealloc(BlobBuffer *self)
+{
+    if (self->owns_data)
+        free_blob_data(self->data);
+    Py_XDECREF(self->owner);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static int
+BlobBuffer_getbuffer(BlobBuffer *self, Py_buffer *view, int flags)
+{
+    if (self->data == NULL) {
+        PyErr_SetString(PyExc_BufferError, "BLOB data is no longer available");
+        view->obj = NULL;
+        return -1;
+    }
+    if (PyBuffer_FillInfo(view, (PyObject *)self, self->data, self->size, 1, flags) < 0)
+        return -1;
+    self->exports++;
+    return 0;
+}
+
+static void
+BlobBuffer_releasebuffer(BlobBuffer *self, Py_buffer *view)
+{
+    self->exports--;
+}
+
+static Py_ssize_t
+BlobBuffer_length(BlobBuffer *self)
+{
+    return self->data != NULL ? self->size : 0;
+}
+
+static PyObject*
+BlobBuffer_tobytes(BlobBuffer *self, PyObject *Py_UNUSED(ignored))
+{
+    if (self->data == NULL) {
+        PyErr_SetString(PyExc_BufferError, "BLOB data is no longer available");
+        return NULL;
+    }
+    return PyBytes_FromStringAndSize(self->data, self->size);
+}
+
+static PyBufferProcs BlobBuffer_as_buffer = {
+    (getbufferproc)BlobBuffer_getbuffer,
+    (releasebufferproc)BlobBuffer_releasebuffer,
+};
+
+static PySequenceMethods BlobBuffer_as_sequence = {
+    .sq_length = (lenfunc)BlobBuffer_length,
+};
+
+static PyMethodDef BlobBuffer_methods[] = {
+    {"tobytes", (PyCFunction)BlobBuffer_tobytes, METH_NOARGS, "copy BLOB data to bytes object"},
+    {NULL, NULL, 0, NULL}  /* Sentinel */
+};
+
+static PyTypeObject BlobBufferType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "core_ext.BlobBuffer",
+    .tp_doc = "Read-only buffer with BLOB data",
+    .tp_basicsize = sizeof(BlobBuffer),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_dealloc = (destructor)BlobBuffer_dealloc,
+    .tp_as_buffer = &BlobBuffer_as_buffer,
+    .tp_as_sequence = &BlobBuffer_as_sequence,
+    .tp_methods = BlobBuffer_methods,
+};
+
+static BlobBuffer*
+new_blob_buffer(void *data, Py_ssize_t size, PyObject *owner)
+{
+    BlobBuffer *buffer = PyObject_New(BlobBuffer, &BlobBufferType);
+    if (buffer == NULL)
+        return NULL;
+    buffer->data = data;
+    buffer->size = size;
+    Py_XINCREF(owner);
+    buffer->owner = owner;
+    buffer->owns_data = false;
+    buffer->exports = 0;
+    return buffer;
+}
+
+// frame pool is a preallocated arena of equally sized frames for BLOB data, so that long CCD streaming sessions
+// do not allocate and free a full-size buffer for each frame; when all frames are in use, new frame either
+// waits for one to be released (for limited time) or takes the oldest frame held only by a BLOB buffer
+// that is not exported, which then becomes empty (see pyindigo.core.frame_pool)
+
+#define FRAME_POOL_BLOCK 0
+#define FRAME_POOL_DROP_OLDEST 1
+
+static struct {
+    pthread_mutex_t mutex;
+    pthread_cond_t released;
+    bool enabled;  // read without lock as a fast check, arena may outlive pool until all frames are released
+    char *memory;  // arena, NULL when there's no pool
+    Py_ssize_t frame_size;
+    int frames_count;
+    int policy;
+    double timeout;  // sec to wait for a frame with FRAME_POOL_BLOCK policy
+    bool *in_use;
+    BlobBuffer **holders;  // buffer owning the frame, NULL for frames held by property copies
+    unsigned long long *acquired_at;  // acquisition number of the frame, to find the oldest one
+    // statistics
+    int occupancy;
+    int max_occupancy;
+    unsigned long long acquired;
+    unsigned long long dropped;  // new frames not stored for lack of free frames
+    unsigned long long reclaimed;  // old frames taken from their buffers
+    unsigned long long oversized;  // frames larger than pool frame size, allocated as usual
+} frame_pool = {
+    .mutex = PTHREAD_MUTEX_INITIALIZER,
+    .released = PTHREAD_COND_INITIALIZER,
+};
+
+// frame pool functions must not acquire GIL with pool mutex locked, as GIL holders lock it to release frames
+
+static void
+free_frame_pool_memory(void)
+{
+    free(frame_pool.memory);
+    free(frame_pool.in_use);
+    free(frame_pool.holders);
+    free(frame_pool.acquired_at);
+    frame_pool.memory = NULL;
+    frame_pool.in_use = NULL;
+    frame_pool.holders = NULL;
+    frame_pool.acquired_at = NULL;
+}
+
+// returns -1 if data is not a frame, must be called with pool mutex locked
+static int
+frame_slot(void *data)
+{
+    char *address = data;
+    if (
+        frame_pool.memory == NULL || address < frame_pool.memory
+        || address >= frame_pool.memory + frame_pool.frames_count * frame_pool.frame_size
+    )
+        return -1;
+    return (address - frame_pool.memory) / frame_pool.frame_size;
+}
+
+static int
+free_frame_slot(void)
+{
+    for (int slot = 0; slot < frame_pool.frames_count; slot++) {
+        if (!frame_pool.in_use[slot])
+            return slot;
+    }
+    return -1;
+}
+
+// GIL must be held to take memory from the buffer
+static int
+reclaim_oldest_frame(void)
+{
+    int oldest = -1;
+    for (int slot = 0; slot < frame_pool.frames_count; slot++) {
+        BlobBuffer *holder = frame_pool.holders[slot];
+        if (
+            holder != NULL && holder->exports == 0
+            && (oldest < 0 || frame_pool.acquired_at[slot] < frame_pool.acquired_at[oldest])
+        )
+            oldest = slot;
+    }
+    if (oldest >= 0) {
+        BlobBuffer *holder = frame_pool.holders[oldest];
+        holder->data = NULL;
+        holder->owns_data = false;
+        frame_pool.holders[oldest] = NULL;
+        frame_pool.in_use[oldest] = false;
+        frame_pool.occupancy--;
+        frame_pool.reclaimed++;
+    }
+    return oldest;
+}
+
+// must be called with pool mutex locked, returns with it locked
+static int
+wait_for_free_frame(bool gil_held)
+{
+    struct timespec deadline;
+    clock_gettime(CLOCK_REALTIME, &deadline);
+    long long timeout_ns = (long long)(frame_pool.timeout * 1e9) + deadline.tv_nsec;
+    deadline.tv_sec += timeout_ns / 1000000000;
+    deadline.tv_nsec = timeout_ns % 1000000000;
+    int slot = -1;
+    while (slot < 0 && frame_pool.enabled) {
+        int error;
+        if (gil_held) {
+            Py_BEGIN_ALLOW_THREADS
+            error = pthread_cond_timedwait(&frame_pool.released, &frame_pool.mutex, &deadline);
+            pthread_mutex_unlock(&frame_pool.mutex);
+            Py_END_ALLOW_THREADS
+            pthread_mutex_lock(&frame_pool.mutex);
+        }
+        else {
+            error = pthread_cond_timedwait(&frame_pool.released, &frame_pool.mutex, &deadline);
+        }
+        if (frame_pool.enabled)
+            slot = free_frame_slot();
+        if (error == ETIMEDOUT)
+            break;
+    }
+    return slot;
+}
+
+// returns false if frame pool is not used for data of given size, otherwise frame is NULL when it was dropped
+static bool
+acquire_frame(Py_ssize_t size, void **frame)
+{
+    if (!frame_pool.enabled)
+        return false;
+    bool gil_held = PyGILState_Check();
+    pthread_mutex_lock(&frame_pool.mutex);
+    if (!frame_pool.enabled) {
+        pthread_mutex_unlock(&frame_pool.mutex);
+        return false;
+    }
+    if (size > frame_pool.frame_size) {
+        frame_pool.oversized++;
+        pthread_mutex_unlock(&frame_pool.mutex);
+        return false;
+    }
+    int slot = free_frame_slot();
+    if (slot < 0 && frame_pool.policy == FRAME_POOL_BLOCK) {
+        slot = wait_for_free_frame(gil_held);
+    }
+    else if (slot < 0 && frame_pool.policy == FRAME_POOL_DROP_OLDEST) {
+        PyGILState_STATE gstate;
+        if (!gil_held) {
+            pthread_mutex_unlock(&frame_pool.mutex);
+            gstate = PyGILState_Ensure();
+            pthread_mutex_lock(&frame_pool.mutex);
+        }
+        if (frame_pool.enabled && (slot = free_frame_slot()) < 0)
+            slot = reclaim_oldest_frame();
+        if (slot >= 0) {  // reserved before GIL is released
+            frame_pool.in_use[slot] = true;
+            frame_pool.occupancy++;
+        }
+        if (!gil_held) {
+            pthread_mutex_unlock(&frame_pool.mutex);
+            PyGILState_Release(gstate);
+            pthread_mutex_lock(&frame_pool.mutex);
+        }
+        if (slot >= 0)
+            frame_pool.occupancy--;  // counted once more below
+    }
+    if (!frame_pool.enabled && slot < 0) {  // disabled while waiting
+        pthread_mutex_unlock(&frame_pool.mutex);
+        return false;
+    }
+    if (slot < 0) {
+        frame_pool.dropped++;
+        *frame = NULL;
+    }
+    else {
+        frame_pool.in_use[slot] = true;
+        frame_pool.holders[slot] = NULL;
+        frame_pool.acquired_at[slot] = ++frame_pool.acquired;
+        if (++frame_pool.occupancy > frame_pool.max_occupancy)
+            frame_pool.max_occupancy = frame_pool.occupancy;
+        *frame = frame_pool.memory + slot * frame_pool.frame_size;
+    }
+    pthread_mutex_unlock(&frame_pool.mutex);
+    return true;
+}
+
+// buffer owning the frame, allowing to reclaim it; no-op for data not from frame pool
+static void
+set_frame_holder(void *data, BlobBuffer *buffer)
+{
+    if (data == NULL)
+        return;
+    pthread_mutex_lock(&frame_pool.mutex);
+    int slot = frame_slot(data);
+    if (slot >= 0)
+        frame_pool.holders[slot] = buffer;
+    pthread_mutex_unlock(&frame_pool.mutex);
+}
+
+static void
+free_blob_data(void *data)
+{
+    if (data == NULL)
+        return;
+    pthread_mutex_lock(&frame_pool.mutex);
+    int slot = frame_slot(data);
+    if (slot >= 0) {
+        frame_pool.in_use[slot] = false;
+        frame_pool.holders[slot] = NULL;
+        frame_pool.occupancy--;
+        pthread_cond_signal(&frame_pool.released);
+        if (!frame_pool.enabled && frame_pool.occupancy == 0)
+            free_frame_pool_memory();
+    }
+    pthread_mutex_unlock(&frame_pool.mutex);
+    if (slot < 0)
+        free(data);
+}
+
+// INDIGO's BLOB data copied to a frame, NULL if frame is dropped; bytes object if frame pool is not used
+static PyObject*
+build_pooled_blob_value(indigo_item *item)
+{
+    void *frame;
+    if (!acquire_frame(item->blob.size, &frame))
+        return PyBytes_FromStringAndSize(item->blob.value, (Py_ssize_t)item->blob.size);
+    if (frame == NULL)
+        Py_RETURN_NONE;
+    memcpy(frame, item->blob.value, item->blob.size);
+    BlobBuffer *buffer = new_blob_buffer(frame, (Py_ssize_t)item->blob.size, NULL);
+    if (buffer == NULL) {
+        free_blob_data(frame);
+        return NULL;
+    }
+    buffer->owns_data = true;
+    set_frame_holder(frame, buffer);
+    return (PyObject *)buffer;
+}
+
+static PyObject*
+enable_frame_pool(PyObject* self, PyObject* args)
+{
+    int frames_count, policy;
+    Py_ssize_t frame_size;
+    double timeout;
+    if (!PyArg_ParseTuple(args, "inid", &frames_count, &frame_size, &policy, &timeout))
+        return NULL;
+    if (frames_count <= 0 || frame_size <= 0)
+        return PyErr_Format(PyExc_ValueError, "Frame pool must have positive number and size of frames");
+    if (policy != FRAME_POOL_BLOCK && policy != FRAME_POOL_DROP_OLDEST)
+        return PyErr_Format(PyExc_ValueError, "Unknown frame pool policy: %d", policy);
+    if (timeout < 0)
+        return PyErr_Format(PyExc_ValueError, "Frame pool timeout must be non-negative");
+    pthread_mutex_lock(&frame_pool.mutex);
+    if (frame_pool.enabled || frame_pool.memory != NULL) {
+        pthread_mutex_unlock(&frame_pool.mutex);
+        return PyErr_Format(PyExc_RuntimeError, "Frame pool is already enabled or its frames are still in use");
+    }
+    frame_pool.memory = malloc((size_t)frames_count * frame_size);
+    frame_pool.in_use = calloc(frames_count, sizeof(bool));
+    frame_pool.holders = calloc(frames_count, sizeof(BlobBuffer *));
+    frame_pool.acquired_at = calloc(frames_count, sizeof(unsigned long long));
+    if (
+        frame_pool.memory == NULL || frame_pool.in_use == NULL
+        || frame_pool.holders == NULL || frame_pool.acquired_at == NULL
+    ) {
+        free_frame_pool_memory();
+        pthread_mutex_unlock(&frame_pool.mutex);
+        return PyErr_NoMemory();
+    }
+    frame_pool.frames_count = frames_count;
+    frame_pool.frame_size = frame_size;
+    frame_pool.policy = policy;
+    frame_pool.timeout = timeout;
+    frame_pool.occupancy = frame_pool.max_occupancy = 0;
+    frame_pool.acquired = frame_pool.dropped = frame_pool.reclaimed = frame_pool.oversized = 0;
+    frame_pool.enabled = true;
+    pthread_mutex_unlock(&frame_pool.mutex);
+    Py_RETURN_NONE;
+}
+
+// frames in use stay valid, arena is freed when the last of them is released
+static void
+shutdown_frame_pool(void)
+{
+    pthread_mutex_lock(&frame_pool.mutex);
+    frame_pool.enabled = false;
+    pthread_cond_broadcast(&frame_pool.released);
+    if (frame_pool.occupancy == 0)
+        free_frame_pool_memory();
+    pthread_mutex_unlock(&frame_pool.mutex);
+}
+
+static PyObject*
+disable_frame_pool(PyObject* self)
+{
+    shutdown_frame_pool();
+    Py_RETURN_NONE;
+}
+
+static PyObject*
+frame_pool_stats(PyObject* self)
+{
+    pthread_mutex_lock(&frame_pool.mutex);
+    PyObject *stats = Py_BuildValue(
+        "{s:O,s:i,s:i,s:n,s:i,s:i,s:K,s:K,s:K,s:K}",
+        "enabled", frame_pool.enabled ? Py_True : Py_False,
+        "policy", frame_pool.policy,
+        "frames", frame_pool.frames_count,
+        "frame_size", frame_pool.frame_size,
+        "occupancy", frame_pool.occupancy,
+        "max_occupancy", frame_pool.max_occupancy,
+        "acquired", frame_pool.acquired,
+        "dropped", frame_pool.dropped,
+        "reclaimed", frame_pool.reclaimed,
+        "oversized", frame_pool.oversized
+    );
+    pthread_mutex_unlock(&frame_pool.mutex);
+    return stats;
+}
+
+
+// called when INDIGO's BLOB memory, exposed by buffer, is about to become invalid
+static void
+detach_blob_buffer(BlobBuffer *buffer, bool still_referenced)
+{
+    if (!still_referenced) {
+        buffer->data = NULL;
+        return;
+    }
+    if (buffer->exports > 0) {
+        // exported memory can't be replaced, objects using it (memoryviews, arrays) must not outlive the callback
+        PyErr_WarnEx(
+            PyExc_RuntimeWarning,
+            "BLOB buffer is still exported after property dispatching, exported data may become invalid", 1
+        );
+        if (PyErr_Occurred())
+            PyErr_Print();
+    }
+    void *data_copy = NULL;
+    if (!acquire_frame(buffer->size, &data_copy))
+        data_copy = malloc(buffer->size);
+    if (data_copy != NULL)
+        memcpy(data_copy, buffer->data, buffer->size);
+    buffer->data = data_copy;
+    buffer->owns_data = data_copy != NULL;
+    set_frame_holder(data_copy, buffer);
+}
+
+
+// property items are converted to Python objects only when they are accessed from Python code,
+// loader object points either to INDIGO's property (valid only while it is being dispatched) or to its copy
+
+typedef struct {
+    PyObject_HEAD
+    indigo_property *property;  // INDIGO's property while it is dispatched, own copy afterwards (or NULL)
+    bool owns_property;
+    PyObject *blob_buffers;  // list of buffers exposing INDIGO's BLOB memory, NULL if none were created
+} PropertyItemsLoader;
+
+static PyObject*
+build_blob_value(PropertyItemsLoader *loader, indigo_item *item)
+{
+    if (item->blob.value == NULL)  // not sent by INDIGO, written to file (see BLOB sinks) or dropped
+        Py_RETURN_NONE;
+    if (!zero_copy_blobs && !frame_pool.enabled)
+        return PyBytes_FromStringAndSize(item->blob.value, (Py_ssize_t)item->blob.size);
+    // property copy's BLOB data is usually a frame already
+    if (loader->owns_property)
+        return (PyObject *)new_blob_buffer(item->blob.value, (Py_ssize_t)item->blob.size, (PyObject *)loader);
+    if (!zero_copy_blobs)
+        return build_pooled_blob_value(item);
+    // buffer over INDIGO's memory is tracked by loader to be detached after dispatching
+    if (loader->blob_buffers == NULL && (loader->blob_buffers = PyList_New(0)) == NULL)
+        return NULL;
+    PyObject *buffer = (PyObject *)new_blob_buffer(item->blob.value, (Py_ssize_t)item->blob.size, NULL);
+    if (buffer != NULL && PyList_Append(loader->blob_buffers, buffer) < 0)
+        Py_CLEAR(buffer);
+    return buffer;
+}
+
+// BLOB items written to files by BLOB sink have no value in property copy, and url pointing to the file
+
+#define FILE_URL_PREFIX "file://"
+#define FILE_URL_PREFIX_LENGTH 7
+
+static bool
+is_sunk_blob(indigo_item *item)
+{
+    return item->blob.value == NULL && !strncmp(item->blob.url, FILE_URL_PREFIX, FILE_URL_PREFIX_LENGTH);
+}
+
+// all items are built with a single call to property class' _load_columns method
+// (see pyindigo.core.properties.properties), each column being a tuple with values of one item field;
+// numeric columns of number vectors are bytes with packed doubles, filled directly from INDIGO items
+
+#define MAX_ITEM_COLUMNS 7
+
+static PyObject *load_columns_method_name = NULL;  // interned on module init
+
+static PyObject*
+new_doubles_column(int count, double **data)
+{
+    PyObject *column = PyBytes_FromStringAndSize(NULL, (Py_ssize_t)count * sizeof(double));
+    if (column != NULL)
+        *data = (double *)PyBytes_AS_STRING(column);
+    return column;
+}
+
+static PyObject*
+build_number_columns(indigo_property *property, PyObject **columns)
+{
+    double *values, *mins, *maxs, *steps, *targets;
+    if (
+        (columns[1] = new_doubles_column(property->count, &values)) == NULL
+        || (columns[3] = new_doubles_column(property->count, &mins)) == NULL
+        || (columns[4] = new_doubles_column(property->count, &maxs)) == NULL
+        || (columns[5] = new_doubles_column(property->count, &steps)) == NULL
+        || (columns[6] = new_doubles_column(property->count, &targets)) == NULL
+    )
+        return NULL;
+    for (int i = 0; i < property->count; i++) {
+        indigo_item *item = &property->items[i];
+        values[i] = item->number.value;
+        mins[i] = item->number.min;
+        maxs[i] = item->number.max;
+        steps[i] = item->number.step;
+        targets[i] = item->number.target;
+        PyObject *format = cached_name(item->number.format);
+        if (format == NULL)
+            return NULL;
+        PyTuple_SET_ITEM(columns[2], i, format);
+    }
+    return columns[0];
+}
+
+static PyObject*
+build_items_list(PropertyItemsLoader *loader)
+{
+    indigo_property *property = loader->property;
+    int columns_count = 0;
+    switch (property->type) {
+        case INDIGO_TEXT_VECTOR: columns_count = 2; break;
+        case INDIGO_NUMBER_VECTOR: columns_count = 7; break;
+        case INDIGO_SWITCH_VECTOR: columns_count = 2; break;
+        case INDIGO_LIGHT_VECTOR: columns_count = 2; break;
+        case INDIGO_BLOB_VECTOR: columns_count = 6; break;
+        default:
+            return PyErr_Format(PyExc_TypeError, "Unknown property type: %d", property->type);
+    }
+
+    PyObject *columns[MAX_ITEM_COLUMNS] = {NULL};
+    PyObject *items_list = NULL;
+    for (int c = 0; c < columns_count; c++) {
+        // numeric columns of number vectors are created by build_number_columns
+        if (property->type == INDIGO_NUMBER_VECTOR && c != 0 && c != 2)
+            continue;
+        columns[c] = PyTuple_New(property->count);
+        if (columns[c] == NULL)
+            goto cleanup;
+    }
+
+    for (int i = 0; i < property->count; i++) {
+        indigo_item *item = &property->items[i];
+        PyObject *name = cached_name(indigo_item_name(INDIGO_VERSION_CURRENT, property, item));
+        if (name == NULL)
+            goto cleanup;
+        PyTuple_SET_ITEM(columns[0], i, name);
+        // new references are stolen by PyTuple_SET_ITEM, NULLs are checked for all at once below
+        switch (property->type) {
+            case INDIGO_TEXT_VECTOR:
+                PyTuple_SET_ITEM(columns[1], i, PyUnicode_FromString(item->text.value));
+                break;
+            case INDIGO_SWITCH_VECTOR:
+                PyTuple_SET_ITEM(columns[1], i, PyBool_FromLong(item->sw.value));
+                break;
+            case INDIGO_LIGHT_VECTOR:
+                PyTuple_SET_ITEM(columns[1], i, enum_member(property_state_members, item->light.value));
+                break;
+            case INDIGO_BLOB_VECTOR:
+                if (is_sunk_blob(item)) {
+                    Py_INCREF(Py_None);
+                    PyTuple_SET_ITEM(columns[1], i, Py_None);
+                    PyTuple_SET_ITEM(columns[4], i, PyUnicode_FromString(item->blob.url + FILE_URL_PREFIX_LENGTH));
+                }
+                else {
+                    PyTuple_SET_ITEM(columns[1], i, build_blob_value(loader, item));
+                    Py_INCREF(Py_None);
+                    PyTuple_SET_ITEM(columns[4], i, Py_None);
+                }
+                PyTuple_SET_ITEM(columns[2], i, cached_name(item->blob.format));
+                PyTuple_SET_ITEM(columns[3], i, PyLong_FromLong(item->blob.size));
+                // BLOB may be sent as URL only, see set_blob_mode
+                if (item->blob.url[0] && !is_sunk_blob(item)) {
+                    PyTuple_SET_ITEM(columns[5], i, PyUnicode_FromString(item->blob.url));
+                }
+                else {
+                    Py_INCREF(Py_None);
+                    PyTuple_SET_ITEM(columns[5], i, Py_None);
+                }
+                break;
+            default : {}
+        }
+        if (property->type == INDIGO_NUMBER_VECTOR)
+            continue;
+        for (int c = 1; c < columns_count; c++) {
+            if (PyTuple_GET_ITEM(columns[c], i) == NULL)
+                goto cleanup;
+        }
+    }
+    if (property->type == INDIGO_NUMBER_VECTOR && build_number_columns(property, columns) == NULL)
+        goto cleanup;
+
+    // unused columns are NULLs, the first of them terminates arguments list
+    items_list = PyObject_CallMethodObjArgs(
+        get_property_class(property), load_columns_method_name,
+        columns[0], columns[1], columns[2], columns[3], columns[4], columns[5], columns[6], NULL
+    );
+
+cleanup:
+    for (int c = 0; c < MAX_ITEM_COLUMNS; c++)
+        Py_XDECREF(columns[c]);
+    return items_list;
+}
+
+static void
+PropertyItemsLoader_dealloc(PropertyItemsLoader *self)
+{
+    if (self->owns_property)
+        free_property_copy(self->property);
+    Py_XDECREF(self->blob_buffers);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyObject*
+PropertyItemsLoader_call(PropertyItemsLoader *self, PyObject *args, PyObject *kwargs)
+{
+    if (self->property == NULL) {
+        PyErr_SetString(PyExc_RuntimeError, "Property items are no longer available");
+        return NULL;
+    }
+    return build_items_list(self);
+}
+
+static PyTypeObject PropertyItemsLoaderType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "core_ext.PropertyItemsLoader",
+    .tp_doc = "Callable building list of Python items for dispatched property",
+    .tp_basicsize = sizeof(PropertyItemsLoader),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_dealloc = (destructor)PropertyItemsLoader_dealloc,
+    .tp_call = (ternaryfunc)PropertyItemsLoader_call,
+};
+
+static PropertyItemsLoader*
+new_items_loader(indigo_property *property)
+{
+    PropertyItemsLoader *loader = PyObject_New(PropertyItemsLoader, &PropertyItemsLoaderType);
+    if (loader == NULL)
+        return NULL;
+    loader->property = property;
+    loader->owns_property = false;
+    loader->blob_buffers = NULL;
+    return loader;
+}
+
+// called after property is dispatched and INDIGO's property is about to become invalid
+static void
+release_items_loader(PropertyItemsLoader *loader, bool property_object_alive)
+{
+    if (loader->owns_property)
+        return;
+    if (loader->blob_buffers != NULL) {
+        for (Py_ssize_t i = 0; i < PyList_GET_SIZE(loader->blob_buffers); i++) {
+            BlobBuffer *buffer = (BlobBuffer *)PyList_GET_ITEM(loader->blob_buffers, i);
+            // one reference is held by the list
+            detach_blob_buffer(buffer, Py_REFCNT(buffer) > 1);
+        }
+        Py_CLEAR(loader->blob_buffers);
+    }
+    // property object still holds the loader = items were not built yet
+    if (property_object_alive && Py_REFCNT(loader) > 1) {
+        loader->property = copy_property(loader->property);
+        loader->owns_property = loader->property != NULL;
+    }
+    else {
+        loader->property = NULL;
+    }
+}
+
+
+static PyObject*
+set_blob_mode(PyObject* self, PyObject* args)
+{
+    const char *device, *property;
+    int mode;
+    if (!PyArg_ParseTuple(args, "ssi", &device, &property, &mode))
+        return NULL;
+    if (strlen(device) >= INDIGO_NAME_SIZE || strlen(property) >= INDIGO_NAME_SIZE)
+        return PyErr_Format(PyExc_ValueError, "Device or property name is too long");
+    if (mode != PYINDIGO_BLOB_MODE_DEFAULT && (mode < INDIGO_ENABLE_BLOB_NEVER || mode > INDIGO_ENABLE_BLOB_URL))
+        return PyErr_Format(PyExc_ValueError, "Unknown BLOB mode: %d", mode);
+    int result;
+    // new mode may be requested from remote servers right away
+    Py_BEGIN_ALLOW_THREADS
+    result = pyindigo_set_blob_mode(device, property, mode);
+    Py_END_ALLOW_THREADS
+    if (result == PYINDIGO_BLOB_MODE_NO_MEMORY)
+        return PyErr_NoMemory();
+    if (result == PYINDIGO_BLOB_MODE_TOO_MANY_RULES)
+        return PyErr_Format(PyExc_ValueError, "Too many BLOB mode rules");
+    Py_RETURN_NONE;
+}
+
+static PyObject*
+set_zero_copy_blobs(PyObject* self, PyObject* args)
+{
+    int enabled;
+    if (!PyArg_ParseTuple(args, "p", &enabled))
+        return NULL;
+    zero_copy_blobs = enabled;
+    Py_RETURN_NONE;
+}
+
+
+// dispatching callback is a single Python callable representing all possible INDIGO actions
+// all dispatching should be done on Python side
+
+static PyObject *dispatching_callback = NULL;
+
+static PyObject*
+get_property_class(indigo_property *property)
+{
+    switch (property->type) {
+        case INDIGO_TEXT_VECTOR: return TextVectorPropertyClass;
+        case INDIGO_NUMBER_VECTOR: return NumberVectorPropertyClass;
+        case INDIGO_SWITCH_VECTOR: return SwitchVectorPropertyClass;
+        case INDIGO_LIGHT_VECTOR: return LightVectorPropertyClass;
+        case INDIGO_BLOB_VECTOR: return BlobVectorPropertyClass;
+        default : return NULL;
+	}
+}
+
+// only property attributes are converted here, items are built by loader on the first access
+static PyObject*
+build_property_object(indigo_property *property, PropertyItemsLoader *items_loader)
+{
+    PyObject *rule;
+    if (property->type == INDIGO_SWITCH_VECTOR)
+        rule = enum_member(switch_rule_members, property->rule);
+    else {
+        Py_INCREF(Py_None);
+        rule = Py_None;
+    }
+    return PyObject_CallMethod(
+        get_property_class(property), "_with_items_loader", "NNNNNO",
+        cached_name(property->device), cached_name(indigo_property_name(INDIGO_VERSION_CURRENT, property)),
+        enum_member(property_state_members, property->state), enum_member(property_perm_members, property->perm),
+        rule, (PyObject *)items_loader
+    );
+}
+
+
+// queued dispatching: INDIGO bus thread only puts a copy of property in a bounded queue and returns,
+// properties are dispatched by Python consumer thread (see pyindigo.core.event_queue)
+
+typedef enum {
+    OVERFLOW_BLOCK = 0,  // wait for consumer to take events from the queue
+    OVERFLOW_DROP_OLDEST = 1,
+    OVERFLOW_COALESCE = 2,  // replace queued update of the same property, drop the oldest event if there's none
+} overflow_policy;
+
+typedef struct {
+    const char *action_type;
+    indigo_property *property;  // copy owned by the queue
+} queued_event;
+
+static struct {
+    pthread_mutex_t mutex;
+    pthread_cond_t not_empty;
+    pthread_cond_t not_full;
+    bool enabled;
+    overflow_policy policy;
+    queued_event *events;  // ring buffer
+    int capacity;
+    int head;  // index of the oldest event
+    int count;
+    pthread_t consumer;
+    bool has_consumer;
+    // statistics
+    int max_depth;
+    unsigned long long enqueued;
+    unsigned long long dropped;
+    unsigned long long coalesced;
+} event_queue = {
+    .mutex = PTHREAD_MUTEX_INITIALIZER,
+    .not_empty = PTHREAD_COND_INITIALIZER,
+    .not_full = PTHREAD_COND_INITIALIZER,
+};
+
+static bool
+is_coalescable(const char *action_type, indigo_property *property)
+{
+    return !strcmp(action_type, "update") && property->type != INDIGO_BLOB_VECTOR;
+}
+
+// must be called with queue mutex locked; queued UPDATE is replaced only if there's no DEFINE or DELETE
+// of the property after it, so that the new value is not delivered before them
+static bool
+coalesce_event(const char *action_type, indigo_property *property)
+{
+    if (!is_coalescable(action_type, property))
+        return false;
+    for (int i = event_queue.count - 1; i >= 0; i--) {
+        queued_event *event = &event_queue.events[(event_queue.head + i) % event_queue.capacity];
+        if (strcmp(event->property->device, property->device))
+            continue;
+        if (strcmp(event->action_type, "update")) {
+            // property with empty name means all device properties
+            if (!event->property->name[0] || !strcmp(event->property->name, property->name))
+                return false;
+            continue;
+        }
+        if (!strcmp(event->property->name, property->name)) {
+            free_property_copy(event->property);
+            event->property = property;
+            return true;
+        }
+    }
+    return false;
+}
+
+// returns false if queue is not enabled and property must be dispatched right away
+static bool
+enqueue_event(const char *action_type, indigo_property *property)
+{
+    pthread_mutex_lock(&event_queue.mutex);
+    bool enabled = event_queue.enabled;
+    pthread_mutex_unlock(&event_queue.mutex);
+    if (!enabled)
+        return false;
+
+    indigo_property *copy = copy_property(property);
+
+    pthread_mutex_lock(&event_queue.mutex);
+    if (!event_queue.enabled) {
+        pthread_mutex_unlock(&event_queue.mutex);
+        if (copy != NULL)
+            free_property_copy(copy);
+        return false;
+    }
+    if (copy == NULL) {
+        event_queue.dropped++;
+        pthread_mutex_unlock(&event_queue.mutex);
+        return true;
+    }
+    while (event_queue.count == event_queue.capacity) {
+        if (event_queue.policy == OVERFLOW_COALESCE && coalesce_event(action_type, copy)) {
+            event_queue.coalesced++;
+            pthread_mutex_unlock(&event_queue.mutex);
+            return true;
+        }
+        // consumer thread can't wait for itself, e.g. when property is set from a callback
+        bool is_consumer = event_queue.has_consumer && pthread_equal(event_queue.consumer, pthread_self());
+        if (event_queue.policy == OVERFLOW_BLOCK && !is_consumer) {
+            pthread_cond_wait(&event_queue.not_full, &event_queue.mutex);
+            if (!event_queue.enabled) {
+                pthread_mutex_unlock(&event_queue.mutex);
+                free_property_copy(copy);
+                return false;
+            }
+            continue;
+        }
+        free_property_copy(event_queue.events[event_queue.head].property);
+        event_queue.head = (event_queue.head + 1) % event_queue.capacity;
+        event_queue.count--;
+        event_queue.dropped++;
+    }
+    queued_event *event = &event_queue.events[(event_queue.head + event_queue.count) % event_queue.capacity];
+    event->action_type = action_type;
+    event->property = copy;
+    event_queue.count++;
+    event_queue.enqueued++;
+    if (event_queue.count > event_queue.max_depth)
+        event_queue.max_depth = event_queue.count;
+    pthread_cond_signal(&event_queue.not_empty);
+    pthread_mutex_unlock(&event_queue.mutex);
+    return true;
+}
+
+// must be called with queue mutex locked
+static void
+free_drained_event_queue(void)
+{
+    if (!event_queue.enabled && event_queue.count == 0 && event_queue.events != NULL) {
+        free(event_queue.events);
+        event_queue.events = NULL;
+        event_queue.capacity = 0;
+        event_queue.has_consumer = false;
+    }
+}
+
+static PyObject*
+enable_event_queue(PyObject* self, PyObject* args)
+{
+    int capacity;
+    int policy;
+    if (!PyArg_ParseTuple(args, "ii", &capacity, &policy))
+        return NULL;
+    if (capacity <= 0)
+        return PyErr_Format(PyExc_ValueError, "Event queue capacity must be positive");
+    if (policy < OVERFLOW_BLOCK || policy > OVERFLOW_COALESCE)
+        return PyErr_Format(PyExc_ValueError, "Unknown overflow policy: %d", policy);
+    queued_event *events = malloc(capacity * sizeof(queued_event));
+    if (events == NULL)
+        return PyErr_NoMemory();
+
+    pthread_mutex_lock(&event_queue.mutex);
+    if (event_queue.enabled || event_queue.events != NULL) {
+        pthread_mutex_unlock(&event_queue.mutex);
+        free(events);
+        return PyErr_Format(PyExc_RuntimeError, "Event queue is already enabled or not yet drained");
+    }
+    event_queue.events = events;
+    event_queue.capacity = capacity;
+    event_queue.policy = policy;
+    event_queue.head = 0;
+    event_queue.count = 0;
+    event_queue.max_depth = 0;
+    event_queue.enqueued = 0;
+    event_queue.dropped = 0;
+    event_queue.coalesced = 0;
+    event_queue.enabled = true;
+    pthread_mutex_unlock(&event_queue.mutex);
+    Py_RETURN_NONE;
+}
+
+// events already in the queue can still be taken with next_events
+static void
+shutdown_event_queue(void)
+{
+    pthread_mutex_lock(&event_queue.mutex);
+    event_queue.enabled = false;
+    free_drained_event_queue();
+    pthread_cond_broadcast(&event_queue.not_empty);
+    pthread_cond_broadcast(&event_queue.not_full);
+    pthread_mutex_unlock(&event_queue.mutex);
+}
+
+static PyObject*
+disable_event_queue(PyObject* self)
+{
+    shutdown_event_queue();
+    Py_RETURN_NONE;
+}
+
+static PyObject*
+next_events(PyObject* self, PyObject* args)
+{
+    double timeout;
+    int max_count;
+    if (!PyArg_ParseTuple(args, "di", &timeout, &max_count))
+        return NULL;
+    if (max_count <= 0)
+        return PyErr_Format(PyExc_ValueError, "max_count must be positive");
+    queued_event *batch = malloc(max_count * sizeof(queued_event));
+    if (batch == NULL)
+        return PyErr_NoMemory();
+
+    int batch_size = 0;
+    bool enabled;
+    Py_BEGIN_ALLOW_THREADS
+    struct timespec deadline;
+    clock_gettime(CLOCK_REALTIME, &deadline);
+    deadline.tv_sec += (time_t)timeout;
+    deadline.tv_nsec += (long)((timeout - (time_t)timeout) * 1e9);
+    if (deadline.tv_nsec >= 1000000000L) {
+        deadline.tv_sec++;
+        deadline.tv_nsec -= 1000000000L;
+    }
+    pthread_mutex_lock(&event_queue.mutex);
+    event_queue.consumer = pthread_self();
+    event_queue.has_consumer = true;
+    while (event_queue.enabled && event_queue.count == 0) {
+        if (pthread_cond_timedwait(&event_queue.not_empty, &event_queue.mutex, &deadline) != 0)
+            break;
+    }
+    while (event_queue.count > 0 && batch_size < max_count) {
+        batch[batch_size++] = event_queue.events[event_queue.head];
+        event_queue.head = (event_queue.head + 1) % event_queue.capacity;
+        event_queue.count--;
+    }
+    enabled = event_queue.enabled;
+    free_drained_event_queue();
+    pthread_cond_broadcast(&event_queue.not_full);
+    pthread_mutex_unlock(&event_queue.mutex);
+    Py_END_ALLOW_THREADS
+
+    if (batch_size == 0 && !enabled) {
+        free(batch);
+        Py_RETURN_NONE;  // queue is disabled and drained, consumer should stop
+    }
+
+    PyObject *events_list = PyList_New(0);
+    for (int i = 0; i < batch_size; i++) {
+        indigo_property *property = batch[i].property;
+        PyObject *event = NULL;
+        if (events_list != NULL) {
+            PropertyItemsLoader *items_loader = new_items_loader(property);
+            if (items_loader != NULL) {
+                // from now on property copy is owned by the loader
+                items_loader->owns_property = true;
+                property = NULL;
+                PyObject *property_object = build_property_object(items_loader->property, items_loader);
+                if (property_object != NULL)
+                    event = Py_BuildValue("NN", action_member(batch[i].action_type), property_object);
+                Py_DECREF(items_loader);
+            }
+            if (event == NULL || PyList_Append(events_list, event) < 0)
+                Py_CLEAR(events_list);
+            Py_XDECREF(event);
+        }
+        if (property != NULL)
+            free_property_copy(property);
+    }
+    free(batch);
+    return events_list;
+}
+
+static PyObject*
+event_queue_stats(PyObject* self)
+{
+    pthread_mutex_lock(&event_queue.mutex);
+    PyObject *stats = Py_BuildValue(
+        "{s:O,s:i,s:i,s:i,s:i,s:K,s:K,s:K}",
+        "enabled", event_queue.enabled ? Py_True : Py_False,
+        "policy", event_queue.policy,
+        "capacity", event_queue.capacity,
+        "depth", event_queue.count,
+        "max_depth", event_queue.max_depth,
+        "enqueued", event_queue.enqueued,
+        "dropped", event_queue.dropped,
+        "coalesced", event_queue.coalesced
+    );
+    pthread_mutex_unlock(&event_queue.mutex);
+    return stats;
+}
+
+
+// dispatches INDIGO's property or own copy of it (freed afterwards) on the current thread
+static void
+dispatch_now(const char *action_type, indigo_property *property, bool owns_property)
+{
+    PyGILState_STATE gstate;
+    gstate = PyGILState_Ensure();
+
+    PropertyItemsLoader *items_loader = new_items_loader(property);
+    if (items_loader == NULL) {
+        PyErr_Print();
+        if (owns_property)
+            free_property_copy(property);
+        PyGILState_Release(gstate);
+        return;
+    }
+    items_loader->owns_property = owns_property;
+
+    PyObject* property_object = build_property_object(property, items_loader);
+    if (property_object != NULL) {
+        PyObject *result = NULL;
+        result = PyObject_CallFunction(dispatching_callback, "NO", action_member(action_type), property_object);
+        if (result == NULL)
+            PyErr_Print();
+        Py_XDECREF(result);
+        // if nobody holds property object, it's destroyed here together with its items
+        bool property_object_alive = Py_REFCNT(property_object) > 1;
+        Py_DECREF(property_object);
+        release_items_loader(items_loader, property_object_alive);
+    }
+    else {
+        PyErr_Print();
+    }
+    Py_DECREF(items_loader);
+
+    PyGILState_Release(gstate);
+}
+
+static void
+dispatch_property_copy(const char *action_type, indigo_property *copy)
+{
+    if (enqueue_event(action_type, copy))
+        free_property_copy(copy);  // queue holds its own copy
+    else
+        dispatch_now(action_type, copy, true);
+}
+
+
+// BLOB sinks: BLOBs of selected device properties are written to files right from INDIGO bus thread,
+// or from a background writer thread with a bounded queue, without GIL; the property is dispatched after that,
+// with items holding only file paths (see pyindigo.core.blob_sink)
 
-void set_indigo_log_level_from_verbosity(int verbosity) {
-    switch (verbosity) {
-        case 1: CURRENT_INDIGO_LOG_LEVEL = INDIGO_LOG_INFO; break;
-        case 2: CURRENT_INDIGO_LOG_LEVEL = INDIGO_LOG_DEBUG; break;
-        case 3: CURRENT_INDIGO_LOG_LEVEL = INDIGO_LOG_TRACE; break;
-        default: CURRENT_INDIGO_LOG_LEVEL = INDIGO_LOG_ERROR; break;
+#define MAX_BLOB_SINKS 32
+
+typedef struct {
+    bool used;
+    char device[INDIGO_NAME_SIZE];  // empty string matches any device
+    char property[INDIGO_NAME_SIZE];  // empty string matches any property
+    char directory[INDIGO_VALUE_SIZE];
+    char template[INDIGO_VALUE_SIZE];  // placeholders are validated on Python side
+    unsigned long sequence;  // number of the last written frame (property update)
+} blob_sink;
+
+static struct {
+    pthread_mutex_t mutex;
+    blob_sink sinks[MAX_BLOB_SINKS];
+    int count;  // read without lock as a fast check on every BLOB
+    // statistics
+    unsigned long long written;
+    unsigned long long bytes;
+    unsigned long long failed;
+} blob_sinks = {
+    .mutex = PTHREAD_MUTEX_INITIALIZER,
+};
+
+typedef struct {
+    const char *action_type;
+    indigo_property *property;  // copy with BLOB data to be written, owned by the writer
+} blob_write_job;
+
+static struct {
+    pthread_mutex_t mutex;
+    pthread_cond_t not_empty;
+    pthread_cond_t not_full;
+    bool running;
+    blob_write_job *jobs;  // ring buffer
+    int capacity;
+    int head;
+    int count;
+    int max_depth;
+    pthread_t thread;
+} blob_writer = {
+    .mutex = PTHREAD_MUTEX_INITIALIZER,
+    .not_empty = PTHREAD_COND_INITIALIZER,
+    .not_full = PTHREAD_COND_INITIALIZER,
+};
+
+// sink for specific device and property takes precedence over the one for any device or any property;
+// must be called with sinks mutex locked
+static blob_sink*
+find_blob_sink(const char *device, const char *property)
+{
+    blob_sink *best_sink = NULL;
+    int best_score = -1;
+    for (int i = 0; i < MAX_BLOB_SINKS; i++) {
+        blob_sink *sink = &blob_sinks.sinks[i];
+        if (!sink->used)
+            continue;
+        bool device_matches = !strcmp(sink->device, device), property_matches = !strcmp(sink->property, property);
+        if ((!device_matches && sink->device[0]) || (!property_matches && sink->property[0]))
+            continue;
+        int score = 2 * device_matches + property_matches;
+        if (score > best_score) {
+            best_sink = sink;
+            best_score = score;
+        }
     }
-    indigo_set_log_level(CURRENT_INDIGO_LOG_LEVEL);
+    return best_sink;
 }
 
+static bool
+append_path_part(char *path, size_t size, size_t *length, const char *part, bool sanitize)
+{
+    for (const char *c = part; *c; c++) {
+        if (*length + 1 >= size)
+            return false;
+        path[(*length)++] = sanitize && *c == '/' ? '_' : *c;
+    }
+    path[*length] = '\0';
+    return true;
+}
 
-static PyObject*
-setup_client(PyObject* self)
+// device, property and item names must not make file name hidden or refer to a parent directory
+static const char*
+escape_leading_dots(char *part, size_t size, const char *name)
 {
-    set_indigo_log_level_from_verbosity(0);
-    indigo_start();
-    indigo_attach_client(&pyindigo_client);
-    Py_RETURN_NONE;
+    snprintf(part, size, "%s", name);
+    for (char *c = part; *c == '.'; c++)
+        *c = '_';
+    return part;
 }
 
+// url with file path made from sink template, with {device}, {property}, {item}, {seq}, {timestamp}, {format};
+// returns false if it's too long or file name is "." or ".."
+static bool
+build_blob_file_url(
+    char *url, size_t size, blob_sink *sink, indigo_property *property, indigo_item *item, struct timespec *now
+)
+{
+    size_t length = 0;
+    url[0] = '\0';
+    if (
+        !append_path_part(url, size, &length, FILE_URL_PREFIX, false)
+        || !append_path_part(url, size, &length, sink->directory, false)
+        || !append_path_part(url, size, &length, "/", false)
+    )
+        return false;
+    const char *file_name = url + length;
+    char part[INDIGO_VALUE_SIZE];
+    for (const char *t = sink->template; *t; t++) {
+        const char *end = *t == '{' ? strchr(t, '}') : NULL;
+        if (end == NULL) {
+            char c[2] = {*t, '\0'};
+            if (!append_path_part(url, size, &length, c, false))
+                return false;
+            continue;
+        }
+        size_t key_length = end - t - 1;
+        const char *key = t + 1;
+        const char *value = part;
+        part[0] = '\0';
+        if (!strncmp(key, "device", key_length))
+            escape_leading_dots(part, sizeof(part), property->device);
+        else if (!strncmp(key, "property", key_length))
+            escape_leading_dots(part, sizeof(part), property->name);
+        else if (!strncmp(key, "item", key_length))
+            escape_leading_dots(part, sizeof(part), item->name);
+        else if (!strncmp(key, "format", key_length))
+            value = item->blob.format;
+        else if (!strncmp(key, "seq", key_length))
+            snprintf(part, sizeof(part), "%05lu", sink->sequence);
+        else if (!strncmp(key, "timestamp", key_length)) {
+            struct tm utc;
+            gmtime_r(&now->tv_sec, &utc);
+            size_t n = strftime(part, sizeof(part), "%Y%m%dT%H%M%S", &utc);
+            snprintf(part + n, sizeof(part) - n, ".%03ld", now->tv_nsec / 1000000);
+        }
+        if (!append_path_part(url, size, &length, value, true))
+            return false;
+        t = end;
+    }
+    return strcmp(file_name, ".") && strcmp(file_name, "..");
+}
 
-static PyObject*
-cleanup_client(PyObject* self)
+// writes BLOB data of source items to files from copy's urls, unsuccessfully written items get no url
+static void
+write_blob_files(indigo_property *copy, indigo_property *source)
 {
-	indigo_detach_client(&pyindigo_client);
-	indigo_stop();
-    Py_RETURN_NONE;
+    for (int i = 0; i < copy->count; i++) {
+        indigo_item *item = &copy->items[i];
+        void *data = source->items[i].blob.value;
+        if (strncmp(item->blob.url, FILE_URL_PREFIX, FILE_URL_PREFIX_LENGTH))
+            continue;
+        // data may be missing from the copy if it was dropped by frame pool
+        FILE *file = data != NULL ? fopen(item->blob.url + FILE_URL_PREFIX_LENGTH, "wb") : NULL;
+        bool written = file != NULL && fwrite(data, 1, item->blob.size, file) == (size_t)item->blob.size;
+        if (file != NULL && fclose(file) != 0)
+            written = false;
+        if (!written)
+            item->blob.url[0] = '\0';
+        pthread_mutex_lock(&blob_sinks.mutex);
+        if (written) {
+            blob_sinks.written++;
+            blob_sinks.bytes += item->blob.size;
+        }
+        else {
+            blob_sinks.failed++;
+        }
+        pthread_mutex_unlock(&blob_sinks.mutex);
+    }
+    if (copy == source) {
+        for (int i = 0; i < copy->count; i++) {
+            free_blob_data(copy->items[i].blob.value);
+            copy->items[i].blob.value = NULL;
+        }
+    }
 }
 
+static void*
+blob_writer_loop(void *arg)
+{
+    while (true) {
+        pthread_mutex_lock(&blob_writer.mutex);
+        while (blob_writer.running && blob_writer.count == 0)
+            pthread_cond_wait(&blob_writer.not_empty, &blob_writer.mutex);
+        if (blob_writer.count == 0) {  // stopped and drained
+            pthread_mutex_unlock(&blob_writer.mutex);
+            return NULL;
+        }
+        blob_write_job job = blob_writer.jobs[blob_writer.head];
+        blob_writer.head = (blob_writer.head + 1) % blob_writer.capacity;
+        blob_writer.count--;
+        pthread_cond_signal(&blob_writer.not_full);
+        pthread_mutex_unlock(&blob_writer.mutex);
 
-static PyObject*
-set_log_level(PyObject* self, PyObject* args)
+        write_blob_files(job.property, job.property);
+        dispatch_property_copy(job.action_type, job.property);
+    }
+}
+
+// returns false if writer is not running and copy must be written right away
+static bool
+push_blob_write_job(const char *action_type, indigo_property *copy)
 {
-    int verbosity = 0;
-    if (!PyArg_ParseTuple(args, "i", &verbosity))
-        return NULL;
-    set_indigo_log_level_from_verbosity(verbosity);
-    Py_RETURN_NONE;
+    pthread_mutex_lock(&blob_writer.mutex);
+    // writer falls behind = INDIGO bus waits, frames are never dropped
+    while (blob_writer.running && blob_writer.count == blob_writer.capacity)
+        pthread_cond_wait(&blob_writer.not_full, &blob_writer.mutex);
+    if (!blob_writer.running) {
+        pthread_mutex_unlock(&blob_writer.mutex);
+        return false;
+    }
+    blob_write_job *job = &blob_writer.jobs[(blob_writer.head + blob_writer.count) % blob_writer.capacity];
+    job->action_type = action_type;
+    job->property = copy;
+    blob_writer.count++;
+    if (blob_writer.count > blob_writer.max_depth)
+        blob_writer.max_depth = blob_writer.count;
+    pthread_cond_signal(&blob_writer.not_empty);
+    pthread_mutex_unlock(&blob_writer.mutex);
+    return true;
 }
 
+// returns false if property is not sunk and must be dispatched as usual
+static bool
+sink_blobs(const char *action_type, indigo_property *property)
+{
+    if (blob_sinks.count == 0 || property->type != INDIGO_BLOB_VECTOR || strcmp(action_type, "update"))
+        return false;
+    bool has_data = false;
+    for (int i = 0; i < property->count; i++)
+        has_data |= property->items[i].blob.value != NULL && property->items[i].blob.size > 0;
+    if (!has_data)
+        return false;
 
-// Indigo properties modelled with Python classes
-// see pyindigo.properties.properties.py for definitions
+    pthread_mutex_lock(&blob_writer.mutex);
+    bool background = blob_writer.running;
+    pthread_mutex_unlock(&blob_writer.mutex);
 
-static PyObject *TextVectorPropertyClass = NULL;
-static PyObject *NumberVectorPropertyClass = NULL;
-static PyObject *SwitchVectorPropertyClass = NULL;
-static PyObject *LightVectorPropertyClass = NULL;
-static PyObject *BlobVectorPropertyClass = NULL;
+    pthread_mutex_lock(&blob_sinks.mutex);
+    blob_sink *sink = find_blob_sink(property->device, property->name);
+    if (sink == NULL) {
+        pthread_mutex_unlock(&blob_sinks.mutex);
+        return false;
+    }
+    indigo_property *copy = background ? copy_property(property) : copy_property_metadata(property);
+    if (copy == NULL) {
+        blob_sinks.failed++;
+        pthread_mutex_unlock(&blob_sinks.mutex);
+        return false;
+    }
+    sink->sequence++;
+    struct timespec now;
+    clock_gettime(CLOCK_REALTIME, &now);
+    for (int i = 0; i < copy->count; i++) {
+        indigo_item *item = &copy->items[i];
+        bool has_url = property->items[i].blob.value != NULL && property->items[i].blob.size > 0
+            && build_blob_file_url(item->blob.url, sizeof(item->blob.url), sink, property, item, &now);
+        if (!has_url)
+            item->blob.url[0] = '\0';
+    }
+    pthread_mutex_unlock(&blob_sinks.mutex);
+
+    if (background && push_blob_write_job(action_type, copy))
+        return true;
+    write_blob_files(copy, background ? copy : property);
+    dispatch_property_copy(action_type, copy);
+    return true;
+}
 
 static PyObject*
-set_property_classes(PyObject* self, PyObject* args)
+add_blob_sink(PyObject* self, PyObject* args)
 {
+    const char *device, *property, *directory, *template;
+    if (!PyArg_ParseTuple(args, "ssss", &device, &property, &directory, &template))
+        return NULL;
     if (
-        !PyArg_ParseTuple(
-            args, "OOOOO",
-            &TextVectorPropertyClass,
-            &NumberVectorPropertyClass,
-            &SwitchVectorPropertyClass, 
-            &LightVectorPropertyClass,
-            &BlobVectorPropertyClass
-        )
+        strlen(device) >= INDIGO_NAME_SIZE || strlen(property) >= INDIGO_NAME_SIZE
+        || strlen(directory) >= INDIGO_VALUE_SIZE || strlen(template) >= INDIGO_VALUE_SIZE
     )
+        return PyErr_Format(PyExc_ValueError, "BLOB sink parameters are too long");
+    pthread_mutex_lock(&blob_sinks.mutex);
+    blob_sink *sink = NULL;
+    for (int i = 0; i < MAX_BLOB_SINKS && sink == NULL; i++) {
+        blob_sink *candidate = &blob_sinks.sinks[i];
+        if (candidate->used && !strcmp(candidate->device, device) && !strcmp(candidate->property, property))
+            sink = candidate;  // replaced, keeping the sequence
+    }
+    for (int i = 0; i < MAX_BLOB_SINKS && sink == NULL; i++) {
+        if (!blob_sinks.sinks[i].used) {
+            sink = &blob_sinks.sinks[i];
+            sink->sequence = 0;
+            blob_sinks.count++;
+        }
+    }
+    if (sink == NULL) {
+        pthread_mutex_unlock(&blob_sinks.mutex);
+        return PyErr_Format(PyExc_ValueError, "Too many BLOB sinks (max %d)", MAX_BLOB_SINKS);
+    }
+    sink->used = true;
+    strcpy(sink->device, device);
+    strcpy(sink->property, property);
+    strcpy(sink->directory, directory);
+    strcpy(sink->template, template);
+    pthread_mutex_unlock(&blob_sinks.mutex);
+    Py_RETURN_NONE;
+}
+
+static PyObject*
+remove_blob_sink(PyObject* self, PyObject* args)
+{
+    const char *device, *property;
+    if (!PyArg_ParseTuple(args, "ss", &device, &property))
+        return NULL;
+    bool removed = false;
+    pthread_mutex_lock(&blob_sinks.mutex);
+    for (int i = 0; i < MAX_BLOB_SINKS; i++) {
+        blob_sink *sink = &blob_sinks.sinks[i];
+        if (sink->used && !strcmp(sink->device, device) && !strcmp(sink->property, property)) {
+            sink->used = false;
+            blob_sinks.count--;
+            removed = true;
+        }
+    }
+    pthread_mutex_unlock(&blob_sinks.mutex);
+    return PyBool_FromLong(removed);
+}
+
+static PyObject*
+start_blob_writer(PyObject* self, PyObject* args)
+{
+    int capacity;
+    if (!PyArg_ParseTuple(args, "i", &capacity))
         return NULL;
+    if (capacity <= 0)
+        return PyErr_Format(PyExc_ValueError, "BLOB writer queue capacity must be positive");
+    blob_write_job *jobs = malloc(capacity * sizeof(blob_write_job));
+    if (jobs == NULL)
+        return PyErr_NoMemory();
+    pthread_mutex_lock(&blob_writer.mutex);
+    if (blob_writer.running || blob_writer.jobs != NULL) {
+        pthread_mutex_unlock(&blob_writer.mutex);
+        free(jobs);
+        return PyErr_Format(PyExc_RuntimeError, "BLOB writer is already running");
+    }
+    blob_writer.jobs = jobs;
+    blob_writer.capacity = capacity;
+    blob_writer.head = 0;
+    blob_writer.count = 0;
+    blob_writer.max_depth = 0;
+    blob_writer.running = true;
+    if (pthread_create(&blob_writer.thread, NULL, blob_writer_loop, NULL) != 0) {
+        blob_writer.running = false;
+        blob_writer.jobs = NULL;
+        pthread_mutex_unlock(&blob_writer.mutex);
+        free(jobs);
+        return PyErr_Format(PyExc_RuntimeError, "Unable to start BLOB writer thread");
+    }
+    pthread_mutex_unlock(&blob_writer.mutex);
     Py_RETURN_NONE;
 }
 
+// queued BLOBs are still written and dispatched, GIL must be released while waiting for that
+static void
+shutdown_blob_writer(void)
+{
+    pthread_mutex_lock(&blob_writer.mutex);
+    bool running = blob_writer.running;
+    blob_writer.running = false;
+    pthread_cond_broadcast(&blob_writer.not_empty);
+    pthread_cond_broadcast(&blob_writer.not_full);
+    pthread_mutex_unlock(&blob_writer.mutex);
+    if (!running)
+        return;
+    pthread_join(blob_writer.thread, NULL);
+    pthread_mutex_lock(&blob_writer.mutex);
+    free(blob_writer.jobs);
+    blob_writer.jobs = NULL;
+    blob_writer.capacity = 0;
+    pthread_mutex_unlock(&blob_writer.mutex);
+}
 
-// dispatching callback is a single Python callable representing all possible INDIGO actions
-// all dispatching should be done on Python side
+static PyObject*
+stop_blob_writer(PyObject* self)
+{
+    Py_BEGIN_ALLOW_THREADS
+    shutdown_blob_writer();
+    Py_END_ALLOW_THREADS
+    Py_RETURN_NONE;
+}
+
+static PyObject*
+blob_sink_stats(PyObject* self)
+{
+    pthread_mutex_lock(&blob_writer.mutex);
+    bool running = blob_writer.running;
+    int capacity = blob_writer.capacity, depth = blob_writer.count, max_depth = blob_writer.max_depth;
+    pthread_mutex_unlock(&blob_writer.mutex);
+    pthread_mutex_lock(&blob_sinks.mutex);
+    PyObject *stats = Py_BuildValue(
+        "{s:i,s:K,s:K,s:K,s:O,s:i,s:i,s:i}",
+        "sinks", blob_sinks.count,
+        "written", blob_sinks.written,
+        "bytes", blob_sinks.bytes,
+        "failed", blob_sinks.failed,
+        "writer_running", running ? Py_True : Py_False,
+        "writer_capacity", capacity,
+        "writer_depth", depth,
+        "writer_max_depth", max_depth
+    );
+    pthread_mutex_unlock(&blob_sinks.mutex);
+    return stats;
+}
+
+static void
+clear_blob_sinks(void)
+{
+    pthread_mutex_lock(&blob_sinks.mutex);
+    for (int i = 0; i < MAX_BLOB_SINKS; i++)
+        blob_sinks.sinks[i].used = false;
+    blob_sinks.count = 0;
+    pthread_mutex_unlock(&blob_sinks.mutex);
+}
 
-static PyObject *dispatching_callback = NULL;
 
 void call_dispatching_callback(const char* action_type, indigo_device *device, indigo_property* property, const char *message)
 {
     assert(dispatching_callback != NULL);
     assert(property != NULL);
 
-    PyGILState_STATE gstate;
-    gstate = PyGILState_Ensure();
+    if (get_property_class(property) == NULL)
+        return;
 
-    PyObject* PropertyClass = NULL;
-    switch (property->type) {
-        case INDIGO_TEXT_VECTOR: PropertyClass = TextVectorPropertyClass; break;
-        case INDIGO_NUMBER_VECTOR: PropertyClass = NumberVectorPropertyClass; break;
-        case INDIGO_SWITCH_VECTOR: PropertyClass = SwitchVectorPropertyClass; break;
-        case INDIGO_LIGHT_VECTOR: PropertyClass = LightVectorPropertyClass; break;
-        case INDIGO_BLOB_VECTOR: PropertyClass = BlobVectorPropertyClass; break;
-        default : {}
-	}
-    PyObject* property_object = PyObject_CallFunction(
-        PropertyClass,
-        "ssii",
-        property->device, indigo_property_name(INDIGO_VERSION_CURRENT, property), property->state, property->perm
-    );
+    if (sink_blobs(action_type, property))
+        return;
 
-    switch (property->type) {
-        case INDIGO_TEXT_VECTOR:
-            for (int i = 0; i < property->count; i++) {
-                indigo_item *item = &property->items[i];
-                PyObject_CallMethod(
-                    property_object, "add_item", "ss",
-                    indigo_item_name(INDIGO_VERSION_CURRENT, property, item),
-                    item->text.value
-                );
-            }
-            break;
-        case INDIGO_NUMBER_VECTOR:
-            for (int i = 0; i < property->count; i++) {
-                indigo_item *item = &property->items[i];
-                PyObject_CallMethod(
-                    property_object, "add_item", "sdsdddd",
-                    indigo_item_name(INDIGO_VERSION_CURRENT, property, item),
-                    item->number.value,
-                    item->number.format,
-                    item->number.min,
-                    item->number.max,
-                    item->number.step,
-                    item->number.target
-                );
-            }
-            break;
-        case INDIGO_SWITCH_VECTOR:
-            PyObject_CallMethod(property_object, "add_rule", "i", property->rule);
-            for (int i = 0; i < property->count; i++) {
-                indigo_item *item = &property->items[i];
-                PyObject_CallMethod(
-                    property_object, "add_item", "si",
-                    indigo_item_name(INDIGO_VERSION_CURRENT, property, item),
-                    item->sw.value
-                );
-            }
-            break;
-        case INDIGO_LIGHT_VECTOR:
-            for (int i = 0; i < property->count; i++) {
-                indigo_item *item = &property->items[i];
-                PyObject_CallMethod(
-                    property_object, "add_item", "si",
-                    indigo_item_name(INDIGO_VERSION_CURRENT, property, item),
-                    item->light.value
-                );
-            }
-            break;
-        case INDIGO_BLOB_VECTOR:
-            for (int i = 0; i < property->count; i++) {
-                indigo_item *item = &property->items[i];
-                PyObject_CallMethod(
-                    property_object, "add_item", "sy#s",
-                    indigo_item_name(INDIGO_VERSION_CURRENT, property, item),
-                    item->blob.value, (Py_ssize_t)item->blob.size, item->blob.format
-                );
-            }
-            break;
-        default : {}
-	}
+    if (enqueue_event(action_type, property))
+        return;
 
-    if (property_object != NULL) {
-        PyObject *result = NULL;
-        result = PyObject_CallFunction(dispatching_callback, "sO", action_type, property_object);
-        Py_XDECREF(result);
-    }
-    
-    PyGILState_Release(gstate);
+    dispatch_now(action_type, property, false);
 }
 
 static PyObject*
@@ -214,111 +1873,391 @@ set_dispatching_callback(PyObject* self, PyObject* args) {
 
 static PyObject*
 attach_driver(PyObject* self, PyObject* args) {
-    // TODO: check for how to correctly name this variable :)
     char* driver_lib_name;
     if (!PyArg_ParseTuple(args, "s:driver_lib_name", &driver_lib_name))
         return NULL;
-    if (indigo_load_driver(driver_lib_name, true, &driver) != INDIGO_OK)
+    attached_driver *slot = NULL;
+    for (int i = 0; i < INDIGO_MAX_DRIVERS; i++) {
+        if (attached_drivers[i].handle == 0) {
+            slot = &attached_drivers[i];
+            break;
+        }
+        if (!strcmp(attached_drivers[i].entry->name, driver_lib_name))
+            return PyErr_Format(PyExc_ValueError, "Driver \"%s\" is already attached", driver_lib_name);
+    }
+    if (slot == NULL)
+        return PyErr_Format(PyExc_RuntimeError, "Too many drivers attached (max %d)", INDIGO_MAX_DRIVERS);
+    indigo_driver_entry *entry = NULL;
+    if (indigo_load_driver(driver_lib_name, true, &entry) != INDIGO_OK || entry == NULL)
         return PyErr_Format(PyExc_ValueError, "Unable to load requested driver: \"%s\"", driver_lib_name);
-    Py_RETURN_NONE;
+    slot->handle = ++last_driver_handle;
+    slot->entry = entry;
+    return PyLong_FromLong(slot->handle);
+}
+
+
+static PyObject*
+detach_driver(PyObject* self, PyObject* args)
+{
+    long handle;
+    if (!PyArg_ParseTuple(args, "l:handle", &handle))
+        return NULL;
+    for (int i = 0; i < INDIGO_MAX_DRIVERS; i++) {
+        if (handle > 0 && attached_drivers[i].handle == handle) {
+            indigo_driver_entry *entry = attached_drivers[i].entry;
+            // compacting registry to keep attached drivers in the beginning of the array
+            int last = i;
+            while (last + 1 < INDIGO_MAX_DRIVERS && attached_drivers[last + 1].handle != 0)
+                last++;
+            attached_drivers[i] = attached_drivers[last];
+            attached_drivers[last].handle = 0;
+            attached_drivers[last].entry = NULL;
+            indigo_remove_driver(entry);
+            Py_RETURN_NONE;
+        }
+        if (attached_drivers[i].handle == 0)
+            break;
+    }
+    return PyErr_Format(PyExc_ValueError, "No driver attached with handle %ld", handle);
+}
+
+
+static PyObject*
+attached_driver_handles(PyObject* self)
+{
+    PyObject* handles = PyDict_New();
+    if (handles == NULL)
+        return NULL;
+    for (int i = 0; i < INDIGO_MAX_DRIVERS && attached_drivers[i].handle != 0; i++) {
+        PyObject* handle = PyLong_FromLong(attached_drivers[i].handle);
+        if (handle == NULL || PyDict_SetItemString(handles, attached_drivers[i].entry->name, handle) < 0) {
+            Py_XDECREF(handle);
+            Py_DECREF(handles);
+            return NULL;
+        }
+        Py_DECREF(handle);
+    }
+    return handles;
+}
+
+
+// server-level functions — remote drivers are available through INDIGO network client
+
+
+static PyObject*
+connect_server(PyObject* self, PyObject* args)
+{
+    char* name;
+    char* host;
+    int port;
+    if (!PyArg_ParseTuple(args, "ssi:connect_server", &name, &host, &port))
+        return NULL;
+    connected_server *slot = NULL;
+    for (int i = 0; i < INDIGO_MAX_SERVERS; i++) {
+        if (connected_servers[i].handle == 0) {
+            slot = &connected_servers[i];
+            break;
+        }
+    }
+    if (slot == NULL)
+        return PyErr_Format(PyExc_RuntimeError, "Too many servers connected (max %d)", INDIGO_MAX_SERVERS);
+    // connection itself is established in background by INDIGO server thread
+    indigo_server_entry *entry = NULL;
+    if (indigo_connect_server(name, host, port, &entry) != INDIGO_OK || entry == NULL)
+        return PyErr_Format(PyExc_ValueError, "Unable to connect to server %s:%d (is it already connected?)", host, port);
+    slot->handle = ++last_server_handle;
+    slot->entry = entry;
+    return PyLong_FromLong(slot->handle);
+}
+
+
+static int
+find_server(long handle)
+{
+    for (int i = 0; i < INDIGO_MAX_SERVERS && connected_servers[i].handle != 0; i++) {
+        if (handle > 0 && connected_servers[i].handle == handle)
+            return i;
+    }
+    PyErr_Format(PyExc_ValueError, "No server connected with handle %ld", handle);
+    return -1;
 }
 
 
 static PyObject*
-detach_driver(PyObject* self)
+disconnect_server(PyObject* self, PyObject* args)
 {
-    indigo_remove_driver(driver);
+    long handle;
+    if (!PyArg_ParseTuple(args, "l:handle", &handle))
+        return NULL;
+    int i = find_server(handle);
+    if (i < 0)
+        return NULL;
+    indigo_server_entry *entry = connected_servers[i].entry;
+    int last = i;
+    while (last + 1 < INDIGO_MAX_SERVERS && connected_servers[last + 1].handle != 0)
+        last++;
+    connected_servers[i] = connected_servers[last];
+    connected_servers[last].handle = 0;
+    connected_servers[last].entry = NULL;
+    // INDIGO waits for server thread to finish, and it may be dispatching properties meanwhile
+    Py_BEGIN_ALLOW_THREADS
+    indigo_disconnect_server(entry);
+    Py_END_ALLOW_THREADS
     Py_RETURN_NONE;
 }
 
 
-// device-level functions
+static PyObject*
+server_connection_status(PyObject* self, PyObject* args)
+{
+    long handle;
+    if (!PyArg_ParseTuple(args, "l:handle", &handle))
+        return NULL;
+    int i = find_server(handle);
+    if (i < 0)
+        return NULL;
+    char last_error[256] = "";
+    bool connected = indigo_connection_status(connected_servers[i].entry, last_error);
+    return Py_BuildValue("Ns", PyBool_FromLong(connected), last_error);
+}
 
 
 static PyObject*
-set_property(PyObject* self, PyObject* args)
+connected_server_handles(PyObject* self)
 {
-    char* device_name;
-    char* property_name;
-    PyObject* property_class;  // must be one of the classes set with set_property_classes
-    PyObject* item_names_list;
-    Py_ssize_t item_names_list_length;
-    PyObject* item_values_list;
-    Py_ssize_t item_values_list_length;
-    if (!PyArg_ParseTuple(
-            args, "ssOOO",
-            &device_name, &property_name, &property_class, &item_names_list, &item_values_list
-    )) {
+    PyObject* handles = PyDict_New();
+    if (handles == NULL)
         return NULL;
+    for (int i = 0; i < INDIGO_MAX_SERVERS && connected_servers[i].handle != 0; i++) {
+        PyObject* handle = PyLong_FromLong(connected_servers[i].handle);
+        if (handle == NULL || PyDict_SetItemString(handles, connected_servers[i].entry->name, handle) < 0) {
+            Py_XDECREF(handle);
+            Py_DECREF(handles);
+            return NULL;
+        }
+        Py_DECREF(handle);
+    }
+    return handles;
+}
+
+
+// device-level functions
+
+
+// property change converted from Python objects beforehand, as INDIGO functions are called with GIL released;
+// names and values are stored in the change itself
+
+typedef struct {
+    char device[INDIGO_NAME_SIZE];
+    char name[INDIGO_NAME_SIZE];
+    indigo_property_type type;
+    int count;
+    char item_names[INDIGO_MAX_ITEMS][INDIGO_NAME_SIZE];
+    char *items[INDIGO_MAX_ITEMS];
+    char *text_values[INDIGO_MAX_ITEMS];  // allocated, NULL for other types
+    double number_values[INDIGO_MAX_ITEMS];
+    bool switch_values[INDIGO_MAX_ITEMS];
+} property_change;
+
+static void
+free_property_change_values(property_change *change)
+{
+    for (int i = 0; i < INDIGO_MAX_ITEMS; i++) {
+        free(change->text_values[i]);
+        change->text_values[i] = NULL;
+    }
+}
+
+// change must be zero-initialized; returns false with exception set, allocated values must be freed anyway
+static bool
+parse_property_change(
+    property_change *change, const char *device_name, const char *property_name, PyObject *property_class,
+    PyObject *item_names_list, PyObject *item_values_list
+)
+{
+    if (strlen(device_name) >= INDIGO_NAME_SIZE || strlen(property_name) >= INDIGO_NAME_SIZE) {
+        PyErr_Format(PyExc_ValueError, "Device or property name is too long!");
+        return false;
     }
+    strcpy(change->device, device_name);
+    strcpy(change->name, property_name);
 
     // parse item names from Python list
-    static char *items[INDIGO_MAX_ITEMS];
-    PyObject* item_name;
-    item_names_list_length = PyList_Size(item_names_list);
+    Py_ssize_t item_names_list_length = PyList_Size(item_names_list);
+    if (item_names_list_length < 0)
+        return false;
+    if (item_names_list_length > INDIGO_MAX_ITEMS) {
+        PyErr_Format(PyExc_ValueError, "Property can't have more than %d items!", INDIGO_MAX_ITEMS);
+        return false;
+    }
     for (int i=0; i<item_names_list_length; i++) {
-        item_name = PyList_GetItem(item_names_list, i);
+        PyObject* item_name = PyList_GetItem(item_names_list, i);
         if(!PyUnicode_Check(item_name)) {
-            return PyErr_Format(PyExc_TypeError, "All item names in item_names_list must be Unicode objects!");
+            PyErr_Format(PyExc_TypeError, "All item names in item_names_list must be Unicode objects!");
+            return false;
         }
-        items[i] = (char *)malloc(INDIGO_NAME_SIZE);
-        strncpy(items[i], PyUnicode_AsUTF8(item_name), INDIGO_NAME_SIZE);
+        change->items[i] = change->item_names[i];
+        strncpy(change->items[i], PyUnicode_AsUTF8(item_name), INDIGO_NAME_SIZE);
+        change->items[i][INDIGO_NAME_SIZE-1] = 0;
     }
 
-    item_values_list_length = PyList_Size(item_names_list);
+    Py_ssize_t item_values_list_length = PyList_Size(item_values_list);
+    if (item_values_list_length < 0)
+        return false;
     if (item_names_list_length != item_values_list_length) {
-        return PyErr_Format(PyExc_ValueError, "Item name and item value lists must be of the same size!");
+        PyErr_Format(PyExc_ValueError, "Item name and item value lists must be of the same size!");
+        return false;
     }
+    change->count = item_values_list_length;
     // emulating switch (property->type) { case INDIGO_TEXT_VECTOR: ... }
     if (property_class == TextVectorPropertyClass) {
-        char *txt_values[INDIGO_MAX_ITEMS];
-        PyObject* txt_item;
+        change->type = INDIGO_TEXT_VECTOR;
         for (int i = 0; i < item_values_list_length; i++) {
-            txt_item = PyList_GetItem(item_values_list, i);
+            PyObject* txt_item = PyList_GetItem(item_values_list, i);
             if(!PyUnicode_Check(txt_item)) {
-                return PyErr_Format(PyExc_TypeError, "All item values for text vector property must be Unicode objects!");
+                PyErr_Format(PyExc_TypeError, "All item values for text vector property must be Unicode objects!");
+                return false;
             }
-            txt_values[i] = (char *)malloc(INDIGO_VALUE_SIZE);
-            strncpy(txt_values[i], PyUnicode_AsUTF8(txt_item), INDIGO_VALUE_SIZE);
-            txt_values[i][INDIGO_VALUE_SIZE-1] = 0;
-        }
-
-        indigo_change_text_property(&pyindigo_client, device_name, property_name, item_values_list_length, (const char **)items, (const char **)txt_values);
-
-        for (int i = 0; i < item_values_list_length; i++) {
-            free(txt_values[i]);
+            if ((change->text_values[i] = (char *)malloc(INDIGO_VALUE_SIZE)) == NULL) {
+                PyErr_NoMemory();
+                return false;
+            }
+            strncpy(change->text_values[i], PyUnicode_AsUTF8(txt_item), INDIGO_VALUE_SIZE);
+            change->text_values[i][INDIGO_VALUE_SIZE-1] = 0;
         }
     }
     else if (property_class == NumberVectorPropertyClass) {
-        double dbl_values[INDIGO_MAX_ITEMS];
-        PyObject* float_item;
+        change->type = INDIGO_NUMBER_VECTOR;
         for (int i = 0; i < item_values_list_length; i++) {
-            float_item = PyList_GetItem(item_values_list, i);
+            PyObject* float_item = PyList_GetItem(item_values_list, i);
             if(!PyFloat_Check(float_item)) {
-                return PyErr_Format(PyExc_TypeError, "All item values for number vector property must be float objects!");
+                PyErr_Format(PyExc_TypeError, "All item values for number vector property must be float objects!");
+                return false;
             }
-            dbl_values[i] = PyFloat_AsDouble(float_item);
+            change->number_values[i] = PyFloat_AsDouble(float_item);
         }
-
-        indigo_change_number_property(&pyindigo_client, device_name, property_name, item_values_list_length, (const char **)items, (const double *)dbl_values);
     }
     else if (property_class == SwitchVectorPropertyClass) {
-        bool bool_values[INDIGO_MAX_ITEMS];
-        PyObject* switch_item;
+        change->type = INDIGO_SWITCH_VECTOR;
         for (int i = 0; i < item_values_list_length; i++) {
-            switch_item = PyList_GetItem(item_values_list, i);
+            PyObject* switch_item = PyList_GetItem(item_values_list, i);
             if(!PyBool_Check(switch_item)) {
-                return PyErr_Format(PyExc_TypeError, "All item values for number vector property must be float objects!");
+                PyErr_Format(PyExc_TypeError, "All item values for switch vector property must be bool objects!");
+                return false;
             }
-            if (PyObject_IsTrue(switch_item)) bool_values[i] = true;
-            else bool_values[i] = false;
+            change->switch_values[i] = switch_item == Py_True;
         }
-
-        indigo_change_switch_property(&pyindigo_client, device_name, property_name, item_values_list_length, (const char **)items, (const bool *)bool_values);
     }
     else {
-        return PyErr_Format(PyExc_TypeError, "Unknow propety class!");
+        PyErr_Format(PyExc_TypeError, "Unknow propety class!");
+        return false;
+    }
+    return true;
+}
+
+// must be called with GIL released
+static void
+send_property_change(property_change *change)
+{
+    const char **items = (const char **)change->items;
+    switch (change->type) {
+        case INDIGO_TEXT_VECTOR:
+            indigo_change_text_property(
+                &pyindigo_client, change->device, change->name, change->count, items,
+                (const char **)change->text_values
+            );
+            break;
+        case INDIGO_NUMBER_VECTOR:
+            indigo_change_number_property(
+                &pyindigo_client, change->device, change->name, change->count, items, change->number_values
+            );
+            break;
+        case INDIGO_SWITCH_VECTOR:
+            indigo_change_switch_property(
+                &pyindigo_client, change->device, change->name, change->count, items, change->switch_values
+            );
+            break;
+        default:
+            break;
+    }
+}
+
+static PyObject*
+set_property(PyObject* self, PyObject* args)
+{
+    char* device_name;
+    char* property_name;
+    PyObject* property_class;  // must be one of the classes set with set_property_classes
+    PyObject* item_names_list;
+    PyObject* item_values_list;
+    if (!PyArg_ParseTuple(
+            args, "ssOOO",
+            &device_name, &property_name, &property_class, &item_names_list, &item_values_list
+    )) {
+        return NULL;
+    }
+
+    property_change *change = calloc(1, sizeof(property_change));
+    if (change == NULL)
+        return PyErr_NoMemory();
+    bool parsed = parse_property_change(
+        change, device_name, property_name, property_class, item_names_list, item_values_list
+    );
+    if (parsed) {
+        Py_BEGIN_ALLOW_THREADS
+        send_property_change(change);
+        Py_END_ALLOW_THREADS
+    }
+    free_property_change_values(change);
+    free(change);
+    if (!parsed)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+// all changes are converted first, so that nothing is sent if any of them is invalid,
+// and then sent to INDIGO one by one with GIL released once
+static PyObject*
+set_properties(PyObject* self, PyObject* args)
+{
+    PyObject *changes_sequence;
+    if (!PyArg_ParseTuple(args, "O", &changes_sequence))
+        return NULL;
+    PyObject *changes_list = PySequence_Fast(changes_sequence, "Property changes must be a sequence!");
+    if (changes_list == NULL)
+        return NULL;
+    Py_ssize_t changes_count = PySequence_Fast_GET_SIZE(changes_list);
+    property_change *changes = calloc(changes_count > 0 ? changes_count : 1, sizeof(property_change));
+    if (changes == NULL) {
+        Py_DECREF(changes_list);
+        return PyErr_NoMemory();
+    }
+    bool parsed = true;
+    for (Py_ssize_t i = 0; i < changes_count && parsed; i++) {
+        char* device_name;
+        char* property_name;
+        PyObject* property_class;
+        PyObject* item_names_list;
+        PyObject* item_values_list;
+        parsed = PyArg_ParseTuple(
+            PySequence_Fast_GET_ITEM(changes_list, i), "ssOOO",
+            &device_name, &property_name, &property_class, &item_names_list, &item_values_list
+        ) && parse_property_change(
+            &changes[i], device_name, property_name, property_class, item_names_list, item_values_list
+        );
     }
+    if (parsed) {
+        Py_BEGIN_ALLOW_THREADS
+        for (Py_ssize_t i = 0; i < changes_count; i++)
+            send_property_change(&changes[i]);
+        Py_END_ALLOW_THREADS
+    }
+    for (Py_ssize_t i = 0; i < changes_count; i++)
+        free_property_change_values(&changes[i]);
+    free(changes);
+    Py_DECREF(changes_list);
+    if (!parsed)
+        return NULL;
     Py_RETURN_NONE;
 }
 
@@ -341,12 +2280,35 @@ static PyMethodDef methods[] = {
     {"cleanup_client", (PyCFunction)cleanup_client, METH_NOARGS, "detach client and stop INDIGO bus thread"},
     {"set_log_level", (PyCFunction)set_log_level, METH_VARARGS, "accepts verbosity as int number (0-3)"},
     {"set_property_classes", (PyCFunction)set_property_classes, METH_VARARGS, "set Python classes modelling Indigo properties"},
-    // driver-level fuctions (may be used to communicate to several drivers in the future)
-    {"attach_driver", (PyCFunction)attach_driver, METH_VARARGS, "request driver attachment from INDIGO bus"},
-    {"detach_driver", (PyCFunction)detach_driver, METH_NOARGS, "request driver detachment from INDIGO bus"},
+    {"set_enum_classes", (PyCFunction)set_enum_classes, METH_VARARGS, "set Python enums for property state, perm, switch rule and driver action"},
+    // driver-level fuctions
+    {"attach_driver", (PyCFunction)attach_driver, METH_VARARGS, "request driver attachment from INDIGO bus, returns driver handle"},
+    {"detach_driver", (PyCFunction)detach_driver, METH_VARARGS, "request detachment of driver with given handle from INDIGO bus"},
+    {"attached_driver_handles", (PyCFunction)attached_driver_handles, METH_NOARGS, "dict of attached driver names to their handles"},
+    // server-level functions
+    {"connect_server", (PyCFunction)connect_server, METH_VARARGS, "connect to remote INDIGO server by name, host and port, returns server handle"},
+    {"disconnect_server", (PyCFunction)disconnect_server, METH_VARARGS, "disconnect from server with given handle"},
+    {"server_connection_status", (PyCFunction)server_connection_status, METH_VARARGS, "(connected, last error) for server with given handle"},
+    {"connected_server_handles", (PyCFunction)connected_server_handles, METH_NOARGS, "dict of connected server names to their handles"},
     {"set_dispatching_callback", (PyCFunction)set_dispatching_callback, METH_VARARGS, "set master-callback"},
+    {"set_zero_copy_blobs", (PyCFunction)set_zero_copy_blobs, METH_VARARGS, "pass BLOB values as read-only buffers instead of bytes"},
+    {"set_blob_mode", set_blob_mode, METH_VARARGS, "set how BLOBs of device property are sent by INDIGO"},
+    // queued dispatching
+    {"enable_event_queue", (PyCFunction)enable_event_queue, METH_VARARGS, "queue properties for dispatching from Python thread, accepts capacity and overflow policy"},
+    {"disable_event_queue", (PyCFunction)disable_event_queue, METH_NOARGS, "dispatch properties right from INDIGO bus thread again"},
+    {"next_events", (PyCFunction)next_events, METH_VARARGS, "take up to max_count (action, property) pairs from the queue waiting at most timeout sec"},
+    {"event_queue_stats", (PyCFunction)event_queue_stats, METH_NOARGS, "event queue depth and counters"},
+    {"add_blob_sink", add_blob_sink, METH_VARARGS, "write BLOBs of device property to files instead of passing them"},
+    {"remove_blob_sink", remove_blob_sink, METH_VARARGS, "stop writing BLOBs of device property to files"},
+    {"start_blob_writer", start_blob_writer, METH_VARARGS, "write BLOB files from background thread"},
+    {"stop_blob_writer", (PyCFunction)stop_blob_writer, METH_NOARGS, "write BLOB files from INDIGO bus thread"},
+    {"blob_sink_stats", (PyCFunction)blob_sink_stats, METH_NOARGS, "BLOB sinks and writer counters"},
+    {"enable_frame_pool", enable_frame_pool, METH_VARARGS, "copy BLOBs to preallocated frames"},
+    {"disable_frame_pool", (PyCFunction)disable_frame_pool, METH_NOARGS, "allocate memory for each BLOB"},
+    {"frame_pool_stats", (PyCFunction)frame_pool_stats, METH_NOARGS, "frame pool occupancy and counters"},
     // testing
     {"set_property", (PyCFunction)set_property, METH_VARARGS, "set INDIGO property by device, name, type, list of item names and list of item values"},
+    {"set_properties", (PyCFunction)set_properties, METH_VARARGS, "set several INDIGO properties, each given as set_property arguments tuple"},
     // device-level functions — one driver can have several devices
     // there's no "connect_indigo_device'"function, all devices are connected automatically as they are available
     {"disconnect_device", (PyCFunction)disconnect_device, METH_VARARGS, "request device disconnection from INDIGO bus"},
@@ -363,5 +2325,10 @@ static struct PyModuleDef pyindigo_core_ext = {
 
 PyMODINIT_FUNC PyInit_core_ext(void)
 {
+    if (PyType_Ready(&PropertyItemsLoaderType) < 0 || PyType_Ready(&BlobBufferType) < 0)
+        return NULL;
+    load_columns_method_name = PyUnicode_InternFromString("_load_columns");
+    if (load_columns_method_name == NULL)
+        return NULL;
     return PyModule_Create(&pyindigo_core_ext);
 }
@@ -0,0 +1,9 @@
+"""Tests run on fake backend (see pyindigo.backend) unless PYINDIGO_BACKEND is set explicitly, e.g.
+PYINDIGO_BACKEND=indigo for tests against INDIGO"""
+
+import os
+
+from pyindigo.backend import BACKEND_ENV_VARIABLE
+
+
+os.environ.setdefault(BACKEND_ENV_VARIABLE, "fake")
@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from pyindigo.backend import selected_backend
+
+
+pytestmark = pytest.mark.skipif(selected_backend() != "fake", reason="requires fake backend")
+
+
+@pytest.fixture(scope="module")
+def device():
+    from pyindigo.core.fake_ext import FakeDevice, register_driver, OK, _after
+    import pyindigo.models.client as client
+    from pyindigo.models.aio import AsyncIndigoDevice
+
+    class StaleConnectionDevice(FakeDevice):
+        """Reports CONNECTION in OK state with old values before actually changing it"""
+
+        def _change_connection(self, prop, values):
+            connect = values.get("CONNECTED", not values.get("DISCONNECTED", True))
+            self.update(prop, OK)
+            _after(self.connect_delay, self.set_connected, connect)
+
+    register_driver("stale_connection", lambda: [StaleConnectionDevice("Stale Connection Device")])
+    client.attach_drivers(["stale_connection"], connect=False)
+    return AsyncIndigoDevice(client.find_device("Stale Connection Device"))
+
+
+def test_connect_and_disconnect_wait_for_status_change(device):
+    from pyindigo.models.device import IndigoDeviceStatus
+
+    assert asyncio.run(device.connect(timeout=5)) is IndigoDeviceStatus.CONNECTED
+    assert asyncio.run(device.disconnect(timeout=5)) is IndigoDeviceStatus.DISCONNECTED
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from pyindigo.backend import selected_backend
+from pyindigo.core.enums import IndigoDriverAction
+from pyindigo.core.properties.schemas import CCDSpecificProperties
+
+
+pytestmark = pytest.mark.skipif(selected_backend() != "fake", reason="requires fake backend")
+
+DEVICE = "../.hidden CCD"
+
+
+@pytest.fixture(scope="module")
+def camera():
+    from pyindigo.core.fake_ext import FakeCCD, register_driver
+    import pyindigo.models.client as client
+
+    class SmallImageCCD(FakeCCD):
+        blob_size = 16
+
+    register_driver("blob_sink_test", lambda: [SmallImageCCD(DEVICE)])
+    client.attach_drivers(["blob_sink_test"], timeout=5)
+    return client.find_device(DEVICE)
+
+
+@pytest.mark.parametrize("template", ["{device}{format}", "{device}_{property}_{item}"])
+def test_names_do_not_escape_sink_directory(camera, tmp_path, template):
+    from pyindigo.core.blob_sink import add_blob_sink, remove_blob_sink
+    from pyindigo.core.waiters import PropertyWaiter
+
+    add_blob_sink(str(tmp_path), device=DEVICE, template=template)
+    try:
+        waiter = PropertyWaiter(
+            {"action": IndigoDriverAction.UPDATE, "device": DEVICE, "name": "CCD_IMAGE"}
+        )
+        camera.set_property(CCDSpecificProperties.CCD_EXPOSURE, EXPOSURE=0.0)
+        image = waiter.wait(timeout=5)
+    finally:
+        remove_blob_sink(device=DEVICE)
+    path = image.items[0].path
+    assert os.path.dirname(path) == str(tmp_path)
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+    assert os.path.basename(path) == template.format(
+        device="___.hidden CCD", property="CCD_IMAGE", item="IMAGE", format=".fits"
+    )
+
+
+@pytest.mark.parametrize("template", ["..", "frames/{seq}"])
+def test_template_must_be_file_name(tmp_path, template):
+    from pyindigo.core.blob_sink import add_blob_sink
+
+    with pytest.raises(ValueError):
+        add_blob_sink(str(tmp_path), device=DEVICE, template=template)
@@ -0,0 +1,77 @@
+import pytest
+
+from pyindigo.backend import selected_backend
+from pyindigo.core.properties.schemas import CCDSpecificProperties
+from pyindigo.utils import PropertySetOutcome
+
+pytestmark = pytest.mark.skipif(selected_backend() != "fake", reason="requires fake backend")
+
+
+@pytest.fixture(scope="module")
+def camera():
+    from pyindigo.core.fake_ext import FakeCCD, register_driver
+    import pyindigo.models.client as client
+
+    register_driver("configure_test", lambda: [FakeCCD("Configure Test CCD")])
+    client.attach_drivers(["configure_test"], timeout=5)
+    return client.find_device("Configure Test CCD")
+
+
+def item_values(camera, name):
+    return camera.get_property(name).items_dict
+
+
+def test_blocking_configure_sets_only_properties_that_need_it(camera):
+    settings = {
+        CCDSpecificProperties.CCD_BIN: {"HORIZONTAL": 2.0, "VERTICAL": 2.0},
+        CCDSpecificProperties.CCD_GAIN: 100.0,
+    }
+    results = camera.configure(settings, blocking=True, timeout=5)
+    assert {name: result.outcome for name, result in results.items()} == {
+        "CCD_BIN": PropertySetOutcome.OK,
+        "CCD_GAIN": PropertySetOutcome.OK,
+    }
+    assert item_values(camera, "CCD_GAIN") == {"GAIN": 100.0}
+    assert results["CCD_BIN"].prop.items_dict == {"HORIZONTAL": 2.0, "VERTICAL": 2.0}
+
+    settings[CCDSpecificProperties.CCD_GAIN] = 50.0
+    results = camera.configure(settings, blocking=True, timeout=5)
+    assert results["CCD_BIN"].outcome is PropertySetOutcome.NOT_NEEDED
+    assert results["CCD_GAIN"].outcome is PropertySetOutcome.OK
+    assert item_values(camera, "CCD_GAIN") == {"GAIN": 50.0}
+
+
+def test_non_blocking_configure(camera):
+    from pyindigo.core.waiters import PropertyWaiter
+
+    camera.configure({CCDSpecificProperties.CCD_OFFSET: 0.0}, blocking=True, timeout=5)
+    offset = CCDSpecificProperties.CCD_OFFSET.implement(camera.name, 10.0)
+    waiter = PropertyWaiter.for_settled_update(offset)
+    results = camera.configure(
+        {
+            CCDSpecificProperties.CCD_OFFSET: 10.0,
+            CCDSpecificProperties.CCD_GAIN: item_values(camera, "CCD_GAIN"),
+        }
+    )
+    assert results["CCD_OFFSET"].outcome is PropertySetOutcome.NOT_AWAITED
+    assert results["CCD_GAIN"].outcome is PropertySetOutcome.NOT_NEEDED
+    assert waiter.wait(timeout=5).items_dict == {"OFFSET": 10.0}
+
+
+def test_invalid_configuration_sets_nothing(camera):
+    camera.configure({CCDSpecificProperties.CCD_GAIN: 0.0}, blocking=True, timeout=5)
+    with pytest.raises(ValueError):
+        camera.configure(
+            {CCDSpecificProperties.CCD_GAIN: 10.0, CCDSpecificProperties.CCD_OFFSET: "high"}
+        )
+    assert item_values(camera, "CCD_GAIN") == {"GAIN": 0.0}
+
+
+def test_set_properties_checks_all_properties_first(camera):
+    from pyindigo.core.properties import NumberVectorProperty, set_properties
+
+    camera.configure({CCDSpecificProperties.CCD_GAIN: 0.0}, blocking=True, timeout=5)
+    gain = CCDSpecificProperties.CCD_GAIN.implement(camera.name, 10.0)
+    with pytest.raises(ValueError):
+        set_properties([gain, NumberVectorProperty(camera.name, "CCD_OFFSET")])  # no items to set
+    assert item_values(camera, "CCD_GAIN") == {"GAIN": 0.0}
@@ -0,0 +1,209 @@
+import pytest
+
+from pyindigo.core.enums import IndigoDriverAction, IndigoPropertyState, IndigoPropertyPerm
+from pyindigo.core.properties import NumberVectorProperty, BlobVectorProperty
+from pyindigo.core.dispatching_callback import (
+    indigo_callback,
+    discard_indigo_callback,
+    dispatching_callback,
+    dispatch_events,
+    coalesce_updates,
+    set_update_coalescing,
+    get_coalesced_updates_count,
+)
+
+DEVICE = "Dispatch Test Device"
+
+
+def number_property(name, value=0.0, state=IndigoPropertyState.OK, device=DEVICE):
+    prop = NumberVectorProperty(device, name, state, IndigoPropertyPerm.RW)
+    prop.add_item("V", value)
+    return prop
+
+
+@pytest.fixture
+def received():
+    """Registers recording callbacks, discarding them after the test"""
+    handles = []
+
+    def register(label, **accepts):
+        events = []
+
+        @indigo_callback(accepts=accepts)
+        def record(action, prop):
+            events.append((label, action, prop.name))
+
+        handles.append(record)
+        return events
+
+    yield register
+    for handle in handles:
+        handle.discard()
+
+
+def test_callback_receives_only_accepted_events(received):
+    events = received("x", device=DEVICE, name="X")
+    dispatching_callback(IndigoDriverAction.UPDATE, number_property("X"))
+    dispatching_callback(IndigoDriverAction.UPDATE, number_property("Y"))
+    dispatching_callback(IndigoDriverAction.UPDATE, number_property("X", device="Other Device"))
+    assert events == [("x", IndigoDriverAction.UPDATE, "X")]
+
+
+def test_action_strings_are_converted():
+    actions = []
+    handle = indigo_callback(
+        lambda action, prop: actions.append(action), accepts={"device": DEVICE}
+    )
+    try:
+        dispatching_callback("define", number_property("X"))
+    finally:
+        handle.discard()
+    assert actions == [IndigoDriverAction.DEFINE]
+
+
+def test_less_specific_callbacks_run_first():
+    order = []
+    handles = [
+        indigo_callback(
+            lambda a, p: order.append("name"), accepts={"device": DEVICE, "name": "X"}
+        ),
+        indigo_callback(lambda a, p: order.append("device"), accepts={"device": DEVICE}),
+    ]
+    try:
+        dispatching_callback(IndigoDriverAction.UPDATE, number_property("X"))
+    finally:
+        for handle in handles:
+            handle.discard()
+    assert order == ["device", "name"]
+
+
+def test_handle_calls_callback_and_discards_it():
+    calls = []
+
+    @indigo_callback(accepts={"device": DEVICE})
+    def callback(action, prop):
+        calls.append(prop.name)
+        return "result"
+
+    assert callback.registered and callback.__name__ == "callback"
+    assert callback(None, number_property("direct")) == "result"
+    callback.discard()
+    assert not callback.registered
+    dispatching_callback(IndigoDriverAction.UPDATE, number_property("X"))
+    assert calls == ["direct"]
+    callback.discard()  # discarding twice is harmless
+
+
+def test_discard_by_callback_function():
+    calls = []
+
+    def callback(action, prop):
+        calls.append(prop.name)
+
+    indigo_callback(callback, accepts={"device": DEVICE, "name": {"X", "Y"}})
+    discard_indigo_callback(callback)
+    dispatching_callback(IndigoDriverAction.UPDATE, number_property("X"))
+    assert calls == []
+
+
+def test_run_times_limit_discards_callback():
+    calls = []
+    handle = indigo_callback(
+        lambda action, prop: calls.append(prop.name), accepts={"device": DEVICE}, run_times=2
+    )
+    for name in ("X", "Y", "Z"):
+        dispatching_callback(IndigoDriverAction.UPDATE, number_property(name))
+    assert calls == ["X", "Y"] and not handle.registered
+
+
+def test_callback_registered_during_dispatch_does_not_get_current_event(received):
+    late_events = []
+
+    def register_another(action, prop):
+        late_events.append(received("late", device=DEVICE))
+
+    handle = indigo_callback(register_another, accepts={"device": DEVICE}, run_times=1)
+    dispatching_callback(IndigoDriverAction.UPDATE, number_property("X"))
+    dispatching_callback(IndigoDriverAction.UPDATE, number_property("Y"))
+    assert not handle.registered
+    assert late_events[0] == [("late", IndigoDriverAction.UPDATE, "Y")]
+
+
+def test_callback_errors_do_not_stop_dispatching(received):
+    events = received("after", device=DEVICE)
+    handle = indigo_callback(lambda a, p: 1 / 0, accepts={"device": DEVICE})
+    try:
+        dispatching_callback(IndigoDriverAction.UPDATE, number_property("X"))
+    finally:
+        handle.discard()
+    assert events == [("after", IndigoDriverAction.UPDATE, "X")]
+
+
+def test_coalesce_updates_keeps_the_latest_update_between_define_and_delete():
+    set_update_coalescing(False)  # resets the count
+    x1, x2, x3, x4 = (number_property("X", value) for value in range(4))
+    y = number_property("Y")
+    blob = BlobVectorProperty(DEVICE, "B")
+    update, define, delete = (
+        IndigoDriverAction.UPDATE,
+        IndigoDriverAction.DEFINE,
+        IndigoDriverAction.DELETE,
+    )
+    events = [
+        (update, x1),
+        (update, blob),
+        (update, blob),
+        (update, y),
+        (update, x2),
+        (delete, x2),
+        (define, x3),
+        (update, x3),
+        (update, x4),
+    ]
+    assert coalesce_updates(events) == [
+        (update, blob),
+        (update, blob),
+        (update, y),
+        (update, x2),
+        (delete, x2),
+        (define, x3),
+        (update, x4),
+    ]
+    assert get_coalesced_updates_count() == 2
+
+
+def test_dispatch_events_coalesces_only_when_enabled(received):
+    events = received("x", device=DEVICE, name="X")
+    updates = [(IndigoDriverAction.UPDATE, number_property("X", value)) for value in range(3)]
+    dispatch_events(updates)
+    assert len(events) == 3
+    events.clear()
+    set_update_coalescing(True)
+    try:
+        dispatch_events(updates)
+        assert len(events) == 1 and get_coalesced_updates_count() == 2
+    finally:
+        set_update_coalescing(False)
+    assert get_coalesced_updates_count() == 0
+
+
+def test_dispatch_events_continues_after_failing_event(received, monkeypatch):
+    import sys
+
+    module = sys.modules["pyindigo.core.dispatching_callback"]
+    events = received("x", device=DEVICE)
+    dispatch = module.dispatching_callback
+
+    def failing_on_first(action, prop):
+        if prop.name == "bad":
+            raise RuntimeError("dispatching failed")
+        dispatch(action, prop)
+
+    monkeypatch.setattr(module, "dispatching_callback", failing_on_first)
+    dispatch_events(
+        [
+            (IndigoDriverAction.UPDATE, number_property("bad")),
+            (IndigoDriverAction.UPDATE, number_property("X")),
+        ]
+    )
+    assert events == [("x", IndigoDriverAction.UPDATE, "X")]
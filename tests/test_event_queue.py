@@ -0,0 +1,79 @@
+import pytest
+
+from pyindigo.backend import selected_backend
+from pyindigo.core.enums import IndigoDriverAction
+
+
+pytestmark = pytest.mark.skipif(selected_backend() != "fake", reason="requires fake backend")
+
+COALESCE = 2  # OverflowPolicy.COALESCE
+
+
+@pytest.fixture
+def queue():
+    """Event queue without consumer thread, events are taken with core_ext.next_events"""
+    from pyindigo.core import core_ext, setup_client
+
+    setup_client()
+    core_ext.enable_event_queue(2, COALESCE)
+    yield core_ext
+    core_ext.disable_event_queue()
+    while core_ext.next_events(0, 64) is not None:
+        pass
+
+
+@pytest.fixture
+def device():
+    from pyindigo.core.fake_ext import FakeDevice, number_property
+
+    device = FakeDevice("Queue Test Device")
+    prop = number_property(device.name, "X", V=0.0)
+    return device, prop
+
+
+def taken(queue):
+    return [
+        (action, prop.name, prop.items_dict) for action, prop in queue.next_events(0, 64) or []
+    ]
+
+
+def test_coalesced_update_replaces_queued_update(queue, device):
+    device, prop = device
+    device.define(prop)
+    device.update(prop, V=1.0)
+    device.update(prop, V=2.0)
+    assert taken(queue) == [
+        (IndigoDriverAction.DEFINE, "X", {"V": 0.0}),
+        (IndigoDriverAction.UPDATE, "X", {"V": 2.0}),
+    ]
+    assert queue.event_queue_stats()["coalesced"] == 1
+
+
+def test_update_is_not_coalesced_across_delete(queue, device):
+    device, prop = device
+    device.properties[prop.name] = prop
+    device.update(prop, V=1.0)
+    device.delete(prop)
+    device.update(prop, V=2.0)  # queue is full, oldest event is dropped instead
+    assert taken(queue) == [
+        (IndigoDriverAction.DELETE, "X", {"V": 1.0}),
+        (IndigoDriverAction.UPDATE, "X", {"V": 2.0}),
+    ]
+    stats = queue.event_queue_stats()
+    assert stats["coalesced"] == 0 and stats["dropped"] == 1
+
+
+def test_update_is_not_coalesced_across_device_delete(queue, device):
+    from pyindigo.core.fake_ext import number_property
+
+    device, prop = device
+    device.properties[prop.name] = prop
+    device.update(prop, V=1.0)
+    all_properties = number_property(device.name, "", V=0.0)  # empty name means all device properties
+    device.properties[all_properties.name] = all_properties
+    device.delete(all_properties)
+    device.update(prop, V=2.0)
+    assert [action for action, _, _ in taken(queue)] == [
+        IndigoDriverAction.DELETE,
+        IndigoDriverAction.UPDATE,
+    ]
@@ -0,0 +1,75 @@
+import pytest
+
+from pyindigo.core.enums import IndigoDriverAction, IndigoPropertyState
+from pyindigo.core.properties import NumberVectorProperty, SwitchVectorProperty
+from pyindigo.core.dispatching_callback import IndigoCallbackEntry
+from pyindigo.core.filters import Prefix, Range
+
+
+def number_property(**items):
+    prop = NumberVectorProperty("CCD Imager", "CCD_TEMPERATURE", IndigoPropertyState.OK)
+    for item_name, value in items.items():
+        prop.add_item(item_name, value)
+    return prop
+
+
+def accepts(event_action=IndigoDriverAction.UPDATE, prop=None, **conditions) -> bool:
+    entry = IndigoCallbackEntry(lambda action, prop: None, **conditions)
+    return entry.accepts(event_action, prop or number_property(TEMPERATURE=0.0))
+
+
+def test_sets_of_values():
+    assert accepts(device={"CCD Imager", "CCD Guider"})
+    assert not accepts(device=["CCD Guider"])
+    assert not accepts(IndigoDriverAction.DEFINE, action={IndigoDriverAction.UPDATE})
+    assert accepts(state={IndigoPropertyState.OK, IndigoPropertyState.ALERT})
+    assert not accepts(state={IndigoPropertyState.BUSY})
+
+
+def test_set_of_values_puts_entry_into_several_buckets():
+    entry = IndigoCallbackEntry(
+        lambda action, prop: None,
+        action=[IndigoDriverAction.DEFINE, IndigoDriverAction.UPDATE],
+        device={"A", "B"},
+        name=Prefix("CCD_"),
+    )
+    assert sorted(entry.dispatch_keys, key=repr) == sorted(
+        [
+            (action, device, None, None)
+            for action in (IndigoDriverAction.DEFINE, IndigoDriverAction.UPDATE)
+            for device in ("A", "B")
+        ],
+        key=repr,
+    )
+
+
+def test_prefixes():
+    assert accepts(device=Prefix("CCD "), name=Prefix("CCD_"))
+    assert not accepts(name=Prefix("FOCUSER_"))
+
+
+def test_prefix_is_allowed_only_for_device_and_name():
+    with pytest.raises(ValueError):
+        IndigoCallbackEntry(lambda action, prop: None, action=Prefix("UP"))
+
+
+def test_item_conditions():
+    prop = number_property(TEMPERATURE=-10.0, POWER=50.0)
+    assert accepts(prop=prop, items={"TEMPERATURE": Range(max=-5.0)})
+    assert accepts(prop=prop, items={"TEMPERATURE": -10.0, "POWER": {0.0, 50.0}})
+    assert accepts(prop=prop, items={"POWER": lambda power: power > 10})
+    assert not accepts(prop=prop, items={"TEMPERATURE": Range(min=0.0)})
+    assert not accepts(prop=prop, items={"MISSING": Range()})
+
+
+def test_item_conditions_on_switches():
+    prop = SwitchVectorProperty("CCD Imager", "CONNECTION", IndigoPropertyState.OK)
+    prop.add_item("CONNECTED", True)
+    prop.add_item("DISCONNECTED", False)
+    assert accepts(prop=prop, items={"CONNECTED": True})
+    assert not accepts(prop=prop, items={"DISCONNECTED": True})
+
+
+def test_failing_item_predicate_means_not_accepted():
+    prop = number_property(TEMPERATURE=-10.0)
+    assert not accepts(prop=prop, items={"TEMPERATURE": lambda value: value.missing_attribute})
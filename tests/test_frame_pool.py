@@ -0,0 +1,55 @@
+import gc
+
+import pytest
+
+from pyindigo.backend import selected_backend
+from pyindigo.core.frame_pool import (
+    enable_frame_pool,
+    disable_frame_pool,
+    frame_pool_stats,
+    FramePoolPolicy,
+)
+
+pytestmark = pytest.mark.skipif(selected_backend() != "fake", reason="requires fake backend")
+
+
+@pytest.fixture
+def copy():
+    """Copies data to a frame as the fake backend does for BLOB values"""
+    from pyindigo.core.fake_ext import _frame_pool
+
+    yield _frame_pool.copy
+    disable_frame_pool()
+    gc.collect()
+
+
+def test_frames_support_buffer_protocol(copy):
+    enable_frame_pool(frames=2, frame_size=16)
+    frame = copy(b"data")
+    assert len(frame) == 4 and bytes(frame) == b"data" and frame.tobytes() == b"data"
+    assert memoryview(frame).tobytes() == b"data"
+    del frame
+    gc.collect()
+    assert frame_pool_stats().occupancy == 0
+
+
+def test_drop_oldest_reclaims_frames_not_exported(copy):
+    enable_frame_pool(frames=2, frame_size=16, policy=FramePoolPolicy.DROP_OLDEST)
+    exported, oldest_not_exported = copy(b"first"), copy(b"second")
+    view = memoryview(exported)
+    newest = copy(b"third")
+    assert bytes(view) == b"first" and bytes(newest) == b"third"
+    assert len(oldest_not_exported) == 0  # reclaimed
+    stats = frame_pool_stats()
+    assert stats.reclaimed == 1 and stats.occupancy == 2
+
+
+def test_block_policy_drops_frames_when_none_is_released(copy):
+    enable_frame_pool(frames=1, frame_size=16, policy=FramePoolPolicy.BLOCK, timeout=0.01)
+    frame = copy(b"first")
+    assert copy(b"second") is None
+    assert copy(bytes(32)) == bytes(32)  # oversized BLOBs are not put into frames
+    stats = frame_pool_stats()
+    assert stats.dropped == 1 and stats.oversized == 1
+    del frame
+    assert bytes(copy(b"third")) == b"third"
@@ -0,0 +1,57 @@
+import time
+from threading import Thread
+
+import pytest
+
+from pyindigo.core.enums import IndigoPropertyState, IndigoPropertyPerm
+from pyindigo.core.properties import TextVectorProperty, NumberVectorProperty
+
+
+def slow_loader(cls, calls, *columns):
+    def loader():
+        calls.append(1)
+        time.sleep(0.01)  # other threads run meanwhile
+        return cls._load_columns(*columns)
+
+    return loader
+
+
+def lazy_property(cls, calls, *columns):
+    loader = slow_loader(cls, calls, *columns)
+    return cls._with_items_loader(
+        "dev", "P", IndigoPropertyState.OK, IndigoPropertyPerm.RW, None, loader
+    )
+
+
+def read_concurrently(*reads):
+    results = [None] * len(reads)
+
+    def read(index):
+        results[index] = reads[index]()
+
+    threads = [Thread(target=read, args=(index,)) for index in range(len(reads))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.mark.parametrize("trial", range(20))
+def test_lazy_items_are_loaded_once_from_several_threads(trial):
+    calls = []
+    prop = lazy_property(TextVectorProperty, calls, ("A", "B"), ("a", "b"))
+    first, second = read_concurrently(lambda: prop.items, lambda: prop.items)
+    assert first is second and [item.value for item in first] == ["a", "b"]
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("trial", range(20))
+def test_number_columns_and_items_from_several_threads(trial):
+    calls = []
+    columns = (("X", "Y"), (1.0, 2.0), ("%g", "%g"), *[(0.0, 0.0)] * 4)
+    prop = lazy_property(NumberVectorProperty, calls, *columns)
+    columns, items = read_concurrently(lambda: prop.columns, lambda: prop.items)
+    assert columns is prop.columns and prop.items_dict == {"X": 1.0, "Y": 2.0}
+    assert [item.name for item in items] == ["X", "Y"]
+    assert len(calls) == 1
@@ -0,0 +1,59 @@
+from pyindigo.core.enums import IndigoDriverAction, IndigoPropertyState, IndigoPropertyPerm
+from pyindigo.core.properties import TextVectorProperty, NumberVectorProperty, BlobVectorProperty
+from pyindigo.models.property_cache import PropertyCache
+
+
+NUMBER_COLUMNS = (("X", "Y"), (1.0, 2.0), ("%g", "%g"), *[(0.0, 0.0)] * 4)
+
+
+def dispatched(cls, name, *columns, device="dev"):
+    """Property as built by backend for dispatching, with items loader"""
+    return cls._with_items_loader(
+        device,
+        name,
+        IndigoPropertyState.OK,
+        IndigoPropertyPerm.RW,
+        None,
+        lambda: cls._load_columns(*columns),
+    )
+
+
+def test_cached_properties_do_not_reference_items_loader():
+    cache = PropertyCache()
+    text = dispatched(TextVectorProperty, "T", ("A",), ("a",))
+    number = dispatched(NumberVectorProperty, "N", *NUMBER_COLUMNS)
+    cache.apply(IndigoDriverAction.DEFINE, text)
+    cache.apply(IndigoDriverAction.DEFINE, number)
+
+    for prop in (text, number):  # items are loaded, so C extension has nothing to copy
+        assert prop._items_loader is None
+    cached_text, cached_number = cache.get("dev", "T"), cache.get("dev", "N")
+    assert cached_text is not text and cached_text.items_dict == {"A": "a"}
+    assert cached_number._items_loader is None and cached_number.columns is number.columns
+    assert cached_number.items_dict == {"X": 1.0, "Y": 2.0}
+    assert cached_number.state is IndigoPropertyState.OK
+
+
+def test_update_replaces_and_delete_removes_properties():
+    cache = PropertyCache()
+    cache.apply(IndigoDriverAction.DEFINE, dispatched(TextVectorProperty, "T", ("A",), ("a",)))
+    snapshot = cache.snapshot("dev")
+    cache.apply(IndigoDriverAction.UPDATE, dispatched(TextVectorProperty, "T", ("A",), ("b",)))
+    assert cache.get("dev", "T").items_dict == {"A": "b"}
+    assert snapshot["T"].items_dict == {"A": "a"}  # snapshot is not affected
+
+    cache.apply(IndigoDriverAction.DEFINE, dispatched(TextVectorProperty, "U", ("A",), ("a",)))
+    cache.apply(IndigoDriverAction.DELETE, TextVectorProperty("dev", "T"))
+    assert list(cache.snapshot("dev")) == ["U"]
+    cache.apply(IndigoDriverAction.DELETE, TextVectorProperty("dev", ""))  # all device properties
+    assert cache.devices() == []
+
+
+def test_blobs_are_cached_only_if_enabled():
+    blob_columns = (("IMAGE",), (b"data",), (".fits",), (4,), (None,), (None,))
+    cache = PropertyCache()
+    cache.apply(IndigoDriverAction.UPDATE, dispatched(BlobVectorProperty, "B", *blob_columns))
+    assert cache.get("dev", "B") is None
+    cache.cache_blobs = True
+    cache.apply(IndigoDriverAction.UPDATE, dispatched(BlobVectorProperty, "B", *blob_columns))
+    assert cache.get("dev", "B").items[0].value == b"data"
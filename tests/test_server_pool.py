@@ -0,0 +1,173 @@
+import socket
+import time
+from threading import Thread
+from typing import List
+
+import pytest
+
+from pyindigo.backend import selected_backend
+import pyindigo.models.server as server_module
+from pyindigo.models.server import IndigoServer, IndigoServerPool
+
+
+def wait_for(condition, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+# fake backend: server is "running" while its address is in fake_ext.reachable_servers
+
+fake_only = pytest.mark.skipif(selected_backend() != "fake", reason="requires fake backend")
+
+
+@pytest.fixture
+def fake_address():
+    from pyindigo.core import core_ext
+
+    address = ("127.0.0.1", 17624)
+    core_ext.reachable_servers.add(address)
+    yield address
+    core_ext.reachable_servers.discard(address)
+
+
+class ManualClock:
+    """Clock for server pool, advanced by test. Pool reads it once per server check, so counting reads tells
+    when pool has checked servers after the clock is advanced."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.reads = 0
+
+    def __call__(self) -> float:
+        self.reads += 1
+        return self.now
+
+    def advance_to(self, now: float):
+        self.now = now
+        reads = self.reads
+        # the first read after advancing starts a check, the second one means it's finished
+        assert wait_for(lambda: self.reads >= reads + 2, timeout=5)
+
+
+@pytest.fixture
+def clock() -> ManualClock:
+    return ManualClock()
+
+
+@pytest.fixture
+def connection_attempts(monkeypatch, clock) -> List[float]:
+    """Clock timestamps of connect_server calls made by servers"""
+    attempts = []
+    connect_server = server_module.connect_server
+
+    def recording_connect_server(*args):
+        attempts.append(clock.now)
+        return connect_server(*args)
+
+    monkeypatch.setattr(server_module, "connect_server", recording_connect_server)
+    return attempts
+
+
+@fake_only
+def test_server_connect_status_disconnect(fake_address):
+    from pyindigo.core import core_ext
+
+    server = IndigoServer("remote", *fake_address)
+    server.connect()
+    assert server.attached and server.status() == (True, "")
+    core_ext.reachable_servers.discard(fake_address)
+    connected, last_error = server.status()
+    assert not connected and last_error
+    server.disconnect()
+    assert not server.attached and not server.reconnect()
+
+
+@fake_only
+def test_pool_reconnects_with_backoff(fake_address, clock, connection_attempts):
+    from pyindigo.core import core_ext
+
+    def reconnects_at(expected: float):
+        attempts_before = len(connection_attempts)
+        clock.advance_to(expected - 0.01)
+        assert len(connection_attempts) == attempts_before
+        clock.advance_to(expected)
+        assert connection_attempts[attempts_before:] == [expected]
+
+    pool = IndigoServerPool(
+        initial_delay=1, max_delay=4, backoff_factor=2, poll_interval=0.001, clock=clock
+    )
+    try:
+        pool.add("remote", *fake_address)
+        assert pool.stats()["remote"].connected and connection_attempts == [0.0]
+
+        core_ext.reachable_servers.discard(fake_address)  # server is killed
+        clock.advance_to(0.0)
+        # first attempt is made initial_delay after server is found down, then delay doubles up to max_delay
+        for expected in (1.0, 2.0, 4.0, 8.0, 12.0):
+            reconnects_at(expected)
+        stats = pool.stats()["remote"]
+        assert not stats.connected and stats.reconnects == 5 and stats.down_for == 12.0
+
+        core_ext.reachable_servers.add(fake_address)  # and restarted
+        clock.advance_to(12.5)
+        assert pool.stats()["remote"].connected and pool.stats()["remote"].down_for == 0.0
+
+        # delay is reset after reconnection, once already scheduled attempt is due
+        core_ext.reachable_servers.discard(fake_address)
+        clock.advance_to(13.0)
+        reconnects_at(16.0)
+        reconnects_at(17.0)
+    finally:
+        pool.close()
+    assert not pool.stats()
+
+
+# INDIGO backend: stand-in server is a TCP listener on loopback, enough for INDIGO client to connect
+
+
+class StandInServer:
+    def __init__(self, port: int = 0):
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(("127.0.0.1", port))
+        self.listener.listen()
+        self.port = self.listener.getsockname()[1]
+        self.connections: List[socket.socket] = []
+        Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                connection, _ = self.listener.accept()
+            except OSError:  # listener is closed
+                return
+            self.connections.append(connection)
+
+    def kill(self):
+        self.listener.close()
+        for connection in self.connections:
+            connection.close()
+
+
+@pytest.mark.skipif(selected_backend() != "indigo", reason="requires INDIGO backend")
+def test_pool_reconnects_to_restarted_server_on_loopback():
+    stand_in = StandInServer()
+    pool = IndigoServerPool(initial_delay=0.5, max_delay=2, poll_interval=0.1)
+    try:
+        server = pool.add("stand-in", "127.0.0.1", stand_in.port)
+        assert wait_for(lambda: server.connected, timeout=5)
+
+        stand_in.kill()
+        assert wait_for(lambda: not server.connected, timeout=5)
+        assert wait_for(lambda: pool.stats()["stand-in"].reconnects > 0, timeout=5)
+
+        stand_in = StandInServer(stand_in.port)
+        assert wait_for(lambda: pool.stats()["stand-in"].connected, timeout=10)
+    finally:
+        pool.close()
+        stand_in.kill()
+    assert not server.attached
@@ -0,0 +1,67 @@
+from threading import Timer
+
+from pyindigo.core.enums import IndigoDriverAction, IndigoPropertyState, IndigoPropertyPerm
+from pyindigo.core.properties import NumberVectorProperty
+from pyindigo.core.dispatching_callback import dispatching_callback, indigo_callback
+from pyindigo.core.waiters import PropertyWaiter
+
+DEVICE = "Waiter Test Device"
+
+
+def exposure(state, value=1.0):
+    prop = NumberVectorProperty(DEVICE, "CCD_EXPOSURE", state, IndigoPropertyPerm.RW)
+    prop.add_item("EXPOSURE", value)
+    return prop
+
+
+def update(prop):
+    dispatching_callback(IndigoDriverAction.UPDATE, prop)
+
+
+def test_waiter_gets_the_first_settled_update():
+    waiter = PropertyWaiter.for_settled_update(exposure(None))
+    update(exposure(IndigoPropertyState.BUSY))
+    assert not waiter.done
+    update(exposure(IndigoPropertyState.OK, 2.0))
+    update(exposure(IndigoPropertyState.OK, 3.0))
+    prop = waiter.wait(timeout=0)
+    assert prop.items_dict == {"EXPOSURE": 2.0} and waiter.action is IndigoDriverAction.UPDATE
+    assert not waiter._handle.registered
+
+
+def test_waiter_waits_for_update_from_another_thread():
+    waiter = PropertyWaiter.for_settled_update(exposure(None))
+    Timer(0.05, update, args=(exposure(IndigoPropertyState.OK),)).start()
+    assert waiter.wait(timeout=5) is not None and waiter.received_at is not None
+
+
+def test_waiter_returns_none_on_timeout():
+    waiter = PropertyWaiter.for_settled_update(exposure(None))
+    assert waiter.wait(timeout=0.01) is None
+    assert not waiter._handle.registered
+
+
+def test_ok_update_is_awaited_until_confirmed():
+    confirmed = []
+
+    # device state is updated by less specific callback, which runs before the waiter
+    handle = indigo_callback(
+        lambda action, prop: confirmed.append(prop.items_dict["EXPOSURE"] == 0.0),
+        accepts={"device": DEVICE},
+    )
+    try:
+        waiter = PropertyWaiter.for_settled_update(
+            exposure(None), confirmation=lambda: confirmed[-1]
+        )
+        update(exposure(IndigoPropertyState.OK, 1.0))  # stale update
+        assert not waiter.done
+        update(exposure(IndigoPropertyState.OK, 0.0))
+        assert waiter.wait(timeout=0).items_dict == {"EXPOSURE": 0.0}
+    finally:
+        handle.discard()
+
+
+def test_alert_update_ends_waiting_regardless_of_confirmation():
+    waiter = PropertyWaiter.for_settled_update(exposure(None), confirmation=lambda: False)
+    update(exposure(IndigoPropertyState.ALERT))
+    assert waiter.wait(timeout=0).state is IndigoPropertyState.ALERT